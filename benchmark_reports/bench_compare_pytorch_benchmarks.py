@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Benchmark the comparison tool itself on synthetic data.
+Times the row-wise percentage-change computation against the columnar one, runs the
+full tool with --profile on generated pytorch8/-style datasets of increasing size, and
+times fresh-process runs on small datasets with and without the stdlib fast path.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from compare_pytorch_benchmarks import (
+    CSV_COLUMNS,
+    calculate_percentage_change,
+    calculate_percentage_change_columns,
+)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+COMPARE_SCRIPT = os.path.join(SCRIPT_DIR, 'compare_pytorch_benchmarks.py')
+
+# Operator files of a synthetic dataset, like the ones in pytorch8/
+SYNTHETIC_OPS = ['add', 'bmm', 'matmul', 'mm']
+SYNTHETIC_DTYPES = np.array(['float32', 'float16', 'bfloat16'], dtype=object)
+
+def make_merged_frame(num_rows, seed=0):
+    """Build a merged-style frame with baseline/new time and memory columns."""
+    rng = np.random.default_rng(seed)
+    baseline_time = rng.lognormal(mean=3.0, sigma=1.5, size=num_rows)
+    baseline_memory = rng.choice([0.0, 1024.0, 2048.0, 34048.0], size=num_rows)
+
+    return pd.DataFrame({
+        'Execution Time_baseline': baseline_time,
+        'Execution Time_new': baseline_time * rng.normal(1.0, 0.05, size=num_rows),
+        'Peak Memory (KB)_baseline': baseline_memory,
+        'Peak Memory (KB)_new': baseline_memory * rng.choice([0.5, 1.0, 2.0], size=num_rows),
+    })
+
+def time_call(func, repeat):
+    """Return the best wall time of func() over repeat runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench_percentage_change(sizes, repeat=3):
+    """Compare row-wise apply vs columnar percentage change for each size."""
+    results = []
+
+    for num_rows in sizes:
+        merged = make_merged_frame(num_rows)
+
+        def rowwise():
+            return merged.apply(
+                lambda row: calculate_percentage_change(
+                    row['Execution Time_baseline'],
+                    row['Execution Time_new']
+                ), axis=1
+            )
+
+        def columnar():
+            return calculate_percentage_change_columns(
+                merged['Execution Time_baseline'],
+                merged['Execution Time_new']
+            )
+
+        # Both paths must agree before the timings mean anything
+        np.testing.assert_array_equal(rowwise().to_numpy(dtype=np.float64), columnar())
+
+        rowwise_time = time_call(rowwise, repeat)
+        columnar_time = time_call(columnar, repeat)
+        results.append({
+            'rows': num_rows,
+            'rowwise_s': rowwise_time,
+            'columnar_s': columnar_time,
+            'speedup': rowwise_time / columnar_time if columnar_time > 0 else float('inf'),
+        })
+        print(f"{num_rows:>10,} rows: apply {rowwise_time:.4f}s, "
+              f"columnar {columnar_time:.6f}s ({results[-1]['speedup']:.0f}x)")
+
+    return pd.DataFrame(results)
+
+
+def make_synthetic_cases(num_rows, seed=0):
+    """
+    Build num_rows benchmark rows with unique, parseable case names.
+
+    Rows are spread over SYNTHETIC_OPS and split evenly into eager and compile; every
+    fourth row is a backward case. M, N and K are derived from the row index, so names
+    stay unique well beyond 10^7 rows.
+
+    Returns:
+        DataFrame with CSV_COLUMNS plus 'op' and 'use_compile' helper columns
+    """
+    rng = np.random.default_rng(seed)
+    index = np.arange(num_rows)
+    op = np.array(SYNTHETIC_OPS, dtype=object)[index % len(SYNTHETIC_OPS)]
+    use_compile = (index // len(SYNTHETIC_OPS)) % 2 == 1
+    run_backward = index % 4 == 0
+
+    shape = pd.Series(index // (2 * len(SYNTHETIC_OPS)))
+    m = (8 * (1 + shape % 512)).astype(str)
+    n = (32 * (1 + (shape // 512) % 512)).astype(str)
+    k = (64 * (1 + shape // 262_144)).astype(str)
+    batch = pd.Series(np.where(op == 'bmm', '_B8', ''), dtype=object)
+    suffix = pd.Series(np.where(run_backward, '_bwdall_BACKWARD', ''), dtype=object)
+    dtype = pd.Series(SYNTHETIC_DTYPES[index % len(SYNTHETIC_DTYPES)])
+
+    case_names = (pd.Series(op) + batch + '_M' + m + '_N' + n + '_K' + k
+                  + '_cuda_dtypetorch.' + dtype + suffix)
+
+    return pd.DataFrame({
+        'Benchmarking Framework': 'PyTorch',
+        'Benchmarking Module Name': op,
+        'Case Name': case_names,
+        'tag': 'long',
+        'run_backward': run_backward,
+        'Execution Time': np.round(rng.lognormal(mean=4.5, sigma=1.0, size=num_rows), 6),
+        'Peak Memory (KB)': rng.choice([0.0, 1024.0, 2048.0, 34048.0], size=num_rows),
+        'op': op,
+        'use_compile': use_compile,
+    })
+
+def perturb_synthetic_cases(cases, seed=1, drop_fraction=0.01, regression_fraction=0.1):
+    """Derive a "new version" from synthetic cases: noise, some slowdowns and a few dropped rows."""
+    rng = np.random.default_rng(seed)
+    new_cases = cases[rng.random(len(cases)) >= drop_fraction].copy()
+    noise = rng.normal(1.0, 0.02, size=len(new_cases))
+    slowdown = np.where(rng.random(len(new_cases)) < regression_fraction,
+                        rng.uniform(1.1, 2.0, size=len(new_cases)), 1.0)
+    new_cases['Execution Time'] = np.round(new_cases['Execution Time'] * noise * slowdown, 6)
+    return new_cases
+
+def write_synthetic_json(cases, json_file):
+    """Write cases in the operator_microbenchmark JSON export layout (latency and peak memory records)."""
+    records = []
+    for case_name, run_backward, use_compile, latency, memory in zip(
+        cases['Case Name'], cases['run_backward'], cases['use_compile'],
+        cases['Execution Time'], cases['Peak Memory (KB)']
+    ):
+        benchmark = {
+            'name': 'PyTorch operator microbenchmark',
+            'mode': 'training' if run_backward else 'inference',
+            'extra_info': {'device': 'cuda', 'use_compile': bool(use_compile)}
+        }
+        # The JSON export leaves the _BACKWARD suffix to the training mode
+        model_name = case_name[:-len('_BACKWARD')] if run_backward else case_name
+        model = {'name': model_name, 'type': 'micro-benchmark', 'origins': ['pytorch']}
+        records.append({'benchmark': benchmark, 'model': model, 'metric': {
+            'name': 'latency', 'unit': 'us', 'benchmark_values': [latency], 'target_value': None
+        }})
+        records.append({'benchmark': benchmark, 'model': model, 'metric': {
+            'name': 'peak memory', 'unit': 'KB', 'benchmark_values': [memory], 'target_value': None
+        }})
+
+    with open(json_file, 'w') as f:
+        json.dump(records, f)
+
+def write_synthetic_dataset(cases, directory, input_format="csv"):
+    """Write cases as one operator_microbenchmark file per op and eager/compile, like pytorch8/."""
+    os.makedirs(directory, exist_ok=True)
+
+    for (op, use_compile), group in cases.groupby(['op', 'use_compile'], sort=False):
+        stem = f"operator_microbenchmark_{op}{'_compile' if use_compile else ''}"
+        if input_format == 'json':
+            write_synthetic_json(group, os.path.join(directory, stem + '.json'))
+        else:
+            group[CSV_COLUMNS].to_csv(os.path.join(directory, stem + '.csv'), index=False)
+
+def run_profiled_comparison(baseline_dir, new_dir, work_dir, input_format="csv", extra_args=()):
+    """Run the comparison tool in a fresh process with --profile and return the profile dict."""
+    output = os.path.join(work_dir, 'report.csv')
+    profile_file = os.path.join(work_dir, 'profile.json')
+    command = [
+        sys.executable, COMPARE_SCRIPT,
+        '--baseline-dir', baseline_dir,
+        '--new-dir', new_dir,
+        '--input-format', input_format,
+        '--output', output,
+        '--no-cache',
+        '--profile', profile_file,
+        *extra_args
+    ]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0 or not os.path.exists(profile_file):
+        raise RuntimeError(f"Comparison failed:\n{completed.stdout[-2000:]}{completed.stderr[-2000:]}")
+
+    with open(profile_file) as f:
+        return json.load(f)
+
+def bench_end_to_end(sizes, input_formats=("csv",), extra_args=('--fast-path-max-rows', '0'), data_dir=None):
+    """
+    Generate baseline/new datasets at each size and profile a full comparison run.
+
+    Args:
+        sizes: Rows per dataset (split over eager and compile files)
+        input_formats: Formats to generate and compare ("csv" and/or "json")
+        extra_args: Extra command line arguments for the comparison tool; by default the
+            fast path is off so every size measures the pandas pipeline
+        data_dir: Keep generated datasets here instead of a temporary directory
+
+    Returns:
+        DataFrame with one row per (format, size) and the wall time of each top-level phase
+    """
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix='benchmark_suite_') as temp_dir:
+        root = data_dir or temp_dir
+        for input_format in input_formats:
+            for num_rows in sizes:
+                dataset_dir = os.path.join(root, f"{input_format}_{num_rows}")
+                baseline_dir = os.path.join(dataset_dir, 'baseline')
+                new_dir = os.path.join(dataset_dir, 'new')
+
+                start = time.perf_counter()
+                baseline_cases = make_synthetic_cases(num_rows)
+                write_synthetic_dataset(baseline_cases, baseline_dir, input_format)
+                write_synthetic_dataset(perturb_synthetic_cases(baseline_cases), new_dir, input_format)
+                del baseline_cases
+                generate_time = time.perf_counter() - start
+
+                work_dir = os.path.join(dataset_dir, 'output')
+                os.makedirs(work_dir, exist_ok=True)
+                profile = run_profiled_comparison(baseline_dir, new_dir, work_dir, input_format, extra_args)
+
+                result = {
+                    'format': input_format,
+                    'rows': num_rows,
+                    'generate_s': round(generate_time, 3),
+                    'total_s': profile['total_wall_s'],
+                    'peak_rss_mb': profile['peak_rss_mb'],
+                }
+                for phase in profile['phases']:
+                    if '.' not in phase['phase']:
+                        result[f"{phase['phase']}_s"] = phase['wall_s']
+                results.append(result)
+                print(f"{input_format} {num_rows:>12,} rows: total {profile['total_wall_s']:.3f}s, "
+                      f"peak RSS {profile['peak_rss_mb']:.0f} MB")
+
+    return pd.DataFrame(results)
+
+def time_cli(arguments, repeat):
+    """Return the best wall time of running the comparison tool in a fresh process."""
+    def run():
+        completed = subprocess.run([sys.executable, COMPARE_SCRIPT, *arguments], capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"Comparison failed:\n{completed.stdout[-2000:]}{completed.stderr[-2000:]}")
+
+    return time_call(run, repeat)
+
+def bench_cold_start(sizes, repeat=5, data_dir=None):
+    """
+    Time fresh-process runs on small CSV datasets, on the stdlib fast path and through pandas.
+
+    Args:
+        sizes: Rows per dataset (split over eager and compile files)
+        repeat: Runs per measurement, best time is reported
+        data_dir: Keep generated datasets here instead of a temporary directory
+
+    Returns:
+        DataFrame with one row per size: fast_path_s, pandas_s and speedup
+    """
+    help_time = time_cli(['--help'], repeat)
+    print(f"--help: {help_time:.3f}s")
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix='benchmark_cold_start_') as temp_dir:
+        root = data_dir or temp_dir
+        for num_rows in sizes:
+            dataset_dir = os.path.join(root, f"cold_start_{num_rows}")
+            baseline_dir = os.path.join(dataset_dir, 'baseline')
+            new_dir = os.path.join(dataset_dir, 'new')
+            baseline_cases = make_synthetic_cases(num_rows)
+            write_synthetic_dataset(baseline_cases, baseline_dir)
+            write_synthetic_dataset(perturb_synthetic_cases(baseline_cases), new_dir)
+
+            arguments = [
+                '--baseline-dir', baseline_dir,
+                '--new-dir', new_dir,
+                '--output', os.path.join(dataset_dir, 'report.csv'),
+                '--no-cache',
+                # Large enough for every size, so only the second run uses pandas
+                '--fast-path-max-rows', str(4 * num_rows)
+            ]
+            fast_time = time_cli(arguments, repeat)
+            pandas_time = time_cli(arguments[:-1] + ['0'], repeat)
+            results.append({
+                'rows': num_rows,
+                'fast_path_s': fast_time,
+                'pandas_s': pandas_time,
+                'speedup': pandas_time / fast_time
+            })
+            print(f"{num_rows:>10,} rows: fast path {fast_time:.3f}s, pandas {pandas_time:.3f}s "
+                  f"({results[-1]['speedup']:.1f}x)")
+
+    return pd.DataFrame(results)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the PyTorch benchmark comparison tool')
+    parser.add_argument('--suite', choices=['percentage-change', 'end-to-end', 'cold-start', 'all'], default='all',
+                       help='Which benchmarks to run (default: all)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                       help='Row counts for the percentage-change benchmark (default: 10000 100000 1000000)')
+    parser.add_argument('--repeat', type=int, default=3,
+                       help='Repetitions per measurement, best time is reported (default: 3)')
+    parser.add_argument('--dataset-sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                       help='Rows per synthetic dataset for the end-to-end benchmark, e.g. up to 10000000 '
+                            '(default: 1000 10000 100000)')
+    parser.add_argument('--cold-start-sizes', type=int, nargs='+', default=[100, 1_000, 10_000],
+                       help='Rows per synthetic dataset for the cold-start benchmark (default: 100 1000 10000)')
+    parser.add_argument('--formats', choices=['csv', 'json'], nargs='+', default=['csv'],
+                       help='Dataset formats for the end-to-end benchmark (default: csv)')
+    parser.add_argument('--data-dir', default=None,
+                       help='Keep the generated datasets and reports here instead of a temporary directory')
+    parser.add_argument('--results', default=None,
+                       help='Append the end-to-end results as JSON lines to this file for tracking')
+
+    args = parser.parse_args()
+
+    if args.suite in ('percentage-change', 'all'):
+        print("=== PERCENTAGE CHANGE ===")
+        bench_percentage_change(args.sizes, args.repeat)
+
+    if args.suite in ('end-to-end', 'all'):
+        print("\n=== END TO END ===")
+        results = bench_end_to_end(args.dataset_sizes, args.formats, data_dir=args.data_dir)
+        print(results.to_string(index=False))
+
+        if args.results:
+            results['timestamp'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+            with open(args.results, 'a') as f:
+                f.write(results.to_json(orient='records', lines=True))
+            print(f"Results appended to: {args.results}")
+
+    if args.suite in ('cold-start', 'all'):
+        print("\n=== COLD START ===")
+        bench_cold_start(args.cold_start_sizes, args.repeat, data_dir=args.data_dir)
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark schema, file helpers and console summaries shared by the pandas pipeline
+(compare_pytorch_benchmarks.py) and the pure-stdlib fast path (fast_compare.py).
+Stdlib only, so the fast path can import it without pulling in pandas.
+"""
+
+import glob
+import gzip
+import io
+import os
+
+from case_names import extract_unique_cases
+
+CSV_COLUMNS = [
+    'Benchmarking Framework',
+    'Benchmarking Module Name',
+    'Case Name',
+    'tag',
+    'run_backward',
+    'Execution Time',
+    'Peak Memory (KB)'
+]
+
+# A benchmark is identified by all of these; mode only exists in the JSON export
+COMPOSITE_KEY_COLUMNS = ['Benchmarking Module Name', 'Case Name', 'run_backward', 'tag', 'mode']
+
+DUPLICATE_POLICIES = ['last', 'min', 'median']
+
+REGRESSION_REPORT_COLUMNS = [
+    'Case Name',
+    'Benchmarking Module Name_baseline',
+    'Execution Time_baseline',
+    'Execution Time_new',
+    'execution_time_change_pct',
+    'execution_time_regression',
+    'Peak Memory (KB)_baseline',
+    'Peak Memory (KB)_new',
+    'memory_change_pct',
+    'memory_regression',
+    'source_file_baseline',
+    'source_file_new'
+]
+
+# File suffix of the full comparison dump per --output-format
+FULL_OUTPUT_FORMATS = {
+    'csv': '.csv',
+    'csv.gz': '.csv.gz',
+    'parquet': '.parquet',
+    'arrow': '.arrow'
+}
+
+# Fast gzip level for compressed CSV dumps; mtime 0 keeps reruns byte-identical
+CSV_GZIP_LEVEL = 1
+
+def list_benchmark_files(directory, benchmark_type="eager", input_format="csv"):
+    """
+    List benchmark files in a directory filtered by type (eager vs compile).
+
+    Args:
+        directory: Directory containing benchmark files
+        benchmark_type: "eager" for non-compile benchmarks, "compile" for compile benchmarks,
+            "both" for all files
+        input_format: "csv" or "json", selects which file extension is read
+    """
+    benchmark_files = []
+
+    for benchmark_file in glob.glob(os.path.join(directory, f"*.{input_format}")):
+        filename = os.path.basename(benchmark_file)
+
+        # Filter by benchmark type
+        if benchmark_type == "eager" and "_compile" in filename:
+            continue
+        elif benchmark_type == "compile" and "_compile" not in filename:
+            continue
+
+        benchmark_files.append(benchmark_file)
+
+    return benchmark_files
+
+def calculate_percentage_change(old_value, new_value):
+    """Calculate percentage change from old to new value."""
+    if old_value == 0:
+        return float('inf') if new_value > 0 else 0.0
+    return ((new_value - old_value) / old_value) * 100
+
+def full_comparison_file(output_file, output_format="csv"):
+    """Path of the full comparison dump that goes with a regression report."""
+    return output_file.replace('.csv', '_full_comparison' + FULL_OUTPUT_FORMATS[output_format])
+
+def open_csv_output(path, output_format="csv"):
+    """Open a text handle for a plain or gzip-compressed (deterministic header) CSV dump."""
+    if output_format == 'csv.gz':
+        return io.TextIOWrapper(
+            gzip.GzipFile(path, 'wb', compresslevel=CSV_GZIP_LEVEL, mtime=0),
+            newline=''
+        )
+    return open(path, 'w', newline='')
+
+def print_case_overlap(baseline_cases, new_cases, baseline_rows, new_rows, benchmark_type):
+    """Print the entry counts and which case names will be compared or skipped."""
+    print(f"Baseline: {baseline_rows} {benchmark_type} benchmark entries")
+    print(f"New: {new_rows} {benchmark_type} benchmark entries")
+
+    # Check unique case names to show what will be excluded
+    baseline_cases = set(baseline_cases)
+    new_cases = set(new_cases)
+    print(f"Unique cases in baseline: {len(baseline_cases)}")
+    print(f"Unique cases in new: {len(new_cases)}")
+    print(f"Common cases (will be compared): {len(baseline_cases & new_cases)}")
+    print(f"Cases only in baseline (will be skipped): {len(baseline_cases - new_cases)}")
+    print(f"Cases only in new (will be skipped): {len(new_cases - baseline_cases)}")
+
+def print_regression_summary(execution_regressions, memory_regressions, max_exec_time_regression,
+                             max_memory_regression):
+    """Print the regression counts and, for kinds that regressed, the worst change."""
+    print(f"\nSummary:")
+    print(f"- Execution time regressions: {execution_regressions}")
+    print(f"- Memory regressions: {memory_regressions}")
+
+    if execution_regressions > 0:
+        print(f"- Worst execution time regression: {max_exec_time_regression:.2f}%")
+
+    if memory_regressions > 0:
+        print(f"- Worst memory regression: {max_memory_regression:.2f}%")
+
+def print_unique_cases_summary(cases_by_type):
+    """
+    Print the unique regressed cases per benchmark type and, when several types regressed,
+    combined.
+
+    Args:
+        cases_by_type: Dict mapping benchmark type to its regressed case names, or None
+            for a type without regressions
+    """
+    print("\n" + "="*60)
+    print("UNIQUE CASES SUMMARY")
+    print("="*60)
+
+    regressed = {benchmark_type: cases for benchmark_type, cases in cases_by_type.items() if cases is not None}
+    for benchmark_type, cases in regressed.items():
+        unique_cases = extract_unique_cases(cases)
+        print(f"\n{benchmark_type.title()} Benchmark Unique Cases ({len(unique_cases)} unique):")
+        for case in unique_cases:
+            print(f"  {case}")
+
+    if len(regressed) > 1:
+        all_unique = extract_unique_cases([case for cases in regressed.values() for case in cases])
+        print(f"\nAll Unique Cases Combined ({len(all_unique)} unique):")
+        for case in all_unique:
+            print(f"  {case}")
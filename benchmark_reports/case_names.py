@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Parse operator microbenchmark case names into structured fields.
+All case-name handling (load-time fields, unique-case grouping, reporting) goes through here
+so every name is parsed once per process.
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Structured fields parsed from case names such as
+# matmul_M256_N512_K4096_trans_aFalse_trans_bTrue_cuda_dtypetorch.float16_bwd1_BACKWARD
+CASE_NAME_PATTERN = re.compile(
+    r'^(?P<op>[A-Za-z0-9]+?)(?:_B(?P<B>\d+))?_M(?P<M>\d+)_N(?P<N>\d+)_K(?P<K>\d+)'
+    r'(?:_trans_a(?P<trans_a>True|False)_trans_b(?P<trans_b>True|False))?'
+    r'_(?P<device>[a-z]+)_dtypetorch\.(?P<dtype>\w+?)'
+    r'(?:_(?P<backward_variant>bwd\w*?)_BACKWARD)?$'
+)
+
+CASE_FIELD_COLUMNS = [
+    'case_op',
+    'case_B',
+    'case_M',
+    'case_N',
+    'case_K',
+    'case_trans_a',
+    'case_trans_b',
+    'case_device',
+    'case_dtype',
+    'case_bwd'
+]
+
+# Suffixes removed to group case names into unique cases, applied in this order.
+# The patterns are greedy on purpose: the dtype pattern also swallows the backward
+# suffix, and the trans pattern also swallows the device (matmul_M256_N512_K512).
+DTYPE_SUFFIX_PATTERN = re.compile(r'_dtypetorch\.\w+')
+BACKWARD_SUFFIX_PATTERN = re.compile(r'_bwd\w*_BACKWARD')
+TRANS_SUFFIX_PATTERN = re.compile(r'_trans_a\w+_trans_b\w+')
+
+# Distinct names memoized by the per-name parsers; bounded so a long-running server that
+# sees ever new case names does not grow without limit
+CASE_NAME_CACHE_SIZE = 1 << 16
+
+class CaseNameFields(NamedTuple):
+    """Structured view of one case name; shape and flag fields are None when absent."""
+    op: Optional[str]
+    B: Optional[int]
+    M: Optional[int]
+    N: Optional[int]
+    K: Optional[int]
+    trans_a: Optional[bool]
+    trans_b: Optional[bool]
+    device: Optional[str]
+    dtype: Optional[str]
+    backward_variant: Optional[str]
+    unique_case: str
+
+@lru_cache(maxsize=CASE_NAME_CACHE_SIZE)
+def strip_case_suffixes(case_name):
+    """Remove dtype, backward and transpose suffixes (memoized per name)."""
+    case_name = DTYPE_SUFFIX_PATTERN.sub('', case_name)
+    case_name = BACKWARD_SUFFIX_PATTERN.sub('', case_name)
+    return TRANS_SUFFIX_PATTERN.sub('', case_name)
+
+@lru_cache(maxsize=CASE_NAME_CACHE_SIZE)
+def parse_case_name(case_name):
+    """
+    Parse a single case name into CaseNameFields (memoized per name).
+
+    Names that do not follow the operator_microbenchmark pattern keep only unique_case.
+    """
+    match = CASE_NAME_PATTERN.match(case_name)
+    if match is None:
+        return CaseNameFields(None, None, None, None, None, None, None, None, None, None,
+                              strip_case_suffixes(case_name))
+
+    def dimension(name):
+        value = match.group(name)
+        return int(value) if value is not None else None
+
+    def flag(name):
+        value = match.group(name)
+        return value == 'True' if value is not None else None
+
+    return CaseNameFields(
+        op=match.group('op'),
+        B=dimension('B'),
+        M=dimension('M'),
+        N=dimension('N'),
+        K=dimension('K'),
+        trans_a=flag('trans_a'),
+        trans_b=flag('trans_b'),
+        device=match.group('device'),
+        dtype=match.group('dtype'),
+        backward_variant=match.group('backward_variant'),
+        unique_case=strip_case_suffixes(case_name)
+    )
+
+def parse_case_name_fields(case_names):
+    """
+    Parse a Series of case names into CASE_FIELD_COLUMNS.
+
+    Each distinct name is parsed once with a vectorized regex pass and the results are
+    broadcast back by factorized codes, so repeated names cost nothing extra. Columns are
+    assembled directly from codes and masks to keep the per-call overhead low.
+
+    Args:
+        case_names: Series of Case Name strings
+
+    Returns:
+        DataFrame with CASE_FIELD_COLUMNS, aligned to case_names' index
+    """
+    codes, uniques = pd.factorize(case_names.astype(str))
+    fields = pd.Series(uniques, dtype=object).str.extract(CASE_NAME_PATTERN)
+
+    # Rows whose name is missing take position 0 and are masked out below
+    missing = codes < 0
+    take = np.where(missing, 0, codes)
+
+    def categorical(group):
+        values = fields[group].astype('category').array
+        value_codes = values.codes[take] if len(values) else np.full(len(take), -1, dtype=np.int8)
+        value_codes[missing] = -1
+        return pd.Categorical.from_codes(value_codes, values.categories)
+
+    def masked(values, mask, array_type):
+        if len(values):
+            values, mask = values[take], mask[take] | missing
+        else:
+            values, mask = np.zeros(len(take), dtype=values.dtype), np.ones(len(take), dtype=bool)
+        return array_type(values, mask)
+
+    parsed = {'case_op': categorical('op')}
+    for dimension in ('B', 'M', 'N', 'K'):
+        values = fields[dimension]
+        parsed[f'case_{dimension}'] = masked(
+            values.fillna('0').to_numpy(dtype=object).astype(np.uint32),
+            values.isna().to_numpy(),
+            pd.arrays.IntegerArray
+        )
+    for flag in ('trans_a', 'trans_b'):
+        values = fields[flag]
+        parsed[f'case_{flag}'] = masked(
+            (values == 'True').to_numpy(),
+            values.isna().to_numpy(),
+            pd.arrays.BooleanArray
+        )
+    parsed['case_device'] = categorical('device')
+    parsed['case_dtype'] = categorical('dtype')
+    parsed['case_bwd'] = categorical('backward_variant')
+
+    return pd.DataFrame(parsed, index=case_names.index)[CASE_FIELD_COLUMNS]
+
+def unique_case_names(case_names):
+    """Map every case name to its unique case (suffixes stripped), parsing each distinct name once."""
+    case_names = pd.Series(case_names, dtype=object)
+    codes, uniques = pd.factorize(case_names)
+    stripped = pd.Series([strip_case_suffixes(name) for name in uniques], dtype=object)
+    return pd.Series(stripped.to_numpy()[codes], index=case_names.index)
+
+def extract_unique_cases(case_names):
+    """Extract unique cases by removing dtype and other suffixes."""
+    return sorted({strip_case_suffixes(case_name) for case_name in set(case_names)})
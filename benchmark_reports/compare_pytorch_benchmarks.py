@@ -4,11 +4,119 @@ Compare PyTorch benchmark reports between versions to identify performance regre
 This script compares execution time and memory usage between PyTorch 8 and 9 benchmarks.
 """
 
-import pandas as pd
 import os
 import glob
+import csv
+import json
+import heapq
+import tempfile
 from pathlib import Path
 import argparse
+import hashlib
+import math
+from collections import Counter
+from functools import partial
+
+from benchmark_common import (
+    COMPOSITE_KEY_COLUMNS,
+    CSV_COLUMNS,
+    DUPLICATE_POLICIES,
+    FULL_OUTPUT_FORMATS,
+    REGRESSION_REPORT_COLUMNS,
+    calculate_percentage_change,
+    full_comparison_file,
+    list_benchmark_files,
+    open_csv_output,
+    print_case_overlap,
+    print_regression_summary,
+    print_unique_cases_summary,
+)
+# extract_unique_cases lived here before case_names.py; re-exported for existing callers
+from case_names import CASE_FIELD_COLUMNS, extract_unique_cases, parse_case_name_fields
+from fast_compare import run_fast_comparison
+from lazy_imports import lazy_import
+from noise_floors import (
+    NOISE_LEVELS,
+    NOISE_REPORT_COLUMNS,
+    compute_noise_floors,
+    load_noise_table,
+    noise_thresholds,
+)
+from profiling import finish_profile, profile_phase, start_profile
+from regression_clusters import CLUSTER_FIELDS, build_rerun_manifest
+from report_rendering import ReportOptions, render_html_report, render_markdown_report
+from roofline import (
+    add_throughput_columns,
+    combine_regime_partials,
+    regime_partials,
+)
+
+# Imported on first use, so --help and the small-input fast path start without them
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+scipy_special = lazy_import('scipy.special', optional=True)
+pa = lazy_import('pyarrow', optional=True)
+pa_feather = lazy_import('pyarrow.feather', optional=True)
+pa_parquet = lazy_import('pyarrow.parquet', optional=True)
+orjson = lazy_import('orjson', optional=True)
+# Pulls in multiprocessing, only needed for parallel reads
+futures = lazy_import('concurrent.futures')
+
+# Fields only the JSON export carries on top of CSV_COLUMNS
+JSON_EXTRA_COLUMNS = ['mode', 'device', 'arch', 'use_compile', 'input_config']
+
+# Raw latency benchmark_values from the JSON export, used by --statistical and dropped
+# from the written reports
+SAMPLES_COLUMN = 'Execution Time Samples'
+
+JSON_METRIC_COLUMNS = {
+    'latency': 'Execution Time',
+    'peak memory': 'Peak Memory (KB)'
+}
+
+# Conversion to the CSV units (microseconds and KB)
+JSON_UNIT_SCALE = {
+    'us': 1.0,
+    'ms': 1e3,
+    's': 1e6,
+    'KB': 1.0,
+    'MB': 1024.0,
+    'GB': 1024.0 * 1024.0
+}
+
+# The JSON export drops the operator_benchmark tag; every CSV export in this repo uses "long"
+JSON_DEFAULT_TAG = 'long'
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'compare_pytorch_benchmarks')
+
+# Bump when the parsed frame or comparison layout changes so stale cache entries
+# and stored incremental partitions are ignored
+CACHE_FORMAT_VERSION = 4
+
+# Cache subdirectories counted against --cache-max-mb: parsed files and file-hash memos
+CACHE_SUBDIRS = ['entries', 'stat']
+
+# String columns with at most this share of distinct values are stored as categoricals
+CATEGORICAL_MAX_RATIO = 0.5
+
+# Default-mode CSV comparisons with at most this many input rows (both directories
+# together) run on the pure-stdlib fast path in fast_compare.py
+FAST_PATH_MAX_ROWS = 50_000
+
+# Largest broadcast array (in elements) the vectorized statistics build per block of cases
+STATISTICS_BLOCK_CELLS = 1 << 24
+
+# Streamed binary dumps buffer partitions into row groups / record batches of at least this many rows
+FULL_OUTPUT_BATCH_ROWS = 1 << 16
+
+STATISTICS_REPORT_COLUMNS = [
+    'execution_time_samples_baseline',
+    'execution_time_samples_new',
+    'execution_time_ci_low_pct',
+    'execution_time_ci_high_pct',
+    'execution_time_p_value',
+    'execution_time_effect_size'
+]
 
 def load_benchmark_data(directory):
     """Load all benchmark CSV files from a directory into a single DataFrame."""
@@ -27,369 +135,1726 @@ def load_benchmark_data(directory):
     combined_df = pd.concat(all_data, ignore_index=True)
     return combined_df
 
-def load_benchmark_data_by_type(directory, benchmark_type="eager"):
+def read_json_records(json_file):
+    """Parse a JSON file with orjson when it is installed, falling back to the stdlib parser."""
+    with open(json_file, 'rb') as f:
+        raw = f.read()
+    
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def load_benchmark_json(json_file, tag=JSON_DEFAULT_TAG):
     """
-    Load benchmark CSV files filtered by type (eager vs compile).
+    Load an operator_microbenchmark_*.json file into the same frame schema as the CSV exports.
+    
+    The JSON export stores one record per (case, metric). Latency and peak memory records
+    for the same case are folded into a single row, values are averaged over
+    benchmark_values, and training-mode records get the _BACKWARD suffix the CSV export
+    uses. The extra JSON fields are kept as additional columns.
     
     Args:
-        directory: Directory containing benchmark files
-        benchmark_type: "eager" for non-compile benchmarks, "compile" for compile benchmarks
+        json_file: Path to the JSON benchmark file
+        tag: Value for the tag column, which the JSON export does not record
+    
+    Returns:
+        DataFrame with CSV_COLUMNS, JSON_EXTRA_COLUMNS and the SAMPLES_COLUMN list column
     """
-    csv_files = glob.glob(os.path.join(directory, "*.csv"))
-    all_data = []
+    rows = {}
     
-    for csv_file in csv_files:
-        filename = os.path.basename(csv_file)
+    for record in read_json_records(json_file):
+        benchmark = record['benchmark']
+        extra_info = benchmark.get('extra_info', {})
+        metric = record['metric']
         
-        # Filter by benchmark type
-        if benchmark_type == "eager" and "_compile" in filename:
+        column = JSON_METRIC_COLUMNS.get(metric['name'])
+        if column is None:
             continue
-        elif benchmark_type == "compile" and "_compile" not in filename:
+        
+        run_backward = benchmark.get('mode') == 'training'
+        case_name = record['model']['name'] + ('_BACKWARD' if run_backward else '')
+        
+        # Eager and compile records of one case may share a file, keep them apart
+        row_key = (case_name, extra_info.get('use_compile'))
+        row = rows.get(row_key)
+        if row is None:
+            row = rows[row_key] = {
+                'Benchmarking Framework': benchmark['name'].split()[0],
+                'Benchmarking Module Name': case_name.split('_', 1)[0],
+                'Case Name': case_name,
+                'tag': tag,
+                'run_backward': run_backward,
+                'Execution Time': float('nan'),
+                'Peak Memory (KB)': float('nan'),
+                'mode': benchmark.get('mode'),
+                'device': extra_info.get('device'),
+                'arch': extra_info.get('arch'),
+                'use_compile': extra_info.get('use_compile'),
+                'input_config': extra_info.get('input_config'),
+            }
+        
+        values = metric.get('benchmark_values') or []
+        if values:
+            scale = JSON_UNIT_SCALE.get(metric.get('unit'), 1.0)
+            row[column] = scale * sum(values) / len(values)
+            if column == 'Execution Time':
+                row[SAMPLES_COLUMN] = [scale * value for value in values]
+    
+    return pd.DataFrame(list(rows.values()), columns=CSV_COLUMNS + JSON_EXTRA_COLUMNS + [SAMPLES_COLUMN])
+
+def parse_benchmark_file(benchmark_file):
+    """Parse a single CSV or JSON benchmark file into a DataFrame."""
+    if benchmark_file.endswith('.json'):
+        return load_benchmark_json(benchmark_file)
+    return pd.read_csv(benchmark_file)
+
+def hash_file(path, block_size=1 << 20):
+    """Return the blake2b hex digest of a file's contents."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cached_file_digest(benchmark_file, cache_dir):
+    """
+    Return the content hash of a benchmark file, reusing the last hash while its size and
+    mtime are unchanged so unchanged inputs are not even re-read. The memo is touched on
+    every hit so cache eviction treats it as recently used.
+    """
+    stat = os.stat(benchmark_file)
+    path_key = hashlib.blake2b(os.path.abspath(benchmark_file).encode(), digest_size=20).hexdigest()
+    stat_file = os.path.join(cache_dir, 'stat', f"{path_key}.json")
+    
+    try:
+        with open(stat_file) as f:
+            memo = json.load(f)
+        if memo['size'] == stat.st_size and memo['mtime_ns'] == stat.st_mtime_ns:
+            os.utime(stat_file)
+            return memo['digest']
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    digest = hash_file(benchmark_file)
+    os.makedirs(os.path.dirname(stat_file), exist_ok=True)
+    write_atomic(stat_file, lambda tmp: Path(tmp).write_text(json.dumps({
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'digest': digest
+    })))
+    return digest
+
+def write_atomic(path, write_func):
+    """Call write_func on a temporary path next to path, then rename it into place."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        write_func(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def read_benchmark_file_cached(benchmark_file, cache_dir):
+    """
+    Read a benchmark file through the on-disk Arrow IPC cache.
+    
+    Entries are keyed by content hash (plus CACHE_FORMAT_VERSION), stored uncompressed so
+    later runs can memory-map them, and touched on every hit so eviction is LRU.
+    Falls back to a plain read when pyarrow is not installed.
+    
+    Args:
+        benchmark_file: Path to a CSV or JSON benchmark file
+        cache_dir: Cache directory
+    """
+    if pa_feather is None:
+        return parse_benchmark_file(benchmark_file)
+    
+    digest = cached_file_digest(benchmark_file, cache_dir)
+    extension = os.path.splitext(benchmark_file)[1].lstrip('.')
+    entry = os.path.join(cache_dir, 'entries', f"{digest}_{extension}_v{CACHE_FORMAT_VERSION}.arrow")
+    
+    if os.path.exists(entry):
+        try:
+            df = pa_feather.read_table(entry, memory_map=True).to_pandas()
+            os.utime(entry)
+            return df
+        except (OSError, pa.ArrowException):
+            # Corrupt or truncated entry, re-parse and overwrite below
+            pass
+    
+    df = parse_benchmark_file(benchmark_file)
+    os.makedirs(os.path.dirname(entry), exist_ok=True)
+    write_atomic(entry, lambda tmp: pa_feather.write_feather(df, tmp, compression='uncompressed'))
+    return df
+
+def evict_benchmark_cache(cache_dir, max_bytes):
+    """
+    Delete least recently used cache files until the cache fits in max_bytes.
+    
+    Parsed entries and file-hash memos (the stat directory) share one budget. Files that
+    disappear meanwhile, e.g. evicted by a concurrent run, are skipped.
+    
+    Returns:
+        Number of files removed
+    """
+    entries = []
+    for subdir in CACHE_SUBDIRS:
+        cache_subdir = os.path.join(cache_dir, subdir)
+        if not os.path.isdir(cache_subdir):
             continue
-            
-        df = pd.read_csv(csv_file)
-        df['source_file'] = filename
-        all_data.append(df)
+        for entry in os.scandir(cache_subdir):
+            try:
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except FileNotFoundError:
+                continue
+    
+    total_bytes = sum(size for _, size, _ in entries)
+    removed = 0
+    
+    for _, size, path in sorted(entries):
+        if total_bytes <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        total_bytes -= size
+    
+    return removed
+
+def trim_benchmark_cache(cache_dir, max_mb):
+    """Evict the cache down to max_mb (see evict_benchmark_cache) and report what was removed."""
+    if cache_dir is None:
+        return 0
+    removed = evict_benchmark_cache(cache_dir, int(max_mb * 1024 * 1024))
+    if removed:
+        print(f"Evicted {removed} stale entries from benchmark cache: {cache_dir}")
+    return removed
+
+def read_benchmark_file(benchmark_file, cache_dir=None):
+    """Read a single CSV or JSON benchmark file, through the parse cache if cache_dir is set."""
+    if cache_dir is not None:
+        return read_benchmark_file_cached(benchmark_file, cache_dir)
+    return parse_benchmark_file(benchmark_file)
+
+def compact_benchmark_frame(df):
+    """
+    Shrink a loaded benchmark frame and attach the parsed case-name fields.
+    
+    Repetitive string columns become categoricals, float columns become float32 when that
+    round-trips every value exactly (e.g. whole-KB peak memory), and the case name is parsed
+    once into CASE_FIELD_COLUMNS. Case Name itself stays a plain string because it is
+    nearly unique per row and is the merge key.
+    
+    Apply this after concatenating files: categoricals with different categories would
+    otherwise fall back to object dtype when concatenated.
+    """
+    df = df.copy()
+    
+    for column in df.columns:
+        if column == 'Case Name' or column == SAMPLES_COLUMN:
+            continue
+        values = df[column]
+        if values.dtype == object or pd.api.types.is_string_dtype(values.dtype):
+            if len(values) > 0 and values.nunique(dropna=False) <= len(values) * CATEGORICAL_MAX_RATIO:
+                df[column] = values.astype('category')
+        elif values.dtype == np.float64:
+            downcast = values.astype(np.float32)
+            if np.array_equal(downcast.to_numpy(dtype=np.float64), values.to_numpy(), equal_nan=True):
+                df[column] = downcast
+    
+    if 'Case Name' in df.columns:
+        parsed = parse_case_name_fields(df['Case Name'])
+        df[CASE_FIELD_COLUMNS] = parsed[CASE_FIELD_COLUMNS]
+    
+    return df
+
+def load_benchmark_data_by_type(directory, benchmark_type="eager", input_format="csv", cache_dir=None,
+                                jobs=None, use_processes=False):
+    """
+    Load benchmark files filtered by type (eager vs compile).
+    
+    Args:
+        directory: Directory containing benchmark files
+        benchmark_type: "eager" for non-compile benchmarks, "compile" for compile benchmarks
+        input_format: "csv" or "json"
+        cache_dir: Parsed-file cache directory, or None to always parse
+        jobs: Number of parallel readers (see read_benchmark_files)
+        use_processes: Read with a process pool instead of a thread pool
+    """
+    with profile_phase('glob') as record:
+        benchmark_files = list_benchmark_files(directory, benchmark_type, input_format)
+        record['files'] = len(benchmark_files)
+    with profile_phase('read') as record:
+        all_data = read_benchmark_files(benchmark_files, cache_dir, jobs, use_processes)
+        record['rows'] = sum(len(df) for df in all_data)
     
     if not all_data:
-        raise ValueError(f"No {benchmark_type} CSV files found in {directory}")
+        raise ValueError(f"No {benchmark_type} {input_format.upper()} files found in {directory}")
     
-    combined_df = pd.concat(all_data, ignore_index=True)
-    return combined_df
+    with profile_phase('concat') as record:
+        combined_df = pd.concat(all_data, ignore_index=True)
+        record['rows'] = len(combined_df)
+    with profile_phase('compact', rows=len(combined_df)):
+        return compact_benchmark_frame(combined_df)
 
-def calculate_percentage_change(old_value, new_value):
-    """Calculate percentage change from old to new value."""
-    if old_value == 0:
-        return float('inf') if new_value > 0 else 0
-    return ((new_value - old_value) / old_value) * 100
+def read_benchmark_file_with_source(benchmark_file, cache_dir=None):
+    """Read a single benchmark file and tag its rows with the source_file name."""
+    df = read_benchmark_file(benchmark_file, cache_dir)
+    df['source_file'] = os.path.basename(benchmark_file)
+    return df
 
-def compare_benchmarks(baseline_dir, new_dir, threshold=5.0, benchmark_type="eager"):
+def read_benchmark_files(benchmark_files, cache_dir=None, jobs=None, use_processes=False):
     """
-    Compare benchmarks between baseline and new directories.
+    Read benchmark files concurrently, tagging each frame with its source_file.
+    
+    Threads suit CSV parsing, which releases the GIL for most of its work. Processes help
+    JSON parsing, which holds the GIL, at the cost of pickling each frame back.
     
     Args:
-        baseline_dir: Path to baseline benchmark directory
-        new_dir: Path to new benchmark directory
-        threshold: Threshold percentage for considering a regression (default: 5.0%)
-        benchmark_type: "eager" or "compile" to compare same type of benchmarks
+        benchmark_files: Benchmark CSV or JSON files to read
+        cache_dir: Parsed-file cache directory, or None to always parse
+        jobs: Number of workers; None picks the executor default, 1 reads serially
+        use_processes: Use a process pool instead of a thread pool
     
     Returns:
-        DataFrame with comparison results
+        List of DataFrames in the same order as benchmark_files
     """
-    print(f"Loading baseline {benchmark_type} benchmarks from: {baseline_dir}")
-    baseline_data = load_benchmark_data_by_type(baseline_dir, benchmark_type)
+    read_one = partial(read_benchmark_file_with_source, cache_dir=cache_dir)
     
-    print(f"Loading new {benchmark_type} benchmarks from: {new_dir}")
-    new_data = load_benchmark_data_by_type(new_dir, benchmark_type)
+    if jobs == 1 or len(benchmark_files) <= 1:
+        return [read_one(benchmark_file) for benchmark_file in benchmark_files]
     
-    print(f"Baseline: {len(baseline_data)} {benchmark_type} benchmark entries")
-    print(f"New: {len(new_data)} {benchmark_type} benchmark entries")
+    executor_class = futures.ProcessPoolExecutor if use_processes else futures.ThreadPoolExecutor
+    with executor_class(max_workers=jobs) as executor:
+        # map() yields in submission order, so the result matches the serial read
+        return list(executor.map(read_one, benchmark_files))
+
+def load_benchmark_data_split(directory, input_format="csv", cache_dir=None, jobs=None, use_processes=False):
+    """
+    Load every benchmark file in a directory once and split the rows into eager and compile.
     
-    # Check unique case names to show what will be excluded
-    baseline_cases = set(baseline_data['Case Name'])
-    new_cases = set(new_data['Case Name'])
-    common_cases = baseline_cases.intersection(new_cases)
-    only_in_baseline = baseline_cases - new_cases
-    only_in_new = new_cases - baseline_cases
+    Rows are classified by the use_compile field when the file carries it (JSON) and by the
+    _compile filename marker otherwise, matching load_benchmark_data_by_type for each type.
     
-    print(f"Unique cases in baseline: {len(baseline_cases)}")
-    print(f"Unique cases in new: {len(new_cases)}")
-    print(f"Common cases (will be compared): {len(common_cases)}")
-    print(f"Cases only in baseline (will be skipped): {len(only_in_baseline)}")
-    print(f"Cases only in new (will be skipped): {len(only_in_new)}")
+    Args:
+        directory: Directory containing benchmark files
+        input_format: "csv" or "json"
+        cache_dir: Parsed-file cache directory, or None to always parse
+        jobs: Number of parallel readers (see read_benchmark_files)
+        use_processes: Read with a process pool instead of a thread pool
     
-    # Merge data on Case Name to compare same benchmarks
-    merged = pd.merge(
-        baseline_data, 
-        new_data, 
-        on='Case Name', 
-        suffixes=('_baseline', '_new'),
-        how='inner'
-    )
+    Returns:
+        Dict mapping "eager" and "compile" to their DataFrames
+    """
+    with profile_phase('glob') as record:
+        benchmark_files = list_benchmark_files(directory, "both", input_format)
+        record['files'] = len(benchmark_files)
+    with profile_phase('read') as record:
+        frames = read_benchmark_files(benchmark_files, cache_dir, jobs, use_processes)
+        record['rows'] = sum(len(df) for df in frames)
+    eager_data = []
+    compile_data = []
     
-    print(f"Successfully merged {len(merged)} matching {benchmark_type} benchmarks between versions")
+    for df in frames:
+        is_compile_file = "_compile" in df['source_file'].iat[0] if len(df) > 0 else False
+        
+        if 'use_compile' in df.columns and df['use_compile'].notna().all():
+            compile_mask = df['use_compile'].astype(bool)
+        else:
+            compile_mask = pd.Series(is_compile_file, index=df.index)
+        
+        if compile_mask.all():
+            compile_data.append(df)
+        elif not compile_mask.any():
+            eager_data.append(df)
+        else:
+            compile_data.append(df[compile_mask])
+            eager_data.append(df[~compile_mask])
+    
+    split = {}
+    for benchmark_type, all_data in (('eager', eager_data), ('compile', compile_data)):
+        if not all_data:
+            raise ValueError(f"No {benchmark_type} {input_format.upper()} files found in {directory}")
+        with profile_phase(f'concat_{benchmark_type}') as record:
+            combined_df = pd.concat(all_data, ignore_index=True)
+            record['rows'] = len(combined_df)
+        with profile_phase(f'compact_{benchmark_type}', rows=len(combined_df)):
+            split[benchmark_type] = compact_benchmark_frame(combined_df)
+    
+    return split
+
+def calculate_percentage_change_columns(old_values, new_values):
+    """
+    Vectorized calculate_percentage_change over whole columns.
+    
+    Zero baselines follow the scalar semantics: inf if the new value grew, 0 otherwise.
+    
+    Args:
+        old_values: Array-like of baseline values
+        new_values: Array-like of new values (same length as old_values)
+    
+    Returns:
+        numpy float64 array of percentage changes
+    """
+    old_values = np.asarray(old_values, dtype=np.float64)
+    new_values = np.asarray(new_values, dtype=np.float64)
     
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = ((new_values - old_values) / old_values) * 100
+    
+    zero_baseline = old_values == 0
+    change[zero_baseline] = np.where(new_values[zero_baseline] > 0, np.inf, 0.0)
+    return change
+
+def flag_regressions(merged, threshold=5.0, noise_floors=None):
+    """
+    Add percentage-change and regression flag columns to a merged comparison frame in place.
+    
+    Args:
+        merged: DataFrame with _baseline/_new execution time and peak memory columns
+        threshold: Threshold percentage for considering a regression (default: 5.0%)
+        noise_floors: NoiseFloors of the frame's benchmark type, or None; each case's
+            threshold is then raised to its noise band (see noise_floors.noise_thresholds)
+            and recorded in NOISE_REPORT_COLUMNS
+    
+    Returns:
+        The same DataFrame, for chaining
+    """
     # Calculate percentage changes
-    merged['execution_time_change_pct'] = merged.apply(
-        lambda row: calculate_percentage_change(
-            row['Execution Time_baseline'], 
-            row['Execution Time_new']
-        ), axis=1
+    merged['execution_time_change_pct'] = calculate_percentage_change_columns(
+        merged['Execution Time_baseline'],
+        merged['Execution Time_new']
     )
     
-    merged['memory_change_pct'] = merged.apply(
-        lambda row: calculate_percentage_change(
-            row['Peak Memory (KB)_baseline'], 
-            row['Peak Memory (KB)_new']
-        ), axis=1
+    merged['memory_change_pct'] = calculate_percentage_change_columns(
+        merged['Peak Memory (KB)_baseline'],
+        merged['Peak Memory (KB)_new']
     )
     
     # Identify regressions (performance degradation)
     # For execution time: positive change means slower (regression)
     # For memory: positive change means more memory usage (regression)
-    merged['execution_time_regression'] = merged['execution_time_change_pct'] > threshold
-    merged['memory_regression'] = merged['memory_change_pct'] > threshold
+    time_threshold = memory_threshold = threshold
+    if noise_floors is not None:
+        time_threshold, memory_threshold = noise_thresholds(merged, noise_floors, threshold)
+        merged['execution_time_threshold_pct'] = time_threshold
+        merged['memory_threshold_pct'] = memory_threshold
+    
+    merged['execution_time_regression'] = merged['execution_time_change_pct'] > time_threshold
+    merged['memory_regression'] = merged['memory_change_pct'] > memory_threshold
     
     # Create summary columns
     merged['has_regression'] = merged['execution_time_regression'] | merged['memory_regression']
     
     return merged
 
-def generate_regression_report(comparison_df, output_file, threshold=5.0):
-    """Generate a detailed regression report."""
+def samples_to_matrix(samples):
+    """
+    Pack a Series of per-case sample lists into a NaN-padded 2D array.
     
-    # Filter for regressions only
-    regressions = comparison_df[comparison_df['has_regression']].copy()
+    Returns:
+        (matrix, counts): matrix is n_cases x max_samples, counts is samples per case
+    """
+    sample_lists = [values if isinstance(values, (list, tuple, np.ndarray)) else [] for values in samples]
+    counts = np.fromiter((len(values) for values in sample_lists), dtype=np.int64, count=len(sample_lists))
+    matrix = np.full((len(sample_lists), max(int(counts.max(initial=0)), 1)), np.nan)
     
-    if len(regressions) == 0:
-        print("No regressions found!")
-        return
+    if counts.sum() > 0:
+        rows = np.repeat(np.arange(len(sample_lists)), counts)
+        offsets = np.cumsum(counts) - counts
+        columns = np.arange(counts.sum()) - np.repeat(offsets, counts)
+        matrix[rows, columns] = np.concatenate([np.asarray(values, dtype=np.float64)
+                                                for values in sample_lists if len(values) > 0])
     
-    print(f"\nFound {len(regressions)} benchmarks with regressions > {threshold}%")
+    return matrix, counts
+
+def case_blocks(num_cases, cells_per_case, max_cells=STATISTICS_BLOCK_CELLS):
+    """Yield slices over cases so each block's broadcast arrays stay under max_cells."""
+    block = max(1, max_cells // max(cells_per_case, 1))
+    for start in range(0, num_cases, block):
+        yield slice(start, min(start + block, num_cases))
+
+def erfc_vectorized(values):
+    """Elementwise complementary error function, with scipy when it is installed."""
+    if scipy_special is not None:
+        return scipy_special.erfc(values)
+    return np.vectorize(math.erfc, otypes=[np.float64])(values)
+
+def mann_whitney_regression_test(baseline, new, baseline_counts, new_counts):
+    """
+    One-sided Mann-Whitney U test (new slower than baseline) for every case at once.
     
-    # Create detailed report
-    report_columns = [
-        'Case Name',
-        'Benchmarking Module Name_baseline',
-        'Execution Time_baseline',
-        'Execution Time_new', 
-        'execution_time_change_pct',
-        'execution_time_regression',
-        'Peak Memory (KB)_baseline',
-        'Peak Memory (KB)_new',
-        'memory_change_pct', 
-        'memory_regression',
-        'source_file_baseline',
-        'source_file_new'
-    ]
+    Uses the normal approximation with continuity correction. Cases with fewer than two
+    samples on either side get a NaN p-value.
     
-    regression_report = regressions[report_columns].copy()
+    Returns:
+        (p_value, effect_size): effect_size is Cliff's delta, P(new > base) - P(new < base)
+    """
+    num_cases = baseline.shape[0]
+    greater = np.zeros(num_cases)
+    less = np.zeros(num_cases)
     
-    # Sort by execution time regression severity
-    regression_report = regression_report.sort_values(
-        'execution_time_change_pct', 
-        ascending=False
+    for block in case_blocks(num_cases, baseline.shape[1] * new.shape[1]):
+        # NaN padding compares False both ways, so it never counts
+        pairs_new = new[block, None, :]
+        pairs_base = baseline[block, :, None]
+        greater[block] = (pairs_new > pairs_base).sum(axis=(1, 2))
+        less[block] = (pairs_new < pairs_base).sum(axis=(1, 2))
+    
+    n1 = baseline_counts.astype(np.float64)
+    n2 = new_counts.astype(np.float64)
+    pairs = n1 * n2
+    ties = pairs - greater - less
+    u_new = greater + 0.5 * ties
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = (u_new - pairs / 2 - 0.5) / np.sqrt(pairs * (n1 + n2 + 1) / 12)
+        effect_size = (greater - less) / pairs
+    
+    p_value = 0.5 * erfc_vectorized(z / np.sqrt(2))
+    testable = (baseline_counts >= 2) & (new_counts >= 2)
+    p_value[~testable] = np.nan
+    return p_value, effect_size
+
+def bootstrap_change_interval(baseline, new, baseline_counts, new_counts,
+                              n_bootstrap=1000, confidence=0.95, seed=0):
+    """
+    Bootstrap confidence interval of the percentage change in mean, for every case at once.
+    
+    Each case is resampled with replacement within its own sample count, so cases with
+    different numbers of benchmark_values share one vectorized pass.
+    
+    Returns:
+        (low, high) percentage-change bounds per case
+    """
+    rng = np.random.default_rng(seed)
+    num_cases = baseline.shape[0]
+    low = np.full(num_cases, np.nan)
+    high = np.full(num_cases, np.nan)
+    tail = (1 - confidence) / 2 * 100
+    
+    def resampled_means(samples, counts, block):
+        block_counts = np.maximum(counts[block], 1)
+        draws = (rng.random((len(block_counts), n_bootstrap, samples.shape[1])) *
+                 block_counts[:, None, None]).astype(np.int64)
+        values = np.take_along_axis(samples[block, None, :], draws, axis=2)
+        # Only the first count draws belong to a case's resample
+        in_sample = np.arange(samples.shape[1]) < block_counts[:, None, None]
+        return np.where(in_sample, values, 0.0).sum(axis=2) / block_counts[:, None]
+    
+    width = n_bootstrap * max(baseline.shape[1], new.shape[1])
+    for block in case_blocks(num_cases, width):
+        base_means = resampled_means(baseline, baseline_counts, block)
+        new_means = resampled_means(new, new_counts, block)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = (new_means - base_means) / base_means * 100
+        low[block], high[block] = np.nanpercentile(change, [tail, 100 - tail], axis=1)
+    
+    return low, high
+
+def apply_sample_statistics(merged, threshold=5.0, alpha=0.05, n_bootstrap=1000, seed=0):
+    """
+    Replace the point-estimate execution time flags with a multi-sample decision.
+    
+    A case regresses when the one-sided Mann-Whitney p-value is below alpha and the lower
+    bootstrap bound of its percentage change is above threshold. Cases with fewer than two
+    samples on either side keep the point-estimate rule from flag_regressions.
+    
+    Args:
+        merged: Output of flag_regressions with Execution Time Samples_baseline/_new columns
+        threshold: Threshold percentage for considering a regression (default: 5.0%), or
+            per-row thresholds
+        alpha: Significance level of the Mann-Whitney test
+        n_bootstrap: Bootstrap resamples per case
+        seed: Random seed for the bootstrap
+    
+    Returns:
+        The same DataFrame, for chaining
+    """
+    baseline, baseline_counts = samples_to_matrix(merged[f'{SAMPLES_COLUMN}_baseline'])
+    new, new_counts = samples_to_matrix(merged[f'{SAMPLES_COLUMN}_new'])
+    
+    p_value, effect_size = mann_whitney_regression_test(baseline, new, baseline_counts, new_counts)
+    ci_low, ci_high = bootstrap_change_interval(baseline, new, baseline_counts, new_counts,
+                                                n_bootstrap=n_bootstrap, seed=seed)
+    
+    merged['execution_time_samples_baseline'] = baseline_counts
+    merged['execution_time_samples_new'] = new_counts
+    merged['execution_time_ci_low_pct'] = ci_low
+    merged['execution_time_ci_high_pct'] = ci_high
+    merged['execution_time_p_value'] = p_value
+    merged['execution_time_effect_size'] = effect_size
+    
+    testable = ~np.isnan(p_value)
+    significant = (p_value < alpha) & (ci_low > threshold)
+    merged['execution_time_regression'] = np.where(testable, significant, merged['execution_time_regression'])
+    merged['has_regression'] = merged['execution_time_regression'] | merged['memory_regression']
+    
+    return merged
+
+def benchmark_key_columns(baseline_data, new_data):
+    """Return the COMPOSITE_KEY_COLUMNS present in both frames (CSV exports have no mode)."""
+    return [column for column in COMPOSITE_KEY_COLUMNS
+            if column in baseline_data.columns and column in new_data.columns]
+
+def deduplicate_benchmarks(df, key_columns, policy="last"):
+    """
+    Collapse rows that share a composite benchmark key into one row.
+    
+    Metric columns are reduced with policy, other columns keep their last value, sample
+    lists are concatenated, and each collapsed row takes the position of its last duplicate.
+    
+    Args:
+        df: Benchmark DataFrame
+        key_columns: Columns that identify one benchmark
+        policy: "last" (the most recent re-run), "min" or "median"
+    
+    Returns:
+        (deduplicated DataFrame, number of rows removed)
+    """
+    if policy not in DUPLICATE_POLICIES:
+        raise ValueError(f"Unknown duplicate policy {policy!r}, expected one of {DUPLICATE_POLICIES}")
+    
+    duplicated = df.duplicated(key_columns, keep=False)
+    if not duplicated.any():
+        return df, 0
+    
+    duplicates = df[duplicated]
+    aggregations = {column: 'last' for column in df.columns if column not in key_columns}
+    for column in ('Execution Time', 'Peak Memory (KB)'):
+        if column in aggregations:
+            aggregations[column] = policy
+    if SAMPLES_COLUMN in aggregations:
+        aggregations[SAMPLES_COLUMN] = lambda lists: [value for values in lists for value in values]
+    
+    grouped = duplicates.reset_index().groupby(key_columns, sort=False, dropna=False, observed=True)
+    collapsed = grouped.agg({**aggregations, 'index': 'last'}).reset_index().set_index('index')
+    collapsed.index.name = None
+    
+    deduplicated = pd.concat([df[~duplicated], collapsed[df.columns]]).sort_index()
+    return deduplicated.reset_index(drop=True), len(df) - len(deduplicated)
+
+def merge_benchmark_frames(baseline_data, new_data, duplicate_policy="last"):
+    """
+    Inner-join baseline and new frames on the composite benchmark key.
+    
+    Duplicate keys on either side are collapsed first, so every benchmark pairs with
+    exactly one row and the result grows linearly with the input. The output keeps the
+    historical layout: Case Name once, every other column with _baseline/_new suffixes,
+    followed by a single copy of the parsed CASE_FIELD_COLUMNS.
+    
+    Args:
+        baseline_data: Baseline benchmark DataFrame
+        new_data: New benchmark DataFrame
+        duplicate_policy: How duplicates are collapsed (see deduplicate_benchmarks)
+    
+    Returns:
+        (merged DataFrame, rows removed from baseline, rows removed from new)
+    """
+    key_columns = benchmark_key_columns(baseline_data, new_data)
+    baseline_data, baseline_removed = deduplicate_benchmarks(baseline_data, key_columns, duplicate_policy)
+    new_data, new_removed = deduplicate_benchmarks(new_data, key_columns, duplicate_policy)
+    
+    # Parsed case-name fields are a function of Case Name, keep a single unsuffixed copy
+    case_fields = [column for column in CASE_FIELD_COLUMNS if column in baseline_data.columns]
+    new_data = new_data.drop(columns=[column for column in CASE_FIELD_COLUMNS if column in new_data.columns])
+    
+    # Join on copies of the non-Case-Name keys so the originals still get suffixed
+    join_columns = {column: f'{column}__join' for column in key_columns if column != 'Case Name'}
+    merged = pd.merge(
+        baseline_data.assign(**{join: baseline_data[column] for column, join in join_columns.items()}),
+        new_data.assign(**{join: new_data[column] for column, join in join_columns.items()}),
+        on=['Case Name'] + list(join_columns.values()),
+        suffixes=('_baseline', '_new'),
+        how='inner'
     )
     
-    # Save to CSV
-    regression_report.to_csv(output_file, index=False)
-    print(f"Regression report saved to: {output_file}")
+    merged = merged.drop(columns=list(join_columns.values()))
+    merged = merged[[column for column in merged.columns if column not in case_fields] + case_fields]
+    return merged, baseline_removed, new_removed
+
+def compare_benchmarks(baseline_dir, new_dir, threshold=5.0, benchmark_type="eager", input_format="csv",
+                       cache_dir=None, jobs=None, use_processes=False,
+                       statistical=False, alpha=0.05, n_bootstrap=1000, duplicate_policy="last",
+                       noise_floors=None):
+    """
+    Compare benchmarks between baseline and new directories.
     
-    # Print summary statistics
-    execution_regressions = regressions[regressions['execution_time_regression']]
-    memory_regressions = regressions[regressions['memory_regression']]
+    Args:
+        baseline_dir: Path to baseline benchmark directory
+        new_dir: Path to new benchmark directory
+        threshold: Threshold percentage for considering a regression (default: 5.0%)
+        benchmark_type: "eager" or "compile" to compare same type of benchmarks
+        input_format: "csv" or "json" benchmark files
+        cache_dir: Parsed-file cache directory, or None to always parse
+        jobs: Number of parallel readers (see read_benchmark_files)
+        use_processes: Read with a process pool instead of a thread pool
+        statistical: Use all benchmark_values samples (see compare_benchmark_frames)
+        alpha: Significance level for statistical mode
+        n_bootstrap: Bootstrap resamples per case for statistical mode
+        duplicate_policy: How duplicate benchmark keys are collapsed ("last", "min" or "median")
+        noise_floors: Per-case noise bands (see flag_regressions), or None
     
-    print(f"\nSummary:")
-    print(f"- Execution time regressions: {len(execution_regressions)}")
-    print(f"- Memory regressions: {len(memory_regressions)}")
+    Returns:
+        DataFrame with comparison results
+    """
+    print(f"Loading baseline {benchmark_type} benchmarks from: {baseline_dir}")
+    with profile_phase('load_baseline'):
+        baseline_data = load_benchmark_data_by_type(baseline_dir, benchmark_type, input_format, cache_dir,
+                                                    jobs, use_processes)
     
-    if len(execution_regressions) > 0:
-        max_exec_time_regression = execution_regressions['execution_time_change_pct'].max()
-        print(f"- Worst execution time regression: {max_exec_time_regression:.2f}%")
+    print(f"Loading new {benchmark_type} benchmarks from: {new_dir}")
+    with profile_phase('load_new'):
+        new_data = load_benchmark_data_by_type(new_dir, benchmark_type, input_format, cache_dir,
+                                               jobs, use_processes)
     
-    if len(memory_regressions) > 0:
-        max_memory_regression = memory_regressions['memory_change_pct'].max()
-        print(f"- Worst memory regression: {max_memory_regression:.2f}%")
+    return compare_benchmark_frames(baseline_data, new_data, threshold, benchmark_type,
+                                    statistical, alpha, n_bootstrap, duplicate_policy, noise_floors)
+
+def compare_benchmark_frames(baseline_data, new_data, threshold=5.0, benchmark_type="eager",
+                             statistical=False, alpha=0.05, n_bootstrap=1000, duplicate_policy="last",
+                             noise_floors=None):
+    """
+    Compare already loaded baseline and new benchmark frames of one type.
     
-    return {
+    Args:
+        baseline_data: Baseline DataFrame (as returned by load_benchmark_data_by_type)
+        new_data: New DataFrame (as returned by load_benchmark_data_by_type)
+        threshold: Threshold percentage for considering a regression (default: 5.0%)
+        benchmark_type: "eager" or "compile", used for progress messages
+        statistical: Decide execution time regressions from all benchmark_values samples
+            (see apply_sample_statistics); needs JSON input
+        alpha: Significance level for statistical mode
+        n_bootstrap: Bootstrap resamples per case for statistical mode
+        duplicate_policy: How rows sharing a composite benchmark key are collapsed
+            ("last", "min" or "median")
+        noise_floors: Per-case noise bands (see flag_regressions), or None
+    
+    Returns:
+        DataFrame with comparison results
+    """
+    print_case_overlap(baseline_data['Case Name'], new_data['Case Name'],
+                       len(baseline_data), len(new_data), benchmark_type)
+    
+    # Merge data on the composite benchmark key to compare same benchmarks
+    with profile_phase('merge', rows_baseline=len(baseline_data), rows_new=len(new_data)) as record:
+        merged, baseline_removed, new_removed = merge_benchmark_frames(baseline_data, new_data, duplicate_policy)
+        record['rows'] = len(merged)
+    if baseline_removed or new_removed:
+        print(f"Collapsed duplicate benchmark keys ({duplicate_policy}): "
+              f"{baseline_removed} baseline rows, {new_removed} new rows")
+    
+    print(f"Successfully merged {len(merged)} matching {benchmark_type} benchmarks between versions")
+    
+    with profile_phase('flag', rows=len(merged)):
+        return flag_comparison(merged, threshold, statistical, alpha, n_bootstrap, noise_floors)
+
+def flag_comparison(merged, threshold=5.0, statistical=False, alpha=0.05, n_bootstrap=1000, noise_floors=None):
+    """
+    Flag regressions on a merged frame, optionally with sample statistics, and drop the
+    raw sample columns so they never reach the written reports.
+    """
+    flag_regressions(merged, threshold, noise_floors)
+    add_throughput_columns(merged)
+    
+    sample_columns = [f'{SAMPLES_COLUMN}_baseline', f'{SAMPLES_COLUMN}_new']
+    if statistical:
+        if not all(column in merged.columns for column in sample_columns):
+            raise ValueError("Statistical comparison needs per-sample benchmark_values, use --input-format json")
+        time_threshold = merged['execution_time_threshold_pct'].to_numpy() if noise_floors is not None else threshold
+        apply_sample_statistics(merged, time_threshold, alpha, n_bootstrap)
+    
+    return merged.drop(columns=sample_columns, errors='ignore')
+
+def build_regression_report(comparison_df, case_fields=False):
+    """
+    Select the report columns of the regressed rows, worst execution time regression first.
+    
+    With case_fields, the parsed CASE_FIELD_COLUMNS are appended for in-memory consumers
+    (e.g. the re-run manifest); they are never written to the report CSV.
+    """
+    regressions = comparison_df[comparison_df['has_regression']]
+    optional_columns = STATISTICS_REPORT_COLUMNS + NOISE_REPORT_COLUMNS + (CASE_FIELD_COLUMNS if case_fields else [])
+    report_columns = REGRESSION_REPORT_COLUMNS + [
+        column for column in optional_columns if column in regressions.columns
+    ]
+    
+    # Sort by execution time regression severity; stable, so ties keep input order
+    return regressions[report_columns].sort_values(
+        'execution_time_change_pct', 
+        ascending=False,
+        kind='stable'
+    )
+
+def generate_regression_report(comparison_df, output_file, threshold=5.0):
+    """
+    Generate a detailed regression report.
+    
+    Returns:
+        Stats dict of the comparison; regression_report is only present when something
+        regressed, the counts, memory_decreases and regime_partials always are
+    """
+    
+    # Filter for regressions only
+    regressions = comparison_df[comparison_df['has_regression']].copy()
+    execution_regressions = regressions[regressions['execution_time_regression']]
+    memory_regressions = regressions[regressions['memory_regression']]
+    max_exec_time_regression = execution_regressions['execution_time_change_pct'].max()
+    max_memory_regression = memory_regressions['memory_change_pct'].max()
+    
+    # Same shape as the streaming and incremental stats, so every mode renders the same reports
+    stats = {
         'total_regressions': len(regressions),
         'execution_regressions': len(execution_regressions),
         'memory_regressions': len(memory_regressions),
+        'memory_regressions_under_100': int((memory_regressions['memory_change_pct'] < 100).sum()),
+        'memory_decreases': int((comparison_df['memory_change_pct'] < 0).sum()),
         'max_exec_time_regression': max_exec_time_regression if len(execution_regressions) > 0 else 0,
         'max_memory_regression': max_memory_regression if len(memory_regressions) > 0 else 0,
-        'regression_report': regression_report
+        'regime_partials': regime_partials(comparison_df)
     }
+    
+    if len(regressions) == 0:
+        print("No regressions found!")
+        return stats
+    
+    noise_note = " or the case's noise band" if 'execution_time_threshold_pct' in regressions.columns else ""
+    print(f"\nFound {len(regressions)} benchmarks with regressions > {threshold}%{noise_note}")
+    
+    # Create detailed report
+    regression_report = build_regression_report(regressions, case_fields=True)
+    
+    # Save to CSV
+    regression_report.to_csv(output_file, index=False, columns=[
+        column for column in regression_report.columns if column not in CASE_FIELD_COLUMNS
+    ])
+    print(f"Regression report saved to: {output_file}")
+    
+    # Print summary statistics
+    print_regression_summary(len(execution_regressions), len(memory_regressions),
+                             max_exec_time_regression, max_memory_regression)
+    
+    stats['regression_report'] = regression_report
+    return stats
+
+def comparison_arrow_schema(table):
+    """
+    Normalize the schema of a comparison table for the binary dumps.
+    
+    Categoricals are written as plain values and float32 columns are widened back to
+    float64 (compaction only narrows floats that round-trip exactly). All-null columns
+    become strings. This way every partition of a streamed dump converts to the same schema.
+    """
+    fields = []
+    for field in table.schema:
+        field_type = field.type
+        if pa.types.is_dictionary(field_type):
+            field_type = field_type.value_type
+        if pa.types.is_float32(field_type):
+            field_type = pa.float64()
+        elif pa.types.is_null(field_type):
+            field_type = pa.string()
+        fields.append(pa.field(field.name, field_type))
+    return pa.schema(fields)
 
-def extract_unique_cases(case_names):
-    """Extract unique cases by removing dtype and other suffixes."""
-    unique_cases = set()
+class FullComparisonWriter:
+    """
+    Write a full comparison dump in one go or partition by partition.
     
-    for case_name in case_names:
-        # Remove dtype patterns like _dtypetorch.float32, _dtypetorch.float16, etc.
-        import re
-        # Remove dtype suffix (e.g., _dtypetorch.float32, _dtypetorch.bfloat16)
-        case_without_dtype = re.sub(r'_dtypetorch\.\w+', '', case_name)
-        
-        # Remove backward pass suffixes (e.g., _bwdall_BACKWARD, _bwd1_BACKWARD, etc.)
-        case_without_backward = re.sub(r'_bwd\w*_BACKWARD', '', case_without_dtype)
-        
-        # Remove other common suffixes
-        case_without_suffixes = re.sub(r'_trans_a\w+_trans_b\w+', '', case_without_backward)
+    Supports plain CSV, gzip-compressed CSV, Parquet with zstd and the Arrow IPC file
+    format. Arrow IPC is uncompressed so readers can memory-map it
+    (pyarrow.ipc.open_file(pyarrow.memory_map(path)) or pandas.read_feather). Parquet and
+    Arrow writes go through pyarrow, which converts columns on multiple threads. Use it as
+    a context manager and call write() once per chunk.
+    """
+    
+    def __init__(self, path, output_format="csv"):
+        if output_format not in FULL_OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        if output_format in ('parquet', 'arrow') and pa is None:
+            raise ValueError(f"--output-format {output_format} needs pyarrow")
+        self.path = path
+        self.output_format = output_format
+        self.handle = None
+        self.writer = None
+        self.schema = None
+        self.pending = []
+        self.pending_rows = 0
+        self.rows_written = 0
+    
+    def __enter__(self):
+        if self.output_format in ('csv', 'csv.gz'):
+            self.handle = open_csv_output(self.path, self.output_format)
+        return self
+    
+    def write(self, df):
+        """Append the rows of df; every chunk must have the same columns."""
+        if self.handle is not None:
+            df.to_csv(self.handle, index=False, header=self.rows_written == 0)
+        else:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self.schema is None:
+                self.schema = comparison_arrow_schema(table)
+            self.pending.append(table.cast(self.schema))
+            self.pending_rows += len(df)
+            if self.pending_rows >= FULL_OUTPUT_BATCH_ROWS:
+                self.flush()
+        self.rows_written += len(df)
+    
+    def flush(self):
+        """Write buffered binary chunks as one row group / record batch run."""
+        if not self.pending:
+            return
+        if self.writer is None:
+            if self.output_format == 'parquet':
+                self.writer = pa_parquet.ParquetWriter(self.path, self.schema, compression='zstd')
+            else:
+                self.writer = pa.ipc.new_file(self.path, self.schema)
+        self.writer.write_table(pa.concat_tables(self.pending))
+        self.pending = []
+        self.pending_rows = 0
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.handle is not None:
+            self.handle.close()
+            return False
         
-        unique_cases.add(case_without_suffixes)
+        if exc_type is None:
+            if self.schema is None:
+                # Nothing was written; leave an empty but valid file
+                self.schema = pa.schema([])
+                self.pending.append(self.schema.empty_table())
+            self.flush()
+        if self.writer is not None:
+            self.writer.close()
+        return False
+
+def write_full_comparison(comparison_df, path, output_format="csv"):
+    """Write a whole comparison frame as a full comparison dump in output_format."""
+    with FullComparisonWriter(path, output_format) as writer:
+        writer.write(comparison_df)
+
+def iter_benchmark_chunks(benchmark_file, chunksize):
+    """Yield a benchmark file as DataFrame chunks (JSON files are parsed whole, one file per chunk)."""
+    if benchmark_file.endswith('.json'):
+        yield load_benchmark_json(benchmark_file)
+    else:
+        yield from pd.read_csv(benchmark_file, chunksize=chunksize)
+
+def partition_benchmark_files(benchmark_files, spill_dir, side, num_partitions, chunksize):
+    """
+    Hash-partition benchmark files by Case Name into spill files, one chunk at a time.
+    
+    Args:
+        benchmark_files: Benchmark CSV or JSON files to partition
+        spill_dir: Directory that receives the {side}_{partition}.csv spill files
+        side: "baseline" or "new", used to name the spill files
+        num_partitions: Number of hash partitions
+        chunksize: Rows read per chunk
+    
+    Returns:
+        Total number of rows partitioned
+    """
+    handles = {}
+    total_rows = 0
     
-    return sorted(list(unique_cases))
+    try:
+        for benchmark_file in benchmark_files:
+            filename = os.path.basename(benchmark_file)
+            
+            for chunk in iter_benchmark_chunks(benchmark_file, chunksize):
+                chunk = chunk.drop(columns=[SAMPLES_COLUMN], errors='ignore')
+                chunk['source_file'] = filename
+                total_rows += len(chunk)
+                
+                # Same case name always lands in the same partition on both sides
+                hashes = pd.util.hash_pandas_object(chunk['Case Name'], index=False).to_numpy()
+                partitions = hashes % num_partitions
+                
+                for partition, part in chunk.groupby(partitions, sort=False):
+                    if partition not in handles:
+                        path = os.path.join(spill_dir, f"{side}_{partition}.csv")
+                        handles[partition] = open(path, 'w', newline='')
+                        part.to_csv(handles[partition], index=False)
+                    else:
+                        part.to_csv(handles[partition], index=False, header=False)
+    finally:
+        for handle in handles.values():
+            handle.close()
+    
+    return total_rows
+
+def regression_run_sort_key(value):
+    """
+    heapq.merge key of an execution_time_change_pct field, for a descending merge.
 
-def generate_markdown_report(eager_stats, compile_stats, threshold, output_file):
-    """Generate a comprehensive markdown report."""
+    NaN compares false both ways, which breaks the heap invariant, so missing changes map
+    to a key below every number and end up last, like sort_values(na_position='last').
+    """
+    change = float(value) if value else math.nan
+    if math.isnan(change):
+        return (False, 0.0)
+    return (True, change)
+
+def merge_sorted_regression_runs(run_files, output_file, columns=REGRESSION_REPORT_COLUMNS):
+    """
+    K-way merge regression run files (each sorted by execution_time_change_pct, descending)
+    into a single sorted regression report without loading them into memory.
+
+    Rows with equal changes (and all NaN changes, which sort last) keep the order of
+    run_files. Lines end with os.linesep like DataFrame.to_csv, so the report matches the
+    in-memory path byte for byte.
+    """
+    handles = [open(run_file, newline='') for run_file in run_files]
     
-    # Calculate overall statistics
-    total_matching = eager_stats.get('total_matching', 0) + compile_stats.get('total_matching', 0)
-    total_regressions = eager_stats.get('total_regressions', 0) + compile_stats.get('total_regressions', 0)
-    regression_rate = (total_regressions / total_matching * 100) if total_matching > 0 else 0
+    try:
+        readers = [csv.reader(handle) for handle in handles]
+        for reader in readers:
+            next(reader)
     
-    eager_matching = eager_stats.get('total_matching', 0)
-    eager_regressions = eager_stats.get('total_regressions', 0)
-    eager_rate = (eager_regressions / eager_matching * 100) if eager_matching > 0 else 0
+        sort_index = columns.index('execution_time_change_pct')
+        with open(output_file, 'w', newline='') as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(columns)
+            writer.writerows(heapq.merge(
+                *readers,
+                key=lambda row: regression_run_sort_key(row[sort_index]),
+                reverse=True
+            ))
+    finally:
+        for handle in handles:
+            handle.close()
+
+def compare_benchmarks_streaming(baseline_dir, new_dir, output_file, full_output_file,
+                                 threshold=5.0, benchmark_type="eager",
+                                 num_partitions=64, chunksize=100_000, input_format="csv",
+                                 duplicate_policy="last", output_format="csv", noise_floors=None):
+    """
+    Compare benchmarks with bounded memory by hash-partitioning both sides on Case Name.
     
-    compile_matching = compile_stats.get('total_matching', 0)
-    compile_regressions = compile_stats.get('total_regressions', 0)
-    compile_rate = (compile_regressions / compile_matching * 100) if compile_matching > 0 else 0
+    Both directories are read in chunks and spilled to per-partition files on disk. Each
+    partition pair is then merged on its own and its full-comparison rows are appended to
+    full_output_file, so peak memory scales with the largest partition rather than the
+    input. Regression rows are written as sorted runs and k-way merged into output_file.
+    Rows in full_output_file are grouped by partition rather than in input order.
     
-    # Get top regressions
-    eager_top_regressions = eager_stats.get('regression_report', pd.DataFrame()).head(5)
-    compile_top_regressions = compile_stats.get('regression_report', pd.DataFrame()).head(5)
+    Args:
+        baseline_dir: Path to baseline benchmark directory
+        new_dir: Path to new benchmark directory
+        output_file: Regression report CSV path
+        full_output_file: Full comparison dump path
+        threshold: Threshold percentage for considering a regression (default: 5.0%)
+        benchmark_type: "eager" or "compile" to compare same type of benchmarks
+        num_partitions: Number of hash partitions (more partitions, less memory per merge)
+        chunksize: Rows read per CSV chunk
+        input_format: "csv" or "json" benchmark files
+        duplicate_policy: How duplicate benchmark keys are collapsed ("last", "min" or "median")
+        output_format: Format of the full comparison dump (see FULL_OUTPUT_FORMATS)
+        noise_floors: Per-case noise bands (see flag_regressions), or None
     
-    # Extract unique cases
-    eager_unique_cases = []
-    compile_unique_cases = []
-    all_unique_cases = []
+    Returns:
+        Stats dict in the same shape as generate_regression_report, plus total_matching
+    """
+    baseline_files = list_benchmark_files(baseline_dir, benchmark_type, input_format)
+    new_files = list_benchmark_files(new_dir, benchmark_type, input_format)
     
-    if len(eager_top_regressions) > 0:
-        eager_cases = eager_stats['regression_report']['Case Name'].tolist()
-        eager_unique_cases = extract_unique_cases(eager_cases)
+    if not baseline_files:
+        raise ValueError(f"No {benchmark_type} {input_format.upper()} files found in {baseline_dir}")
+    if not new_files:
+        raise ValueError(f"No {benchmark_type} {input_format.upper()} files found in {new_dir}")
     
-    if len(compile_top_regressions) > 0:
-        compile_cases = compile_stats['regression_report']['Case Name'].tolist()
-        compile_unique_cases = extract_unique_cases(compile_cases)
+    stats = {
+        'total_matching': 0,
+        'total_regressions': 0,
+        'execution_regressions': 0,
+        'memory_regressions': 0,
+        'memory_regressions_under_100': 0,
+        'memory_decreases': 0,
+        'max_exec_time_regression': float('-inf'),
+        'max_memory_regression': float('-inf'),
+    }
+    baseline_case_count = 0
+    duplicates_removed = 0
+    new_case_count = 0
+    common_case_count = 0
     
-    # Combine all unique cases
-    all_cases = eager_cases + compile_cases if eager_cases and compile_cases else (eager_cases or compile_cases)
-    all_unique_cases = extract_unique_cases(all_cases) if all_cases else []
+    with tempfile.TemporaryDirectory(prefix='benchmark_spill_') as spill_dir:
+        print(f"Partitioning baseline {benchmark_type} benchmarks from: {baseline_dir}")
+        with profile_phase('partition_baseline', files=len(baseline_files)) as record:
+            baseline_rows = partition_benchmark_files(baseline_files, spill_dir, 'baseline', num_partitions, chunksize)
+            record['rows'] = baseline_rows
+        
+        print(f"Partitioning new {benchmark_type} benchmarks from: {new_dir}")
+        with profile_phase('partition_new', files=len(new_files)) as record:
+            new_rows = partition_benchmark_files(new_files, spill_dir, 'new', num_partitions, chunksize)
+            record['rows'] = new_rows
+        
+        print(f"Baseline: {baseline_rows} {benchmark_type} benchmark entries")
+        print(f"New: {new_rows} {benchmark_type} benchmark entries")
+        
+        run_files = []
+        partials = []
+        report_columns = REGRESSION_REPORT_COLUMNS + (NOISE_REPORT_COLUMNS if noise_floors is not None else [])
+        
+        with profile_phase('compare_partitions', partitions=num_partitions) as record, \
+                FullComparisonWriter(full_output_file, output_format) as full_writer:
+            for partition in range(num_partitions):
+                baseline_path = os.path.join(spill_dir, f"baseline_{partition}.csv")
+                new_path = os.path.join(spill_dir, f"new_{partition}.csv")
+                
+                baseline_part = compact_benchmark_frame(pd.read_csv(baseline_path)) if os.path.exists(baseline_path) else None
+                new_part = compact_benchmark_frame(pd.read_csv(new_path)) if os.path.exists(new_path) else None
+                
+                # Partitions are disjoint on Case Name, so per-partition counts add up exactly
+                baseline_cases = set(baseline_part['Case Name']) if baseline_part is not None else set()
+                new_cases = set(new_part['Case Name']) if new_part is not None else set()
+                baseline_case_count += len(baseline_cases)
+                new_case_count += len(new_cases)
+                common_case_count += len(baseline_cases & new_cases)
+                
+                if baseline_part is None or new_part is None:
+                    continue
+                
+                # Duplicates share a Case Name, so they always land in the same partition
+                merged, baseline_removed, new_removed = merge_benchmark_frames(
+                    baseline_part, new_part, duplicate_policy
+                )
+                duplicates_removed += baseline_removed + new_removed
+                if len(merged) == 0:
+                    continue
+                
+                flag_regressions(merged, threshold, noise_floors)
+                add_throughput_columns(merged)
+                partials.append(regime_partials(merged))
+                full_writer.write(merged)
+                stats['total_matching'] += len(merged)
+                stats['memory_decreases'] += int((merged['memory_change_pct'] < 0).sum())
+                
+                regressions = merged[merged['has_regression']]
+                if len(regressions) == 0:
+                    continue
+                
+                execution_regressions = regressions[regressions['execution_time_regression']]
+                memory_regressions = regressions[regressions['memory_regression']]
+                stats['total_regressions'] += len(regressions)
+                stats['execution_regressions'] += len(execution_regressions)
+                stats['memory_regressions'] += len(memory_regressions)
+                stats['memory_regressions_under_100'] += int((memory_regressions['memory_change_pct'] < 100).sum())
+                if len(execution_regressions) > 0:
+                    stats['max_exec_time_regression'] = max(
+                        stats['max_exec_time_regression'],
+                        execution_regressions['execution_time_change_pct'].max()
+                    )
+                if len(memory_regressions) > 0:
+                    stats['max_memory_regression'] = max(
+                        stats['max_memory_regression'],
+                        memory_regressions['memory_change_pct'].max()
+                    )
+                
+                run_file = os.path.join(spill_dir, f"regressions_{partition}.csv")
+                regressions[report_columns].sort_values(
+                    'execution_time_change_pct',
+                    ascending=False,
+                    kind='stable'
+                ).to_csv(run_file, index=False)
+                run_files.append(run_file)
+            record['rows'] = stats['total_matching']
+        
+        print(f"Unique cases in baseline: {baseline_case_count}")
+        print(f"Unique cases in new: {new_case_count}")
+        print(f"Common cases (will be compared): {common_case_count}")
+        print(f"Cases only in baseline (will be skipped): {baseline_case_count - common_case_count}")
+        print(f"Cases only in new (will be skipped): {new_case_count - common_case_count}")
+        if duplicates_removed:
+            print(f"Collapsed {duplicates_removed} duplicate benchmark rows ({duplicate_policy})")
+        print(f"Successfully merged {stats['total_matching']} matching {benchmark_type} benchmarks between versions")
+        print(f"Full {benchmark_type} comparison saved to: {full_output_file}")
+        
+        stats['regime_partials'] = combine_regime_partials(partials)
+        if stats['execution_regressions'] == 0:
+            stats['max_exec_time_regression'] = 0
+        if stats['memory_regressions'] == 0:
+            stats['max_memory_regression'] = 0
+        
+        if not run_files:
+            print("No regressions found!")
+            return stats
+        
+        with profile_phase('merge_regression_runs', files=len(run_files)):
+            merge_sorted_regression_runs(run_files, output_file, report_columns)
+    
+    noise_note = " or the case's noise band" if noise_floors is not None else ""
+    print(f"\nFound {stats['total_regressions']} benchmarks with regressions > {threshold}%{noise_note}")
+    print(f"Regression report saved to: {output_file}")
+    print_regression_summary(stats['execution_regressions'], stats['memory_regressions'],
+                             stats['max_exec_time_regression'], stats['max_memory_regression'])
     
-    markdown_content = f"""# PyTorch Benchmark Regression Analysis: Baseline vs New
+    # Only the columns the summary reports, unique-case summary and re-run manifest need;
+    # round-trip parsing keeps the changes bit-identical to the in-memory report
+    stats['regression_report'] = pd.read_csv(output_file, float_precision='round_trip', usecols=[
+        'Case Name',
+        'Benchmarking Module Name_baseline',
+        'execution_time_change_pct',
+        'memory_change_pct',
+        'source_file_baseline'
+    ])
+    return stats
 
-## Executive Summary
+def generate_markdown_report(eager_stats, compile_stats, threshold, output_file, options=ReportOptions(),
+                             comparison_output="pytorch_regression_report.csv", output_format="csv"):
+    """
+    Generate a comprehensive markdown report (see report_rendering.render_markdown_report).
+    comparison_output and output_format are the run's --output and --output-format, which
+    name the files listed in the report.
+    """
+    markdown_content = render_markdown_report(eager_stats, compile_stats, threshold, options,
+                                              comparison_output, output_format)
+    
+    with open(output_file, 'w') as f:
+        f.write(markdown_content)
+    
+    print(f"Markdown report saved to: {output_file}")
+    return markdown_content
 
-This report analyzes performance regressions between baseline and new versions based on operator microbenchmarks. The analysis identifies benchmarks where performance degraded by more than {threshold}% between versions.
+def generate_html_report(eager_stats, compile_stats, threshold, output_file, options=ReportOptions()):
+    """Generate a self-contained HTML report with sortable tables."""
+    html_content = render_html_report(eager_stats, compile_stats, threshold, options)
+    
+    with open(output_file, 'w') as f:
+        f.write(html_content)
+    
+    print(f"HTML report saved to: {output_file}")
+    return html_content
 
-## Key Findings
+def write_summary_reports(args, eager_stats, compile_stats):
+    """Write the markdown and/or HTML summary reports requested on the command line."""
+    options = ReportOptions(
+        top_k=args.report_top_k,
+        max_cases=args.report_max_cases,
+        max_rows=args.report_max_rows,
+        collapse=args.collapse_sections
+    )
+    if args.generate_markdown:
+        with profile_phase('markdown'):
+            generate_markdown_report(eager_stats, compile_stats, args.threshold,
+                                     args.output.replace('.csv', '_summary_report.md'), options,
+                                     args.output, args.output_format)
+    if args.generate_html:
+        with profile_phase('html'):
+            generate_html_report(eager_stats, compile_stats, args.threshold,
+                                 args.output.replace('.csv', '_summary_report.html'), options)
 
-### Overall Statistics
-- **Total matching benchmarks**: {total_matching:,} ({eager_matching:,} eager + {compile_matching:,} compile)
-- **Total regressions found**: {total_regressions:,} ({eager_regressions:,} eager + {compile_regressions:,} compile)
-- **Regression rate**: {regression_rate:.1f}% of benchmarks show performance degradation > {threshold}%
+def write_rerun_manifest(args, stats_by_type):
+    """Write the --rerun-manifest of the regression reports in stats_by_type ({type: stats or None})."""
+    if not args.rerun_manifest:
+        return None
+    
+    with profile_phase('rerun_manifest'):
+        manifest = build_rerun_manifest(
+            {benchmark_type: (stats or {}).get('regression_report') for benchmark_type, stats in stats_by_type.items()},
+            args.threshold,
+            args.rerun_per_cluster,
+            args.cluster_by
+        )
+        manifest_file = args.output.replace('.csv', '_rerun_manifest.json')
+        with open(manifest_file, 'w') as f:
+            json.dump(manifest, f, indent=1, allow_nan=False)
+    
+    print(f"\nRe-run manifest: {manifest['rerun_count']} of {manifest['total_regressions']} regressed cases "
+          f"({manifest['rerun_fraction']:.1%}) represent {manifest['total_clusters']} clusters")
+    print(f"Re-run manifest saved to: {manifest_file}")
+    return manifest
 
-### Eager Benchmarks (Non-Compile)
-- **Matching benchmarks**: {eager_matching:,}
-- **Regressions found**: {eager_regressions:,} ({eager_rate:.1f}% regression rate)
-- **Execution time regressions**: {eager_stats.get('execution_regressions', 0):,}
-- **Memory regressions**: {eager_stats.get('memory_regressions', 0):,}
-- **Worst execution time regression**: {eager_stats.get('max_exec_time_regression', 0):.2f}%
-- **Worst memory regression**: {eager_stats.get('max_memory_regression', 0):.2f}%
+def build_trend_store(frames_by_version, metric='Execution Time', duplicate_policy="last"):
+    """
+    Stack per-version benchmark frames into one benchmark x version matrix.
+    
+    Benchmarks are identified by the same composite key the pairwise comparison joins on
+    (the COMPOSITE_KEY_COLUMNS present in every version).
+    
+    Args:
+        frames_by_version: Dict mapping version label to its loaded DataFrame, oldest first
+        metric: Column to track ('Execution Time' or 'Peak Memory (KB)')
+        duplicate_policy: How duplicate rows of a benchmark within one version are reduced
+            ("last", "min" or "median")
+    
+    Returns:
+        DataFrame indexed by the composite key with one column per version (NaN where a
+        benchmark is missing)
+    """
+    versions = list(frames_by_version)
+    frames = list(frames_by_version.values())
+    key_columns = [column for column in COMPOSITE_KEY_COLUMNS if all(column in df.columns for df in frames)]
+    
+    # Plain values, so categoricals with different categories per version stack cleanly
+    long_data = pd.concat(
+        [df[key_columns + [metric]].astype({column: object for column in key_columns}).assign(version=version)
+         for version, df in frames_by_version.items()],
+        ignore_index=True
+    )
+    
+    grouped = long_data.groupby(key_columns + ['version'], sort=True, dropna=False)[metric]
+    store = grouped.agg(duplicate_policy).unstack('version')
+    store.columns.name = None
+    return store.reindex(columns=versions)
 
-### Compile Benchmarks
-- **Matching benchmarks**: {compile_matching:,}
-- **Regressions found**: {compile_regressions:,} ({compile_rate:.1f}% regression rate)
-- **Execution time regressions**: {compile_stats.get('execution_regressions', 0):,}
-- **Memory regressions**: {compile_stats.get('memory_regressions', 0):,}
-- **Worst execution time regression**: {compile_stats.get('max_exec_time_regression', 0):.2f}%
-- **Worst memory regression**: {compile_stats.get('max_memory_regression', 0):.2f}%
+def best_segment_splits(padded_sums, padded_counts, rows, starts, ends):
+    """
+    Strongest mean-shift split of every segment [start, end) of the given store rows.
+    
+    A split at position j puts versions [start, j) before and [j, end) after it; the
+    split with the largest between-segment sum of squares wins. padded_sums and
+    padded_counts are NaN-aware cumulative sums with a leading zero column, so segment
+    sums are differences of two entries.
+    
+    Returns:
+        (split positions, mean before, mean after, whether the segment has a split)
+    """
+    num_versions = padded_sums.shape[1] - 1
+    segments = np.arange(len(rows))
+    positions = np.arange(1, num_versions)
+    
+    sums = padded_sums[rows]
+    counts = padded_counts[rows]
+    before_sum = sums[:, 1:num_versions] - sums[segments, starts][:, None]
+    before_count = counts[:, 1:num_versions] - counts[segments, starts][:, None]
+    after_sum = sums[segments, ends][:, None] - sums[:, 1:num_versions]
+    after_count = counts[segments, ends][:, None] - counts[:, 1:num_versions]
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        before_mean = before_sum / before_count
+        after_mean = after_sum / after_count
+        score = before_count * after_count / (before_count + after_count) * (after_mean - before_mean) ** 2
+    in_segment = (positions > starts[:, None]) & (positions < ends[:, None])
+    score = np.where(in_segment & (before_count > 0) & (after_count > 0), score, -np.inf)
+    
+    best = np.argmax(score, axis=1)
+    has_split = np.isfinite(score[segments, best])
+    return best + 1, before_mean[segments, best], after_mean[segments, best], has_split
+
+def detect_changepoints(store, threshold=5.0):
+    """
+    Find the first upward level shift of every benchmark's series, vectorized over benchmarks.
+    
+    Series are segmented recursively (binary segmentation): each segment is cut at its
+    strongest mean-shift split (see best_segment_splits) as long as the means on both sides
+    differ by more than threshold percent, in either direction. The earliest upward shift
+    above threshold is reported, so an improvement later in a series never hides an earlier
+    regression. Benchmarks without one report the strongest split of the whole series.
+    Missing versions (NaN) are skipped.
+    
+    Args:
+        store: Benchmark x version matrix from build_trend_store
+        threshold: Threshold percentage for considering a shift a regression (default: 5.0%)
+    
+    Returns:
+        DataFrame indexed like store with the changepoint version, the means of the segments
+        on either side of it, shift percentage and regression flag
+    """
+    versions = list(store.columns)
+    if len(versions) < 2:
+        raise ValueError("Trend analysis needs at least two versions")
+    
+    values = store.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(values)
+    zeros = np.zeros((len(values), 1))
+    padded_sums = np.hstack([zeros, np.cumsum(np.where(valid, values, 0.0), axis=1)])
+    padded_counts = np.hstack([zeros, np.cumsum(valid, axis=1)])
+    
+    # Start from the whole series and keep splitting segments with a shift above threshold
+    rows = np.arange(len(values))
+    starts = np.zeros(len(values), dtype=np.int64)
+    ends = np.full(len(values), len(versions), dtype=np.int64)
+    strongest = None
+    shifts = []
+    
+    while strongest is None or len(rows):
+        split, mean_before, mean_after, has_split = best_segment_splits(
+            padded_sums, padded_counts, rows, starts, ends
+        )
+        shift_pct = calculate_percentage_change_columns(mean_before, mean_after)
+        if strongest is None:
+            strongest = (np.where(has_split, split, -1), mean_before, mean_after)
+        
+        accepted = has_split & (np.abs(shift_pct) > threshold)
+        upward = accepted & (shift_pct > threshold)
+        shifts.append((rows[upward], split[upward], mean_before[upward], mean_after[upward]))
+        
+        rows, split = rows[accepted], split[accepted]
+        starts, ends = np.concatenate([starts[accepted], split]), np.concatenate([split, ends[accepted]])
+        rows = np.concatenate([rows, rows])
+    
+    # Earliest upward shift per benchmark, falling back to the strongest split
+    changepoint, mean_before, mean_after = (array.copy() for array in strongest)
+    shift_rows, shift_split, shift_before, shift_after = (np.concatenate(parts) for parts in zip(*shifts))
+    order = np.lexsort((shift_split, shift_rows))
+    first_rows, first = np.unique(shift_rows[order], return_index=True)
+    changepoint[first_rows] = shift_split[order][first]
+    mean_before[first_rows] = shift_before[order][first]
+    mean_after[first_rows] = shift_after[order][first]
+    
+    # Name the present versions around the split, skipping missing ones
+    has_split = changepoint > 0
+    positions = np.arange(len(versions))
+    first_after = np.where(valid & (positions >= changepoint[:, None]), positions, len(versions)).min(axis=1)
+    last_before = np.where(valid & (positions < changepoint[:, None]), positions, 0).max(axis=1)
+    
+    version_labels = np.asarray(versions, dtype=object)
+    mean_before = np.where(has_split, mean_before, np.nan)
+    mean_after = np.where(has_split, mean_after, np.nan)
+    changepoints = pd.DataFrame({
+        'changepoint_version': np.where(has_split, version_labels[np.minimum(first_after, len(versions) - 1)], None),
+        'last_good_version': np.where(has_split, version_labels[last_before], None),
+        'mean_before': mean_before,
+        'mean_after': mean_after,
+        'shift_pct': calculate_percentage_change_columns(mean_before, mean_after),
+        'versions_present': valid.sum(axis=1),
+    }, index=store.index)
+    changepoints['regression'] = changepoints['shift_pct'] > threshold
+    
+    return changepoints
 
-## Top Performance Regressions
+def unique_version_labels(directories):
+    """Label trend versions by directory name, adding a position suffix to repeated names."""
+    names = [os.path.basename(directory.rstrip(os.sep)) for directory in directories]
+    counts = Counter(names)
+    return [name if counts[name] == 1 else f"{name}#{position}" for position, name in enumerate(names, 1)]
 
-### Eager Benchmarks - Top 5 Execution Time Regressions
-"""
+def run_trend_analysis(args, cache_dir):
+    """Load every --trend-dirs directory once, build the trend store and report changepoints."""
+    if len(args.trend_dirs) < 2:
+        raise ValueError("--trend-dirs needs at least two directories")
     
-    if len(eager_top_regressions) > 0:
-        for i, (_, row) in enumerate(eager_top_regressions.iterrows(), 1):
-            markdown_content += f"{i}. `{row['Case Name']}`: {row['execution_time_change_pct']:.2f}%\n"
-    else:
-        markdown_content += "No regressions found.\n"
+    directories = [os.path.abspath(directory) for directory in args.trend_dirs]
+    versions = unique_version_labels(directories)
     
-    markdown_content += """
-### Compile Benchmarks - Top 5 Execution Time Regressions
-"""
+    benchmark_types = ['eager', 'compile'] if args.benchmark_type == 'both' else [args.benchmark_type]
+    frames_by_type = {benchmark_type: {} for benchmark_type in benchmark_types}
     
-    if len(compile_top_regressions) > 0:
-        for i, (_, row) in enumerate(compile_top_regressions.iterrows(), 1):
-            markdown_content += f"{i}. `{row['Case Name']}`: {row['execution_time_change_pct']:.2f}%\n"
-    else:
-        markdown_content += "No regressions found.\n"
+    for version, directory in zip(versions, directories):
+        print(f"Loading {version} benchmarks from: {directory}")
+        if args.benchmark_type == 'both':
+            split = load_benchmark_data_split(directory, args.input_format, cache_dir,
+                                              args.jobs, args.process_pool)
+        else:
+            split = {args.benchmark_type: load_benchmark_data_by_type(
+                directory, args.benchmark_type, args.input_format, cache_dir,
+                args.jobs, args.process_pool
+            )}
+        for benchmark_type in benchmark_types:
+            frames_by_type[benchmark_type][version] = split[benchmark_type]
+    
+    metric = 'Peak Memory (KB)' if args.trend_metric == 'memory' else 'Execution Time'
     
-    markdown_content += f"""
-## Analysis by Operation Type
+    for benchmark_type in benchmark_types:
+        print(f"\n=== {benchmark_type.upper()} TREND ({len(versions)} versions, {metric}) ===")
+        if args.benchmark_type == 'both':
+            output = args.output.replace('.csv', f'_{benchmark_type}.csv')
+        else:
+            output = args.output
+        
+        store = build_trend_store(frames_by_type[benchmark_type], metric, args.duplicate_policy)
+        changepoints = detect_changepoints(store, args.threshold)
+        
+        series_file = output.replace('.csv', '_trend_series.csv')
+        store.to_csv(series_file)
+        print(f"Trend series ({len(store)} cases x {len(versions)} versions) saved to: {series_file}")
+        
+        changepoint_file = output.replace('.csv', '_trend_changepoints.csv')
+        changepoints.sort_values('shift_pct', ascending=False).to_csv(changepoint_file)
+        print(f"Changepoints saved to: {changepoint_file}")
+        
+        regressions = changepoints[changepoints['regression']]
+        print(f"Cases whose level shifted up by > {args.threshold}%: {len(regressions)}")
+        for version, count in regressions['changepoint_version'].value_counts().reindex(versions).dropna().items():
+            print(f"- first regressed in {version}: {int(count)}")
+    
+    return 0
 
-### Most Affected Operations (Eager Benchmarks)
-- **matmul**: High number of regressions, particularly in backward pass operations
-- **addmm**: Significant regressions in large matrix operations
-- **bmm**: Batch matrix multiplication showing performance degradation
+def load_noise_floors(args):
+    """Load --noise-table as {benchmark type: NoiseFloors}, or {} when none is given."""
+    if not args.noise_table:
+        return {}
 
-### Memory Usage Patterns
-- Most memory regressions are relatively small (under 100%)
-- Memory usage actually decreased in many cases (negative percentages)
-- Only {eager_stats.get('memory_regressions', 0) + compile_stats.get('memory_regressions', 0)} total memory regressions across both benchmark types
+    noise_tables = load_noise_table(args.noise_table, args.noise_level)
+    for benchmark_type, floors in noise_tables.items():
+        print(f"Loaded {benchmark_type} noise floors: {len(floors.cases)} cases, "
+              f"{len(floors.buckets)} op/shape buckets ({args.noise_level} level) from {args.noise_table}")
+    return noise_tables
 
-## Recommendations
+def run_noise_calibration(args, cache_dir):
+    """Load every --calibrate-noise run once, compute noise bands and write the noise table."""
+    if len(args.calibrate_noise) < 2:
+        raise ValueError("--calibrate-noise needs at least two runs of the same version")
 
-1. **Priority Investigation**: Focus on compile benchmarks showing extreme regressions (>1000%)
-2. **Backward Pass Optimization**: Many regressions occur in backward pass operations
-3. **Matrix Operations**: Investigate performance degradation in matmul and addmm operations
-4. **Memory Optimization**: While memory regressions are fewer, they should be investigated
+    benchmark_types = ['eager', 'compile'] if args.benchmark_type == 'both' else [args.benchmark_type]
+    frames_by_type = {benchmark_type: [] for benchmark_type in benchmark_types}
 
-## Files Generated
+    for directory in args.calibrate_noise:
+        directory = os.path.abspath(directory)
+        print(f"Loading calibration run from: {directory}")
+        if args.benchmark_type == 'both':
+            split = load_benchmark_data_split(directory, args.input_format, cache_dir,
+                                              args.jobs, args.process_pool)
+        else:
+            split = {args.benchmark_type: load_benchmark_data_by_type(
+                directory, args.benchmark_type, args.input_format, cache_dir,
+                args.jobs, args.process_pool
+            )}
+        for benchmark_type in benchmark_types:
+            # One sample per benchmark and run, so the bands measure run-to-run noise
+            frame = split[benchmark_type]
+            key_columns = [column for column in COMPOSITE_KEY_COLUMNS if column in frame.columns]
+            frame, removed = deduplicate_benchmarks(frame, key_columns, args.duplicate_policy)
+            if removed:
+                print(f"Collapsed {removed} duplicate {benchmark_type} rows ({args.duplicate_policy})")
+            frames_by_type[benchmark_type].append(frame)
 
-- `pytorch_regression_report_eager.csv`: Detailed regression report for eager benchmarks
-- `pytorch_regression_report_compile.csv`: Detailed regression report for compile benchmarks
-- `pytorch_regression_report_eager_full_comparison.csv`: Complete comparison data for eager benchmarks
-- `pytorch_regression_report_compile_full_comparison.csv`: Complete comparison data for compile benchmarks
+    tables = []
+    for benchmark_type in benchmark_types:
+        with profile_phase(f'{benchmark_type}_noise_floors'):
+            table = compute_noise_floors(frames_by_type[benchmark_type], benchmark_type)
+        tables.append(table)
 
-## Methodology
+        cases = table[table['Case Name'].notna()]
+        time_noise = cases['time_noise_pct']
+        print(f"\n=== {benchmark_type.upper()} NOISE FLOORS ({len(args.calibrate_noise)} runs) ===")
+        print(f"Calibrated cases: {int(time_noise.notna().sum())} of {len(cases)}")
+        if time_noise.notna().any():
+            print(f"Execution time noise band: median {time_noise.median():.2f}%, "
+                  f"90th percentile {time_noise.quantile(0.9):.2f}%, max {time_noise.max():.2f}%")
+        print(f"Cases noisier than --threshold {args.threshold}%: {int((time_noise > args.threshold).sum())}")
 
-- Compared execution time and peak memory usage between baseline and new versions
-- Identified regressions where performance degraded by more than {threshold}%
-- Separated analysis for eager vs compile benchmarks to ensure fair comparison
-- Used percentage change formula: ((new_value - old_value) / old_value) * 100
+    noise_table = args.noise_table or args.output.replace('.csv', '_noise_floors.csv')
+    pd.concat(tables, ignore_index=True).to_csv(noise_table, index=False)
+    print(f"\nNoise table saved to: {noise_table}")
+    return 0
 
-## Unique Cases Summary
+def run_streaming_comparison(args, baseline_dir, new_dir):
+    """Run compare_benchmarks_streaming for the requested benchmark types and summarize."""
+    benchmark_types = ['eager', 'compile'] if args.benchmark_type == 'both' else [args.benchmark_type]
+    noise_tables = load_noise_floors(args)
+    stats_by_type = {}
+    
+    for benchmark_type in benchmark_types:
+        print(f"\n=== {benchmark_type.upper()} BENCHMARKS (STREAMING) ===")
+        if args.benchmark_type == 'both':
+            output = args.output.replace('.csv', f'_{benchmark_type}.csv')
+        else:
+            output = args.output
+        full_output = full_comparison_file(output, args.output_format)
+        
+        stats_by_type[benchmark_type] = compare_benchmarks_streaming(
+            baseline_dir, new_dir, output, full_output,
+            args.threshold, benchmark_type,
+            num_partitions=args.partitions,
+            chunksize=args.chunksize,
+            input_format=args.input_format,
+            duplicate_policy=args.duplicate_policy,
+            output_format=args.output_format,
+            noise_floors=noise_tables.get(benchmark_type)
+        )
+    
+    if args.benchmark_type == 'both':
+        write_summary_reports(args, stats_by_type['eager'], stats_by_type['compile'])
+    write_rerun_manifest(args, stats_by_type)
+    
+    print_unique_cases_summary(regressed_cases(stats_by_type))
+    return 0
 
-This section shows the unique benchmark cases (without dtype and other suffixes) that have regressions.
+def compare_benchmark_partition(baseline_data, new_data, threshold=5.0,
+                                statistical=False, alpha=0.05, n_bootstrap=1000, duplicate_policy="last",
+                                noise_floors=None):
+    """
+    Merge and flag one pair of frames without progress output. Used for the per-file
+    partitions of incremental mode.
+    """
+    merged, _, _ = merge_benchmark_frames(baseline_data, new_data, duplicate_policy)
+    return flag_comparison(merged, threshold, statistical, alpha, n_bootstrap, noise_floors)
 
-### Eager Benchmark Unique Cases ({len(eager_unique_cases)} unique)
-"""
+def incremental_partition_file(partitions_dir, manifest_key):
+    """Arrow IPC file holding the stored comparison of one incremental manifest entry."""
+    return os.path.join(partitions_dir, hashlib.blake2b(manifest_key.encode(), digest_size=20).hexdigest() + '.arrow')
+
+def read_incremental_partition(partition_file):
+    """Read a stored partition back, or None when it is missing or unreadable."""
+    try:
+        return pa_feather.read_table(partition_file, memory_map=True).to_pandas()
+    except (OSError, pa.ArrowException):
+        return None
+
+def prune_incremental_state(manifest, partitions_dir):
+    """
+    Drop manifest entries whose input files no longer exist and delete stored partitions
+    that no entry references (including pickles from older versions).
     
-    if eager_unique_cases:
-        for case in eager_unique_cases:
-            markdown_content += f"- `{case}`\n"
-    else:
-        markdown_content += "No regressions found.\n"
+    Returns:
+        Number of manifest entries dropped
+    """
+    stale = [
+        key for key, entry in manifest.items()
+        if not (os.path.exists(entry.get('baseline_file', '')) and os.path.exists(entry.get('new_file', '')))
+    ]
+    for key in stale:
+        del manifest[key]
     
-    markdown_content += f"""
-### Compile Benchmark Unique Cases ({len(compile_unique_cases)} unique)
-"""
+    referenced = {os.path.basename(incremental_partition_file(partitions_dir, key)) for key in manifest}
+    for entry in os.scandir(partitions_dir):
+        if entry.name.endswith(('.arrow', '.pkl')) and entry.name not in referenced:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
     
-    if compile_unique_cases:
-        for case in compile_unique_cases:
-            markdown_content += f"- `{case}`\n"
-    else:
-        markdown_content += "No regressions found.\n"
+    return len(stale)
+
+def compare_benchmarks_incremental(baseline_dir, new_dir, state_dir, threshold=5.0, benchmark_type="eager",
+                                   input_format="csv", cache_dir=None, statistical=False, alpha=0.05,
+                                   n_bootstrap=1000, duplicate_policy="last", noise_floors=None):
+    """
+    Compare benchmarks file by file, reusing stored results for files that did not change.
     
-    markdown_content += f"""
-### All Unique Cases Combined ({len(all_unique_cases)} unique)
-"""
+    Every operator file name present in both directories is one partition. Its comparison is
+    stored in state_dir as an Arrow IPC file, together with a manifest entry holding the
+    paths and content hashes of both inputs and the comparison parameters. On the next run
+    only partitions whose inputs or parameters changed are recomputed; the rest are read
+    back and concatenated in file name order. Entries whose input files were deleted are
+    dropped. Cases are assumed to live in the same file name on both sides.
     
-    if all_unique_cases:
-        for case in all_unique_cases:
-            markdown_content += f"- `{case}`\n"
-    else:
-        markdown_content += "No regressions found.\n"
+    Args:
+        baseline_dir: Path to baseline benchmark directory
+        new_dir: Path to new benchmark directory
+        state_dir: Directory holding the manifest and stored partition results
+        threshold: Threshold percentage for considering a regression (default: 5.0%)
+        benchmark_type: "eager" or "compile" to compare same type of benchmarks
+        input_format: "csv" or "json" benchmark files
+        cache_dir: Parsed-file cache directory, or None to always parse
+        statistical, alpha, n_bootstrap, duplicate_policy, noise_floors: See compare_benchmark_frames
     
-    markdown_content += f"""
-## Next Steps
+    Returns:
+        (comparison DataFrame, number of partitions recomputed)
+    """
+    if pa_feather is None:
+        raise ValueError("--incremental-dir needs pyarrow")
+    
+    baseline_files = {os.path.basename(path): path for path in list_benchmark_files(baseline_dir, benchmark_type, input_format)}
+    new_files = {os.path.basename(path): path for path in list_benchmark_files(new_dir, benchmark_type, input_format)}
+    filenames = sorted(set(baseline_files) & set(new_files))
+    
+    if not filenames:
+        raise ValueError(f"No {benchmark_type} {input_format.upper()} files found in both {baseline_dir} and {new_dir}")
+    
+    partitions_dir = os.path.join(state_dir, 'partitions')
+    os.makedirs(partitions_dir, exist_ok=True)
+    manifest_file = os.path.join(state_dir, 'manifest.json')
+    try:
+        with open(manifest_file) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    
+    params = {
+        'threshold': threshold,
+        'statistical': statistical,
+        'alpha': alpha,
+        'n_bootstrap': n_bootstrap,
+        'duplicate_policy': duplicate_policy,
+        'noise_table': noise_floors.digest if noise_floors is not None else None,
+        'format_version': CACHE_FORMAT_VERSION,
+    }
+    partitions = []
+    recomputed = 0
+    
+    for filename in filenames:
+        manifest_key = f"{os.path.abspath(baseline_dir)}|{os.path.abspath(new_dir)}|{filename}"
+        entry = {
+            'baseline_file': os.path.abspath(baseline_files[filename]),
+            'new_file': os.path.abspath(new_files[filename]),
+            'baseline_digest': cached_file_digest(baseline_files[filename], state_dir),
+            'new_digest': cached_file_digest(new_files[filename], state_dir),
+            'params': params,
+        }
+        partition_file = incremental_partition_file(partitions_dir, manifest_key)
+        
+        if manifest.get(manifest_key) == entry:
+            partition = read_incremental_partition(partition_file)
+            if partition is not None:
+                partitions.append(partition)
+                continue
+        
+        print(f"Recomputing {benchmark_type} partition: {filename}")
+        partition = compare_benchmark_partition(
+            compact_benchmark_frame(read_benchmark_file_with_source(baseline_files[filename], cache_dir)),
+            compact_benchmark_frame(read_benchmark_file_with_source(new_files[filename], cache_dir)),
+            threshold, statistical, alpha, n_bootstrap, duplicate_policy, noise_floors
+        )
+        write_atomic(partition_file, lambda tmp: pa_feather.write_feather(partition, tmp, compression='uncompressed'))
+        manifest[manifest_key] = entry
+        partitions.append(partition)
+        recomputed += 1
+    
+    pruned = prune_incremental_state(manifest, partitions_dir)
+    if pruned:
+        print(f"Dropped {pruned} stale manifest entries whose input files were deleted")
+    if recomputed or pruned:
+        write_atomic(manifest_file, lambda tmp: Path(tmp).write_text(json.dumps(manifest, indent=1)))
+    
+    print(f"Reused {len(filenames) - recomputed} of {len(filenames)} {benchmark_type} partitions")
+    return pd.concat(partitions, ignore_index=True), recomputed
 
-1. Investigate the most severe regressions (>50% performance degradation)
-2. Analyze patterns in backward pass operations
-3. Review compile benchmark performance issues
-4. Consider reverting or optimizing specific operations showing consistent regressions
-5. Focus optimization efforts on the {len(all_unique_cases)} unique cases identified above
-"""
+def run_incremental_comparison(args, baseline_dir, new_dir, cache_dir):
+    """Run compare_benchmarks_incremental for the requested types and rebuild the reports."""
+    benchmark_types = ['eager', 'compile'] if args.benchmark_type == 'both' else [args.benchmark_type]
+    state_dir = os.path.abspath(args.incremental_dir)
+    noise_tables = load_noise_floors(args)
+    stats_by_type = {}
     
-    # Write markdown file
-    with open(output_file, 'w') as f:
-        f.write(markdown_content)
+    for benchmark_type in benchmark_types:
+        print(f"\n=== {benchmark_type.upper()} BENCHMARKS (INCREMENTAL) ===")
+        if args.benchmark_type == 'both':
+            output = args.output.replace('.csv', f'_{benchmark_type}.csv')
+        else:
+            output = args.output
+        
+        comparison, recomputed = compare_benchmarks_incremental(
+            baseline_dir, new_dir, state_dir, args.threshold, benchmark_type,
+            args.input_format, cache_dir, args.statistical, args.alpha,
+            args.bootstrap_samples, args.duplicate_policy, noise_tables.get(benchmark_type)
+        )
+        print(f"Successfully merged {len(comparison)} matching {benchmark_type} benchmarks between versions")
+        
+        stats = generate_regression_report(comparison, output, args.threshold)
+        stats['total_matching'] = len(comparison)
+        stats_by_type[benchmark_type] = stats
+        
+        # The full dump only changes when one of its partitions did
+        full_output = full_comparison_file(output, args.output_format)
+        if recomputed or not os.path.exists(full_output):
+            write_full_comparison(comparison, full_output, args.output_format)
+            print(f"Full {benchmark_type} comparison saved to: {full_output}")
+        else:
+            print(f"Full {benchmark_type} comparison unchanged: {full_output}")
     
-    print(f"Markdown report saved to: {output_file}")
-    return markdown_content
+    if args.benchmark_type == 'both':
+        write_summary_reports(args, stats_by_type['eager'], stats_by_type['compile'])
+    write_rerun_manifest(args, stats_by_type)
+    
+    print_unique_cases_summary(regressed_cases(stats_by_type))
+    return 0
+
+def regressed_cases(stats_by_type):
+    """Map each benchmark type to its regressed case names, None where nothing regressed."""
+    return {
+        benchmark_type: stats['regression_report']['Case Name'].tolist()
+        if stats and stats.get('regression_report') is not None else None
+        for benchmark_type, stats in stats_by_type.items()
+    }
 
 def main():
     parser = argparse.ArgumentParser(description='Compare PyTorch benchmark reports')
@@ -405,107 +1870,222 @@ def main():
                        help='Output CSV file name')
     parser.add_argument('--generate-markdown', action='store_true',
                        help='Generate automatic markdown report')
+    parser.add_argument('--generate-html', action='store_true',
+                       help='Generate a self-contained HTML report with sortable tables')
+    parser.add_argument('--report-top-k', type=int, default=5,
+                       help='Top execution time regressions listed per benchmark type in the markdown report (default: 5)')
+    parser.add_argument('--report-max-cases', type=int, default=100,
+                       help='Unique cases listed per section of the summary reports, 0 = all (default: 100)')
+    parser.add_argument('--report-max-rows', type=int, default=1000,
+                       help='Rows of each regression table in the HTML report, 0 = all (default: 1000)')
+    parser.add_argument('--collapse-sections', action='store_true',
+                       help='Fold long report sections (case lists, regime tables) into <details> blocks')
+    parser.add_argument('--rerun-manifest', action='store_true',
+                       help='Cluster regressed cases and write representatives to re-run as '
+                            '<output>_rerun_manifest.json')
+    parser.add_argument('--rerun-per-cluster', type=int, default=1,
+                       help='Representatives per regression cluster in the re-run manifest (default: 1)')
+    parser.add_argument('--cluster-by', nargs='+', choices=list(CLUSTER_FIELDS), default=list(CLUSTER_FIELDS),
+                       help='Fields that must match within a regression cluster (default: all)')
+    parser.add_argument('--duplicate-policy', choices=DUPLICATE_POLICIES, default='last',
+                       help='How rows sharing a benchmark key are collapsed before merging (default: last)')
+    parser.add_argument('--input-format', choices=['csv', 'json'], default='csv',
+                       help='Benchmark file format to read (default: csv)')
+    parser.add_argument('--jobs', type=int, default=None,
+                       help='Number of benchmark files parsed concurrently (default: executor default, 1 = serial)')
+    parser.add_argument('--process-pool', action='store_true',
+                       help='Parse files in worker processes instead of threads (helps JSON parsing)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                       help=f'Cache of parsed benchmark files (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--cache-max-mb', type=float, default=1024,
+                       help='Evict least recently used cache entries above this size in MB (default: 1024)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always parse benchmark files, bypassing the cache')
+    parser.add_argument('--statistical', action='store_true',
+                       help='Flag execution time regressions from all benchmark_values samples (JSON input)')
+    parser.add_argument('--alpha', type=float, default=0.05,
+                       help='Significance level of the Mann-Whitney test in statistical mode (default: 0.05)')
+    parser.add_argument('--bootstrap-samples', type=int, default=1000,
+                       help='Bootstrap resamples per case in statistical mode (default: 1000)')
+    parser.add_argument('--trend-dirs', nargs='+', default=None,
+                       help='Trend mode: benchmark directories ordered oldest to newest (replaces --baseline-dir/--new-dir)')
+    parser.add_argument('--trend-metric', choices=['time', 'memory'], default='time',
+                       help='Metric tracked in trend mode (default: time)')
+    parser.add_argument('--calibrate-noise', nargs='+', default=None, metavar='DIR',
+                       help='Calibration mode: repeated runs of one version; write per-case noise bands to --noise-table')
+    parser.add_argument('--noise-table', default=None,
+                       help='Noise table from --calibrate-noise; raises each case\'s threshold to its noise band '
+                            '(calibration default: <output>_noise_floors.csv)')
+    parser.add_argument('--noise-level', choices=NOISE_LEVELS, default='case',
+                       help='Use per-case noise bands with the op/shape bucket as fallback, '
+                            'or bucket bands only (default: case)')
+    parser.add_argument('--incremental-dir', default=None,
+                       help='Incremental mode: keep per-file results and an input-hash manifest here, '
+                            'recomputing only changed files')
+    parser.add_argument('--streaming', action='store_true',
+                       help='Bounded-memory mode: hash-partition inputs on disk and compare partition by partition')
+    parser.add_argument('--partitions', type=int, default=64,
+                       help='Number of hash partitions in streaming mode (default: 64)')
+    parser.add_argument('--chunksize', type=int, default=100_000,
+                       help='Rows read per CSV chunk in streaming mode (default: 100000)')
+    parser.add_argument('--serve', default=None, metavar='[HOST:]PORT',
+                       help='Server mode: keep parsed baselines in memory and answer POST /compare over HTTP')
+    parser.add_argument('--serve-socket', default=None, metavar='PATH',
+                       help='Server mode over a Unix domain socket instead of TCP')
+    parser.add_argument('--max-baselines', type=int, default=4,
+                       help='Parsed baselines kept in memory by the server, least recently used evicted (default: 4)')
+    parser.add_argument('--fast-path-max-rows', type=int, default=FAST_PATH_MAX_ROWS,
+                       help='Compare inputs up to this many rows without pandas (0 disables, '
+                            f'default: {FAST_PATH_MAX_ROWS})')
+    parser.add_argument('--output-format', choices=list(FULL_OUTPUT_FORMATS), default='csv',
+                       help='Format of the full comparison dumps: csv, gzip-compressed csv, '
+                            'parquet (zstd) or arrow (IPC file, memory-mappable) (default: csv)')
+    parser.add_argument('--profile', nargs='?', const='', default=None, metavar='JSON_FILE',
+                       help='Write per-phase wall time, RSS change, process peak RSS and row counts as JSON '
+                            '(default file: <output>_profile.json)')
     
     args = parser.parse_args()
     
+    if args.profile is not None:
+        start_profile()
+    
     # Convert to absolute paths
     baseline_dir = os.path.abspath(args.baseline_dir)
     new_dir = os.path.abspath(args.new_dir)
     
+    cache_dir = None
+    if not args.no_cache:
+        if pa_feather is None:
+            print("pyarrow is not installed, parsed benchmark files will not be cached")
+        else:
+            cache_dir = os.path.abspath(args.cache_dir)
+    
     try:
+        if args.serve or args.serve_socket:
+            # Imported here because the server module builds on this one
+            from comparison_server import run_comparison_server
+            return run_comparison_server(args, cache_dir)
+        
+        if args.calibrate_noise:
+            with profile_phase('calibrate_noise'):
+                return run_noise_calibration(args, cache_dir)
+        
+        if args.trend_dirs:
+            with profile_phase('trend'):
+                return run_trend_analysis(args, cache_dir)
+        
+        if args.incremental_dir:
+            with profile_phase('incremental'):
+                return run_incremental_comparison(args, baseline_dir, new_dir, cache_dir)
+        
+        if args.streaming:
+            if args.statistical:
+                raise ValueError("--statistical is not supported with --streaming")
+            with profile_phase('streaming'):
+                return run_streaming_comparison(args, baseline_dir, new_dir)
+        
+        if (args.fast_path_max_rows > 0 and args.input_format == 'csv' and not args.statistical
+                and not args.generate_markdown and not args.generate_html and not args.noise_table
+                and not args.rerun_manifest
+                and args.output_format in ('csv', 'csv.gz')):
+            # None when the input is too large or unusual; the pandas path below takes over
+            if run_fast_comparison(args, baseline_dir, new_dir) is not None:
+                return 0
+        
         if args.benchmark_type == 'both':
             # Run both eager and compile comparisons
             print("Running comparisons for both eager and compile benchmarks...")
             
+            noise_tables = load_noise_floors(args)
+            
+            # Read each directory once and share the eager/compile splits
+            print(f"Loading baseline benchmarks from: {baseline_dir}")
+            with profile_phase('load_baseline'):
+                baseline_split = load_benchmark_data_split(baseline_dir, args.input_format, cache_dir,
+                                                           args.jobs, args.process_pool)
+            print(f"Loading new benchmarks from: {new_dir}")
+            with profile_phase('load_new'):
+                new_split = load_benchmark_data_split(new_dir, args.input_format, cache_dir,
+                                                      args.jobs, args.process_pool)
+            
             # Eager benchmarks
             print("\n=== EAGER BENCHMARKS ===")
-            eager_comparison = compare_benchmarks(baseline_dir, new_dir, args.threshold, 'eager')
+            with profile_phase('eager'):
+                eager_comparison = compare_benchmark_frames(baseline_split['eager'], new_split['eager'], args.threshold, 'eager',
+                                                             args.statistical, args.alpha, args.bootstrap_samples,
+                                                             args.duplicate_policy, noise_tables.get('eager'))
             eager_output = args.output.replace('.csv', '_eager.csv')
-            eager_stats = generate_regression_report(eager_comparison, eager_output, args.threshold)
+            with profile_phase('eager_regression_report', rows=int(eager_comparison['has_regression'].sum())):
+                eager_stats = generate_regression_report(eager_comparison, eager_output, args.threshold)
             
             # Add matching count to stats
-            if eager_stats:
-                eager_stats['total_matching'] = len(eager_comparison)
+            eager_stats['total_matching'] = len(eager_comparison)
             
             # Save full comparison
-            eager_full_file = eager_output.replace('.csv', '_full_comparison.csv')
-            eager_comparison.to_csv(eager_full_file, index=False)
+            eager_full_file = full_comparison_file(eager_output, args.output_format)
+            with profile_phase('eager_full_comparison', rows=len(eager_comparison)):
+                write_full_comparison(eager_comparison, eager_full_file, args.output_format)
             print(f"Full eager comparison saved to: {eager_full_file}")
             
             # Compile benchmarks
             print("\n=== COMPILE BENCHMARKS ===")
-            compile_comparison = compare_benchmarks(baseline_dir, new_dir, args.threshold, 'compile')
+            with profile_phase('compile'):
+                compile_comparison = compare_benchmark_frames(baseline_split['compile'], new_split['compile'], args.threshold, 'compile',
+                                                               args.statistical, args.alpha, args.bootstrap_samples,
+                                                               args.duplicate_policy, noise_tables.get('compile'))
             compile_output = args.output.replace('.csv', '_compile.csv')
-            compile_stats = generate_regression_report(compile_comparison, compile_output, args.threshold)
+            with profile_phase('compile_regression_report', rows=int(compile_comparison['has_regression'].sum())):
+                compile_stats = generate_regression_report(compile_comparison, compile_output, args.threshold)
             
             # Add matching count to stats
-            if compile_stats:
-                compile_stats['total_matching'] = len(compile_comparison)
+            compile_stats['total_matching'] = len(compile_comparison)
             
             # Save full comparison
-            compile_full_file = compile_output.replace('.csv', '_full_comparison.csv')
-            compile_comparison.to_csv(compile_full_file, index=False)
+            compile_full_file = full_comparison_file(compile_output, args.output_format)
+            with profile_phase('compile_full_comparison', rows=len(compile_comparison)):
+                write_full_comparison(compile_comparison, compile_full_file, args.output_format)
             print(f"Full compile comparison saved to: {compile_full_file}")
             
-            # Generate markdown report if requested
-            if args.generate_markdown:
-                markdown_output = args.output.replace('.csv', '_summary_report.md')
-                generate_markdown_report(eager_stats, compile_stats, args.threshold, markdown_output)
-            
-            # Print unique cases summary
-            print("\n" + "="*60)
-            print("UNIQUE CASES SUMMARY")
-            print("="*60)
+            # Generate markdown and HTML reports and the re-run manifest if requested
+            write_summary_reports(args, eager_stats, compile_stats)
+            write_rerun_manifest(args, {'eager': eager_stats, 'compile': compile_stats})
             
-            if eager_stats and eager_stats.get('regression_report') is not None:
-                eager_cases = eager_stats['regression_report']['Case Name'].tolist()
-                eager_unique = extract_unique_cases(eager_cases)
-                print(f"\nEager Benchmark Unique Cases ({len(eager_unique)} unique):")
-                for case in eager_unique:
-                    print(f"  {case}")
-            
-            if compile_stats and compile_stats.get('regression_report') is not None:
-                compile_cases = compile_stats['regression_report']['Case Name'].tolist()
-                compile_unique = extract_unique_cases(compile_cases)
-                print(f"\nCompile Benchmark Unique Cases ({len(compile_unique)} unique):")
-                for case in compile_unique:
-                    print(f"  {case}")
-            
-            # Combined unique cases
-            if eager_stats and compile_stats and eager_stats.get('regression_report') is not None and compile_stats.get('regression_report') is not None:
-                all_cases = eager_cases + compile_cases
-                all_unique = extract_unique_cases(all_cases)
-                print(f"\nAll Unique Cases Combined ({len(all_unique)} unique):")
-                for case in all_unique:
-                    print(f"  {case}")
+            print_unique_cases_summary(regressed_cases({'eager': eager_stats, 'compile': compile_stats}))
             
         else:
             # Run single benchmark type comparison
-            comparison_df = compare_benchmarks(baseline_dir, new_dir, args.threshold, args.benchmark_type)
+            comparison_df = compare_benchmarks(baseline_dir, new_dir, args.threshold, args.benchmark_type,
+                                               args.input_format, cache_dir, args.jobs, args.process_pool,
+                                               args.statistical, args.alpha, args.bootstrap_samples,
+                                               args.duplicate_policy,
+                                               load_noise_floors(args).get(args.benchmark_type))
             
             # Generate regression report
-            stats = generate_regression_report(comparison_df, args.output, args.threshold)
+            with profile_phase('regression_report', rows=int(comparison_df['has_regression'].sum())):
+                stats = generate_regression_report(comparison_df, args.output, args.threshold)
             
             # Also save full comparison for reference
-            full_comparison_file = args.output.replace('.csv', '_full_comparison.csv')
-            comparison_df.to_csv(full_comparison_file, index=False)
-            print(f"Full comparison saved to: {full_comparison_file}")
+            full_output = full_comparison_file(args.output, args.output_format)
+            with profile_phase('full_comparison', rows=len(comparison_df)):
+                write_full_comparison(comparison_df, full_output, args.output_format)
+            print(f"Full comparison saved to: {full_output}")
+            write_rerun_manifest(args, {args.benchmark_type: stats})
             
             # Print unique cases summary for single benchmark type
-            if stats and stats.get('regression_report') is not None:
-                print("\n" + "="*60)
-                print("UNIQUE CASES SUMMARY")
-                print("="*60)
-                
-                cases = stats['regression_report']['Case Name'].tolist()
-                unique_cases = extract_unique_cases(cases)
-                print(f"\n{args.benchmark_type.title()} Benchmark Unique Cases ({len(unique_cases)} unique):")
-                for case in unique_cases:
-                    print(f"  {case}")
+            cases_by_type = regressed_cases({args.benchmark_type: stats})
+            if cases_by_type[args.benchmark_type] is not None:
+                print_unique_cases_summary(cases_by_type)
         
     except Exception as e:
         print(f"Error: {e}")
         return 1
+    finally:
+        if args.profile is not None:
+            profile_file = args.profile or args.output.replace('.csv', '_profile.json')
+            finish_profile(profile_file)
+            print(f"Profile saved to: {profile_file}")
+        # Every mode returns from inside the try block, so evict on the way out
+        trim_benchmark_cache(cache_dir, args.cache_max_mb)
     
     return 0
 
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Long-running comparison service (see --serve / --serve-socket).
+Keeps parsed baselines resident so each comparison request only parses the new run.
+"""
+
+import json
+import math
+import os
+import shutil
+import socketserver
+import tempfile
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from compare_pytorch_benchmarks import (
+    COMPOSITE_KEY_COLUMNS,
+    DUPLICATE_POLICIES,
+    build_regression_report,
+    compare_benchmark_frames,
+    deduplicate_benchmarks,
+    list_benchmark_files,
+    load_benchmark_data_by_type,
+    load_benchmark_data_split,
+    load_noise_floors,
+    trim_benchmark_cache,
+)
+from regression_clusters import json_value
+
+# Benchmark file formats a request may ask for (see --input-format)
+INPUT_FORMATS = ['csv', 'json']
+
+# Largest accepted request body
+MAX_REQUEST_BYTES = 256 * 1024 * 1024
+
+# Seconds between evictions of the parsed-file cache down to --cache-max-mb
+CACHE_EVICT_INTERVAL_S = 60
+
+def directory_signature(directory, input_format="csv"):
+    """Fingerprint the benchmark files of a directory by name, size and mtime."""
+    signature = []
+    for benchmark_file in list_benchmark_files(directory, "both", input_format):
+        stat = os.stat(benchmark_file)
+        signature.append((os.path.basename(benchmark_file), stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+def load_split(directory, benchmark_type="both", input_format="csv", cache_dir=None):
+    """Load a directory into {"eager": df, "compile": df}, or just the requested type."""
+    if benchmark_type == 'both':
+        return load_benchmark_data_split(directory, input_format, cache_dir)
+    return {benchmark_type: load_benchmark_data_by_type(directory, benchmark_type, input_format, cache_dir)}
+
+class BaselineStore:
+    """
+    LRU cache of parsed baselines.
+
+    Each entry holds the eager/compile frames of one baseline directory, with duplicate
+    composite keys already collapsed so every row is one benchmark. Entries are keyed by
+    (directory, input format, duplicate policy) and reloaded when the directory's files change.
+    Baselines are parsed outside the store lock, under a lock per key, so a slow load never
+    blocks requests against other resident baselines and concurrent requests for the same
+    baseline parse it once.
+    """
+
+    def __init__(self, max_baselines=4, cache_dir=None):
+        if max_baselines < 1:
+            raise ValueError("--max-baselines must be at least 1")
+        self.max_baselines = max_baselines
+        self.cache_dir = cache_dir
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.load_locks = {}
+
+    def lookup(self, key, signature):
+        """Return the resident frames of key if they match signature, else None."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry['signature'] == signature:
+                self.entries.move_to_end(key)
+                return entry['frames']
+        return None
+
+    def get(self, directory, input_format="csv", duplicate_policy="last"):
+        """Return (frames by type, was_loaded) for a baseline directory."""
+        key = (os.path.abspath(directory), input_format, duplicate_policy)
+        signature = directory_signature(key[0], input_format)
+
+        frames = self.lookup(key, signature)
+        if frames is not None:
+            return frames, False
+
+        with self.lock:
+            load_lock = self.load_locks.setdefault(key, threading.Lock())
+        with load_lock:
+            # Another request may have loaded this baseline while we waited
+            frames = self.lookup(key, signature)
+            if frames is not None:
+                return frames, False
+
+            frames = {}
+            for benchmark_type, df in load_split(key[0], 'both', input_format, self.cache_dir).items():
+                key_columns = [column for column in COMPOSITE_KEY_COLUMNS if column in df.columns]
+                frames[benchmark_type], _ = deduplicate_benchmarks(df, key_columns, duplicate_policy)
+
+            with self.lock:
+                self.entries[key] = {'signature': signature, 'frames': frames, 'loaded': time.time()}
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_baselines:
+                    evicted, _ = self.entries.popitem(last=False)
+                    self.load_locks.pop(evicted, None)
+                    print(f"Evicted baseline from memory: {evicted[0]}")
+            return frames, True
+
+    def describe(self):
+        """List resident baselines, least recently used first."""
+        with self.lock:
+            return [{
+                'baseline_dir': directory,
+                'input_format': input_format,
+                'duplicate_policy': duplicate_policy,
+                'files': len(entry['signature']),
+                'rows': {benchmark_type: len(df) for benchmark_type, df in entry['frames'].items()},
+                'loaded': entry['loaded']
+            } for (directory, input_format, duplicate_policy), entry in self.entries.items()]
+
+def write_payload_files(new_files, directory):
+    """Write {"file name": "file content"} from a request into directory."""
+    for name, content in new_files.items():
+        if os.path.basename(name) != name or name.startswith('.'):
+            raise ValueError(f"Invalid file name in new_files: {name!r}")
+        with open(os.path.join(directory, name), 'w') as f:
+            f.write(content)
+
+def summarize_regressions(comparison_df, regression_report):
+    """
+    Regression counts of one comparison, like the stats printed by generate_regression_report.
+    A worst change without a finite value (a zero baseline) is None, as in the report rows.
+    """
+    execution = comparison_df[comparison_df['execution_time_regression']]
+    memory = comparison_df[comparison_df['memory_regression']]
+    return {
+        'total_matching': len(comparison_df),
+        'total_regressions': len(regression_report),
+        'execution_regressions': len(execution),
+        'memory_regressions': len(memory),
+        'max_exec_time_regression': json_value(float(execution['execution_time_change_pct'].max()))
+                                    if len(execution) else 0.0,
+        'max_memory_regression': json_value(float(memory['memory_change_pct'].max())) if len(memory) else 0.0
+    }
+
+def request_options(request, defaults):
+    """
+    Merge the options of a request over the server defaults and validate them.
+
+    Raises:
+        ValueError: An option has an unknown value, the wrong type or is out of range
+    """
+    options = {**defaults, **{key: value for key, value in request.items() if key in defaults}}
+    if options['duplicate_policy'] not in DUPLICATE_POLICIES:
+        raise ValueError(f"Unknown duplicate policy {options['duplicate_policy']!r}")
+    if options['benchmark_type'] not in ('eager', 'compile', 'both'):
+        raise ValueError(f"Unknown benchmark type {options['benchmark_type']!r}")
+    if not isinstance(options['baseline_dir'], str):
+        raise ValueError("baseline_dir must be a string")
+    if options['input_format'] not in INPUT_FORMATS:
+        raise ValueError(f"Unknown input format {options['input_format']!r}, expected one of {INPUT_FORMATS}")
+    for name, convert in (('threshold', float), ('alpha', float), ('bootstrap_samples', int)):
+        value = options[name]
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f"{name} must be a number, got {value!r}")
+        try:
+            options[name] = convert(value)
+        except ValueError:
+            raise ValueError(f"{name} must be a number, got {value!r}") from None
+    if not math.isfinite(options['threshold']):
+        raise ValueError(f"threshold must be a finite number, got {options['threshold']!r}")
+    if not 0 < options['alpha'] < 1:
+        raise ValueError(f"alpha must be between 0 and 1, got {options['alpha']!r}")
+    if options['bootstrap_samples'] < 1:
+        raise ValueError(f"bootstrap_samples must be at least 1, got {options['bootstrap_samples']!r}")
+    if not isinstance(options['statistical'], bool):
+        raise ValueError(f"statistical must be true or false, got {options['statistical']!r}")
+    return options
+
+def handle_compare_request(store, request, defaults, noise_tables=None):
+    """
+    Compare a new run against a resident baseline.
+
+    Args:
+        store: BaselineStore
+        request: Dict with new_dir or new_files ({file name: content}), and optionally
+            baseline_dir, benchmark_type, input_format, threshold, duplicate_policy,
+            statistical, alpha and bootstrap_samples
+        defaults: The same keys from the server command line
+        noise_tables: {benchmark type: NoiseFloors} from the server's --noise-table, or None
+
+    Returns:
+        JSON response body (str); changes without a finite value (a zero baseline) are null
+    """
+    start = time.perf_counter()
+    options = request_options(request, defaults)
+
+    baseline, baseline_loaded = store.get(options['baseline_dir'], options['input_format'],
+                                          options['duplicate_policy'])
+
+    payload_dir = None
+    try:
+        if request.get('new_files'):
+            payload_dir = tempfile.mkdtemp(prefix='benchmark_payload_')
+            write_payload_files(request['new_files'], payload_dir)
+            new_dir = payload_dir
+        elif request.get('new_dir'):
+            new_dir = request['new_dir']
+        else:
+            raise ValueError("Request needs new_dir or new_files")
+
+        new_split = load_split(new_dir, options['benchmark_type'], options['input_format'], store.cache_dir)
+    finally:
+        if payload_dir is not None:
+            shutil.rmtree(payload_dir, ignore_errors=True)
+
+    noise_tables = noise_tables or {}
+    stats = {}
+    reports = {}
+    for benchmark_type in new_split:
+        comparison = compare_benchmark_frames(
+            baseline[benchmark_type], new_split[benchmark_type], options['threshold'], benchmark_type,
+            options['statistical'], options['alpha'], options['bootstrap_samples'],
+            options['duplicate_policy'], noise_tables.get(benchmark_type)
+        )
+        regression_report = build_regression_report(comparison)
+        stats[benchmark_type] = summarize_regressions(comparison, regression_report)
+        # to_json writes NaN and infinite changes as null, like json_value in the stats
+        reports[benchmark_type] = regression_report.to_json(orient='records')
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    header = json.dumps({
+        'baseline_dir': os.path.abspath(options['baseline_dir']),
+        'baseline_loaded': baseline_loaded,
+        'threshold': options['threshold'],
+        'elapsed_ms': round(elapsed_ms, 3),
+        'stats': stats
+    }, allow_nan=False)
+    # The reports are already JSON, splice them in instead of re-encoding
+    regressions = ', '.join(f'"{benchmark_type}": {report}' for benchmark_type, report in reports.items())
+    return header[:-1] + f', "regressions": {{{regressions}}}}}'
+
+def make_request_handler(store, defaults, noise_tables=None):
+    """Build the HTTP request handler class serving store."""
+
+    class ComparisonRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def send_json(self, status, body):
+            encoded = body.encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self.send_json(200, json.dumps({'status': 'ok'}))
+            elif self.path == '/baselines':
+                self.send_json(200, json.dumps({'max_baselines': store.max_baselines,
+                                                'baselines': store.describe()}))
+            else:
+                self.send_json(404, json.dumps({'error': f"Unknown path {self.path}"}))
+
+        def do_POST(self):
+            if self.path != '/compare':
+                # The body is left unread, so it must not be parsed as the next request
+                self.close_connection = True
+                self.send_json(404, json.dumps({'error': f"Unknown path {self.path}"}))
+                return
+
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                if length > MAX_REQUEST_BYTES:
+                    self.close_connection = True
+                    raise ValueError(f"Request body larger than {MAX_REQUEST_BYTES} bytes")
+                request = json.loads(self.rfile.read(length) or b'{}')
+                if not isinstance(request, dict):
+                    raise ValueError("Request body must be a JSON object")
+                body = handle_compare_request(store, request, defaults, noise_tables)
+            except ValueError as e:
+                # Bad request: malformed JSON (JSONDecodeError is a ValueError), unknown
+                # options or data that does not validate
+                self.send_json(400, json.dumps({'error': str(e)}))
+                return
+            except Exception as e:
+                traceback.print_exc()
+                self.send_json(500, json.dumps({'error': f"{type(e).__name__}: {e}"}))
+                return
+            self.send_json(200, body)
+
+        def address_string(self):
+            # Unix socket peers have no (host, port) address
+            return self.client_address[0] if self.client_address else 'unix'
+
+    return ComparisonRequestHandler
+
+def start_cache_eviction(cache_dir, max_mb, interval=CACHE_EVICT_INTERVAL_S):
+    """
+    Evict the parsed-file cache every interval seconds on a daemon thread, so a server
+    that never exits still honors --cache-max-mb.
+
+    Returns:
+        Event that stops the thread when set, or None without a cache
+    """
+    if cache_dir is None:
+        return None
+
+    stop = threading.Event()
+
+    def evict_periodically():
+        while not stop.wait(interval):
+            try:
+                trim_benchmark_cache(cache_dir, max_mb)
+            except OSError as e:
+                print(f"Cache eviction failed: {e}")
+
+    threading.Thread(target=evict_periodically, name='cache-eviction', daemon=True).start()
+    return stop
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP over a Unix domain socket, one thread per connection."""
+    daemon_threads = True
+
+def run_comparison_server(args, cache_dir):
+    """Serve comparisons over HTTP (--serve) or a Unix socket (--serve-socket) until interrupted."""
+    defaults = {
+        'baseline_dir': os.path.abspath(args.baseline_dir),
+        'benchmark_type': args.benchmark_type,
+        'input_format': args.input_format,
+        'threshold': args.threshold,
+        'duplicate_policy': args.duplicate_policy,
+        'statistical': args.statistical,
+        'alpha': args.alpha,
+        'bootstrap_samples': args.bootstrap_samples,
+    }
+    store = BaselineStore(args.max_baselines, cache_dir)
+    noise_tables = load_noise_floors(args)
+
+    # Warm the default baseline so the first request is already fast
+    if os.path.isdir(defaults['baseline_dir']):
+        print(f"Loading baseline benchmarks from: {defaults['baseline_dir']}")
+        store.get(defaults['baseline_dir'], args.input_format, args.duplicate_policy)
+
+    handler = make_request_handler(store, defaults, noise_tables)
+    if args.serve_socket:
+        if os.path.exists(args.serve_socket):
+            os.remove(args.serve_socket)
+        server = ThreadingUnixHTTPServer(args.serve_socket, handler)
+        print(f"Serving comparisons on unix socket: {args.serve_socket}")
+    else:
+        host, _, port = args.serve.rpartition(':')
+        server = ThreadingHTTPServer((host or '127.0.0.1', int(port)), handler)
+        print(f"Serving comparisons on http://{host or '127.0.0.1'}:{port}")
+
+    stop_eviction = start_cache_eviction(cache_dir, args.cache_max_mb)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Shutting down comparison server")
+    finally:
+        if stop_eviction is not None:
+            stop_eviction.set()
+        server.server_close()
+        if args.serve_socket and os.path.exists(args.serve_socket):
+            os.remove(args.serve_socket)
+    return 0
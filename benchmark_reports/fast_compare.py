@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Pure-stdlib comparison for small CSV inputs (see --fast-path-max-rows).
+Reads, merges and flags the benchmark files with csv and array and writes the same
+regression and full comparison CSVs as the pandas path, so quick gate runs never import
+pandas. Anything it cannot reproduce exactly is left to the pandas path.
+"""
+
+import csv
+import math
+import os
+import re
+from array import array
+from functools import lru_cache
+
+from benchmark_common import (
+    COMPOSITE_KEY_COLUMNS,
+    CSV_COLUMNS,
+    REGRESSION_REPORT_COLUMNS,
+    calculate_percentage_change,
+    full_comparison_file,
+    list_benchmark_files,
+    open_csv_output,
+    print_case_overlap,
+    print_regression_summary,
+    print_unique_cases_summary,
+)
+from case_names import CASE_FIELD_COLUMNS, CASE_NAME_CACHE_SIZE, parse_case_name
+from profiling import profile_phase
+from roofline import THROUGHPUT_COLUMNS, estimate_work
+
+FRAME_COLUMNS = CSV_COLUMNS + ['source_file']
+METRIC_COLUMNS = ['Execution Time', 'Peak Memory (KB)']
+KEY_COLUMNS = [column for column in COMPOSITE_KEY_COLUMNS if column in CSV_COLUMNS]
+
+FLAG_COLUMNS = [
+    'execution_time_change_pct',
+    'memory_change_pct',
+    'execution_time_regression',
+    'memory_regression',
+    'has_regression'
+]
+
+COMPARISON_COLUMNS = (
+    [column if column == 'Case Name' else f'{column}_baseline' for column in FRAME_COLUMNS]
+    + [f'{column}_new' for column in FRAME_COLUMNS if column != 'Case Name']
+    + CASE_FIELD_COLUMNS
+    + FLAG_COLUMNS
+    + THROUGHPUT_COLUMNS
+)
+
+# Computed float64 columns, formatted with format_float64
+FLOAT_COLUMNS = frozenset(['execution_time_change_pct', 'memory_change_pct'] + THROUGHPUT_COLUMNS)
+
+# Strings pandas.read_csv turns into NaN by default
+PANDAS_NA_VALUES = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+])
+BOOLEAN_VALUES = {'True': True, 'TRUE': True, 'true': True, 'False': False, 'FALSE': False, 'false': False}
+INTEGER_PATTERN = re.compile(r'[+-]?\d+\Z')
+FLOAT_PATTERN = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\Z')
+
+# Distinct float32 values whose shortest text is memoized
+FLOAT32_TEXT_CACHE_SIZE = 1 << 16
+
+# Largest integer a float64 holds exactly, and the mantissa digits and power of ten up to
+# which read_csv parses decimals exactly (see parse_float)
+MAX_EXACT_INTEGER = 1 << 53
+MAX_EXACT_FLOAT_DIGITS = 15
+MAX_EXACT_POWER_OF_TEN = 22
+
+class FastPathUnsupported(Exception):
+    """The input needs pandas semantics the fast path does not reproduce."""
+
+def parse_float(value):
+    """
+    Parse a metric field like read_csv: NA strings become NaN, anything non-numeric is unsupported.
+
+    read_csv's default float parser scales an integer mantissa by a power of ten, which is
+    correctly rounded (and so equal to float()) only while the mantissa has at most 15
+    digits and the power is at most 1e22; longer values are left to pandas.
+    """
+    if value in PANDAS_NA_VALUES:
+        return math.nan
+    if FLOAT_PATTERN.match(value) is None:
+        raise FastPathUnsupported(f"non-numeric metric {value!r}")
+    if len(value) > MAX_EXACT_FLOAT_DIGITS or 'e' in value or 'E' in value:
+        mantissa, _, exponent = value.lower().partition('e')
+        integer, _, fraction = mantissa.lstrip('+-').partition('.')
+        digits = (integer + fraction).lstrip('0')
+        scale = int(exponent or 0) - len(fraction)
+        if len(digits) > MAX_EXACT_FLOAT_DIGITS or abs(scale) > MAX_EXACT_POWER_OF_TEN:
+            raise FastPathUnsupported(f"metric {value!r} beyond exactly parsed precision")
+    return float(value)
+
+def read_benchmark_csv(path, max_rows):
+    """
+    Read one benchmark CSV into {column: values} plus the dtype pandas would infer per metric.
+
+    Returns:
+        (columns, metric kinds): kinds are "int" (all integers, no NaN) or "float64"
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        if next(reader, None) != CSV_COLUMNS:
+            raise FastPathUnsupported(f"unexpected header in {path}")
+        rows = []
+        for row in reader:
+            if row:
+                rows.append(row)
+                if len(rows) > max_rows:
+                    raise FastPathUnsupported("too many rows")
+
+    if not rows or any(len(row) != len(CSV_COLUMNS) for row in rows):
+        raise FastPathUnsupported(f"empty or ragged file {path}")
+
+    columns = dict(zip(CSV_COLUMNS, (list(values) for values in zip(*rows))))
+    kinds = {}
+    for column in CSV_COLUMNS:
+        values = columns[column]
+        if column in METRIC_COLUMNS:
+            if all(INTEGER_PATTERN.match(value) for value in values):
+                integers = [int(value) for value in values]
+                if any(abs(value) > MAX_EXACT_INTEGER for value in integers):
+                    raise FastPathUnsupported("integer metric beyond float64 precision")
+                columns[column] = array('d', integers)
+                kinds[column] = 'int'
+            else:
+                columns[column] = array('d', map(parse_float, values))
+                kinds[column] = 'float64'
+        elif column == 'run_backward':
+            try:
+                columns[column] = [BOOLEAN_VALUES[value] for value in values]
+            except KeyError:
+                raise FastPathUnsupported("non-boolean run_backward") from None
+        elif not PANDAS_NA_VALUES.isdisjoint(values) or all(FLOAT_PATTERN.match(value) for value in values):
+            # Missing or all-numeric string columns get NaN or numeric dtypes in pandas
+            raise FastPathUnsupported(f"non-string values in {column}")
+
+    columns['source_file'] = [os.path.basename(path)] * len(rows)
+    return columns, kinds
+
+def fits_float32(values):
+    """Whether every value survives a float32 round trip (compact_benchmark_frame's downcast rule)."""
+    return all(narrow == value or value != value for narrow, value in zip(array('f', values), values))
+
+def load_frame(benchmark_files, row_budget):
+    """
+    Concatenate benchmark files into one frame and apply the float32 compaction.
+
+    Returns:
+        Frame dict: {"columns": {column: values}, "kinds": {metric: kind}, "rows": count}
+    """
+    if not benchmark_files:
+        raise FastPathUnsupported("no files")
+
+    columns = {column: [] for column in FRAME_COLUMNS}
+    for column in METRIC_COLUMNS:
+        columns[column] = array('d')
+    kinds = dict.fromkeys(METRIC_COLUMNS, 'int')
+
+    for benchmark_file in benchmark_files:
+        file_columns, file_kinds = read_benchmark_csv(benchmark_file, row_budget - len(columns['Case Name']))
+        for column in FRAME_COLUMNS:
+            columns[column].extend(file_columns[column])
+        for column, kind in file_kinds.items():
+            if kind != 'int':
+                kinds[column] = kind
+
+    for column in METRIC_COLUMNS:
+        if kinds[column] == 'float64' and fits_float32(columns[column]):
+            kinds[column] = 'float32'
+
+    return {'columns': columns, 'kinds': kinds, 'rows': len(columns['Case Name'])}
+
+def reduce_metric(values, policy, kind):
+    """Collapse one metric of a duplicate group like the pandas groupby aggregations (NaN skipped)."""
+    values = [value for value in values if value == value]
+    if not values:
+        return math.nan
+    if policy == 'min':
+        return min(values)
+    if policy == 'median':
+        values.sort()
+        middle = len(values) // 2
+        median = values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+        # Grouped medians of float32 columns are cast back to float32
+        return array('f', [median])[0] if kind == 'float32' else median
+    return values[-1]
+
+def deduplicate_frame(frame, policy):
+    """
+    Collapse rows sharing a benchmark key; see deduplicate_benchmarks for the semantics.
+
+    Returns:
+        (deduplicated frame, number of rows removed)
+    """
+    columns = frame['columns']
+    keys = list(zip(*(columns[column] for column in KEY_COLUMNS)))
+    groups = {}
+    for row, key in enumerate(keys):
+        groups.setdefault(key, []).append(row)
+    if len(groups) == len(keys):
+        return frame, 0
+
+    kept = [row for row, key in enumerate(keys) if groups[key][-1] == row]
+    deduplicated = {
+        column: [values[row] for row in kept]
+        for column, values in columns.items() if column not in METRIC_COLUMNS
+    }
+    kinds = dict(frame['kinds'])
+    for column in METRIC_COLUMNS:
+        values = columns[column]
+        reduced = array('d')
+        for row in kept:
+            group = groups[keys[row]]
+            if len(group) == 1:
+                reduced.append(values[row])
+            else:
+                reduced.append(reduce_metric([values[member] for member in group], policy, kinds[column]))
+                if policy == 'median' and kinds[column] == 'int':
+                    # A grouped median of an int64 column is float64, which widens the column
+                    kinds[column] = 'float64'
+        deduplicated[column] = reduced
+
+    return {'columns': deduplicated, 'kinds': kinds, 'rows': len(kept)}, frame['rows'] - len(kept)
+
+def divide(numerator, denominator):
+    """Divide like numpy float64: nonzero / 0 is a signed inf, 0 / 0 and NaN operands are NaN."""
+    if denominator == 0:
+        if numerator == 0 or numerator != numerator:
+            return math.nan
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+@lru_cache(maxsize=CASE_NAME_CACHE_SIZE)
+def case_work(case_name):
+    """Parsed case fields, FLOPs and bytes moved of one case name (see roofline.estimate_work)."""
+    fields = parse_case_name(case_name)
+    case_fields = (fields.op, fields.B, fields.M, fields.N, fields.K, fields.trans_a, fields.trans_b,
+                   fields.device, fields.dtype, fields.backward_variant)
+    batch = float(fields.B) if fields.B is not None else 1.0
+    m, n, k = (float(value) if value is not None else math.nan for value in (fields.M, fields.N, fields.K))
+    flops, bytes_moved = estimate_work(fields.op, batch, m, n, k, fields.dtype, fields.backward_variant)
+    return case_fields, flops, bytes_moved
+
+def merge_frames(baseline, new, threshold):
+    """
+    Inner-join two deduplicated frames in baseline order and flag every pair.
+
+    Returns:
+        List of comparison rows with COMPARISON_COLUMNS values (floats stay raw)
+    """
+    new_names = [column for column in FRAME_COLUMNS if column != 'Case Name']
+    baseline_columns = [baseline['columns'][column] for column in FRAME_COLUMNS]
+    new_columns = [new['columns'][column] for column in new_names]
+    new_rows = {
+        key: row for row, key in enumerate(zip(*(new['columns'][column] for column in KEY_COLUMNS)))
+    }
+
+    case_index = FRAME_COLUMNS.index('Case Name')
+    time_index = FRAME_COLUMNS.index('Execution Time')
+    memory_index = FRAME_COLUMNS.index('Peak Memory (KB)')
+    new_time_index = new_names.index('Execution Time')
+    new_memory_index = new_names.index('Peak Memory (KB)')
+
+    comparison = []
+    baseline_keys = zip(*(baseline['columns'][column] for column in KEY_COLUMNS))
+    for row, key in enumerate(baseline_keys):
+        new_row = new_rows.get(key)
+        if new_row is None:
+            continue
+
+        baseline_values = [values[row] for values in baseline_columns]
+        new_values = [values[new_row] for values in new_columns]
+        case_fields, flops, bytes_moved = case_work(baseline_values[case_index])
+
+        time_change = calculate_percentage_change(baseline_values[time_index], new_values[new_time_index])
+        memory_change = calculate_percentage_change(baseline_values[memory_index], new_values[new_memory_index])
+        time_regression = time_change > threshold
+        memory_regression = memory_change > threshold
+
+        throughput = [flops, bytes_moved, divide(flops, bytes_moved)]
+        microseconds = [
+            time if time > 0 else math.nan
+            for time in (baseline_values[time_index], new_values[new_time_index])
+        ]
+        throughput += [divide(flops, time) / 1e6 for time in microseconds]
+        throughput += [divide(bytes_moved, time) / 1e3 for time in microseconds]
+
+        comparison.append(
+            baseline_values + new_values + list(case_fields)
+            + [time_change, memory_change, time_regression, memory_regression,
+               time_regression or memory_regression]
+            + throughput
+        )
+
+    return comparison
+
+def format_float64(value):
+    """Format a float64 like DataFrame.to_csv (shortest repr, empty for NaN)."""
+    if value != value:
+        return ''
+    return repr(value)
+
+def format_float32(value):
+    """
+    Format a float32 value like DataFrame.to_csv (numpy's float32 str): the shortest decimal
+    that round-trips to float32, positional for 1e-4 <= |value| < 1e6 and scientific otherwise.
+    """
+    if value != value:
+        return ''
+    if value == 0 or math.isinf(value):
+        # Zeros bypass the cache, which cannot tell -0.0 from 0.0
+        return repr(value)
+    return shortest_float32_text(value)
+
+@lru_cache(maxsize=FLOAT32_TEXT_CACHE_SIZE)
+def shortest_float32_text(value):
+    """format_float32 for finite, nonzero values (memoized; metric values repeat a lot)."""
+    for digits in range(1, 10):
+        text = f'{value:.{digits - 1}e}'
+        if array('f', [float(text)])[0] == value:
+            break
+    if 1e-4 <= abs(value) < 1e6:
+        return repr(float(text))
+    return text
+
+def format_int(value):
+    """Format an int64 metric stored as float."""
+    return str(int(value))
+
+def column_formatters(baseline, new):
+    """
+    Formatters of the float columns of COMPARISON_COLUMNS, honoring the metric dtypes of each
+    side. Other columns need none: csv writes str, bool and int values as pandas does and
+    None (a missing case field) as an empty field.
+    """
+    metric_formatters = {'int': format_int, 'float64': format_float64, 'float32': format_float32}
+    formatters = []
+    for column in COMPARISON_COLUMNS:
+        base_column, _, side = column.rpartition('_')
+        if base_column in METRIC_COLUMNS:
+            frame = baseline if side == 'baseline' else new
+            formatters.append(metric_formatters[frame['kinds'][base_column]])
+        elif column in FLOAT_COLUMNS:
+            formatters.append(format_float64)
+        else:
+            formatters.append(None)
+    return formatters
+
+def write_rows(handle, columns, rows, formatters, column_indices):
+    """Write rows (restricted to column_indices) as CSV with a header, like DataFrame.to_csv."""
+    writer = csv.writer(handle, lineterminator=os.linesep)
+    writer.writerow(columns)
+    formatted = [
+        (position, formatters[index]) for position, index in enumerate(column_indices)
+        if formatters[index] is not None
+    ]
+    for row in rows:
+        values = [row[index] for index in column_indices]
+        for position, formatter in formatted:
+            values[position] = formatter(values[position])
+        writer.writerow(values)
+
+def regression_rows(comparison):
+    """Regressed rows, worst execution time change first (stable, NaN last), like build_regression_report."""
+    change_index = COMPARISON_COLUMNS.index('execution_time_change_pct')
+    regression_index = COMPARISON_COLUMNS.index('has_regression')
+    regressions = [row for row in comparison if row[regression_index]]
+    ordered = sorted(
+        (row for row in regressions if row[change_index] == row[change_index]),
+        key=lambda row: row[change_index],
+        reverse=True
+    )
+    return ordered + [row for row in regressions if row[change_index] != row[change_index]]
+
+def compare_fast(baseline, new, benchmark_type, threshold, duplicate_policy):
+    """Print the comparison progress of compare_benchmark_frames and return the comparison rows."""
+    print_case_overlap(baseline['columns']['Case Name'], new['columns']['Case Name'],
+                       baseline['rows'], new['rows'], benchmark_type)
+
+    with profile_phase('merge', rows_baseline=baseline['rows'], rows_new=new['rows']) as record:
+        baseline, baseline_removed = deduplicate_frame(baseline, duplicate_policy)
+        new, new_removed = deduplicate_frame(new, duplicate_policy)
+        comparison = merge_frames(baseline, new, threshold)
+        record['rows'] = len(comparison)
+    if baseline_removed or new_removed:
+        print(f"Collapsed duplicate benchmark keys ({duplicate_policy}): "
+              f"{baseline_removed} baseline rows, {new_removed} new rows")
+
+    print(f"Successfully merged {len(comparison)} matching {benchmark_type} benchmarks between versions")
+    return comparison, column_formatters(baseline, new)
+
+def write_fast_reports(comparison, formatters, output_file, full_output_file, threshold, output_format="csv"):
+    """
+    Write the regression and full comparison CSVs and print the summary of generate_regression_report.
+
+    Returns:
+        Regressed case names (worst first), or None when nothing regressed
+    """
+    regressions = regression_rows(comparison)
+    if not regressions:
+        print("No regressions found!")
+        case_names = None
+    else:
+        print(f"\nFound {len(regressions)} benchmarks with regressions > {threshold}%")
+        report_indices = [COMPARISON_COLUMNS.index(column) for column in REGRESSION_REPORT_COLUMNS]
+        with open(output_file, 'w', newline='') as f:
+            write_rows(f, REGRESSION_REPORT_COLUMNS, regressions, formatters, report_indices)
+        print(f"Regression report saved to: {output_file}")
+
+        flag_index = COMPARISON_COLUMNS.index
+        execution = [row[flag_index('execution_time_change_pct')] for row in regressions
+                     if row[flag_index('execution_time_regression')]]
+        memory = [row[flag_index('memory_change_pct')] for row in regressions
+                  if row[flag_index('memory_regression')]]
+        print_regression_summary(len(execution), len(memory), max(execution, default=0), max(memory, default=0))
+        case_names = [row[COMPARISON_COLUMNS.index('Case Name')] for row in regressions]
+
+    with open_csv_output(full_output_file, output_format) as f:
+        write_rows(f, COMPARISON_COLUMNS, comparison, formatters, range(len(COMPARISON_COLUMNS)))
+    return case_names
+
+def load_fast_inputs(args, baseline_dir, new_dir):
+    """
+    Load both directories for the requested benchmark types within the row budget.
+
+    Returns:
+        {benchmark type: (baseline frame, new frame)}, or None when the pandas path is needed
+    """
+    benchmark_types = ['eager', 'compile'] if args.benchmark_type == 'both' else [args.benchmark_type]
+    budget = args.fast_path_max_rows
+    frames = {}
+    try:
+        for benchmark_type in benchmark_types:
+            pair = []
+            for directory in (baseline_dir, new_dir):
+                frame = load_frame(list_benchmark_files(directory, benchmark_type, 'csv'), budget)
+                budget -= frame['rows']
+                pair.append(frame)
+            frames[benchmark_type] = tuple(pair)
+    except FastPathUnsupported:
+        return None
+    return frames
+
+def run_fast_comparison(args, baseline_dir, new_dir):
+    """
+    Run a default-mode comparison without pandas when the inputs are small, standard CSVs.
+
+    Produces the same files and console summary as the pandas path.
+
+    Returns:
+        0 when the comparison ran, None when the caller should use the pandas path
+    """
+    with profile_phase('fast_load') as record:
+        frames = load_fast_inputs(args, baseline_dir, new_dir)
+        record['fallback'] = frames is None
+    if frames is None:
+        return None
+
+    regressed_cases = {}
+    if args.benchmark_type == 'both':
+        print("Running comparisons for both eager and compile benchmarks...")
+        print(f"Loading baseline benchmarks from: {baseline_dir}")
+        print(f"Loading new benchmarks from: {new_dir}")
+
+        for benchmark_type in ('eager', 'compile'):
+            print(f"\n=== {benchmark_type.upper()} BENCHMARKS ===")
+            with profile_phase(benchmark_type):
+                comparison, formatters = compare_fast(*frames[benchmark_type], benchmark_type,
+                                                      args.threshold, args.duplicate_policy)
+            output = args.output.replace('.csv', f'_{benchmark_type}.csv')
+            full_output = full_comparison_file(output, args.output_format)
+            with profile_phase(f'{benchmark_type}_reports', rows=len(comparison)):
+                regressed_cases[benchmark_type] = write_fast_reports(
+                    comparison, formatters, output, full_output, args.threshold, args.output_format
+                )
+            print(f"Full {benchmark_type} comparison saved to: {full_output}")
+
+        print_unique_cases_summary(regressed_cases)
+    else:
+        benchmark_type = args.benchmark_type
+        print(f"Loading baseline {benchmark_type} benchmarks from: {baseline_dir}")
+        print(f"Loading new {benchmark_type} benchmarks from: {new_dir}")
+        with profile_phase(benchmark_type):
+            comparison, formatters = compare_fast(*frames[benchmark_type], benchmark_type,
+                                                  args.threshold, args.duplicate_policy)
+        full_output = full_comparison_file(args.output, args.output_format)
+        with profile_phase('reports', rows=len(comparison)):
+            regressed_cases[benchmark_type] = write_fast_reports(
+                comparison, formatters, args.output, full_output, args.threshold, args.output_format
+            )
+        print(f"Full comparison saved to: {full_output}")
+
+        if regressed_cases[benchmark_type] is not None:
+            print_unique_cases_summary(regressed_cases)
+
+    return 0
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Deferred imports of the heavy third-party modules.
+pandas, numpy, pyarrow and scipy take most of a second to import; --help, server
+dispatch and the small-input fast path (see fast_compare.py) never touch them.
+"""
+
+import importlib
+import importlib.util
+
+class LazyModule:
+    """Stand-in for a module that imports the real one on first attribute access."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attribute):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module {self._name!r} ({state})>"
+
+def lazy_import(name, optional=False):
+    """
+    Return a LazyModule for name (e.g. "pandas" or "pyarrow.parquet").
+
+    With optional=True, return None when the top-level package is not installed, so the
+    usual "if module is None" fallbacks keep working without importing anything.
+    """
+    if optional and importlib.util.find_spec(name.partition('.')[0]) is None:
+        return None
+    return LazyModule(name)
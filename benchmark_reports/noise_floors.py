@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Per-case noise floors calibrated from repeated runs of the same version.
+A 4 us add kernel jitters far more between identical runs than a large bmm, so one global
+threshold either misses real regressions in stable cases or floods the report with noise
+from small ones. The calibration writes a noise band per case and per op/shape bucket, and
+comparisons raise each case's threshold to its band. Cases are identified by the same
+composite benchmark key as the comparison, so a case's forward and backward rows (or its
+entries in two modules) get separate bands.
+"""
+
+import hashlib
+import math
+from typing import NamedTuple
+
+from benchmark_common import COMPOSITE_KEY_COLUMNS
+from case_names import CASE_FIELD_COLUMNS
+from lazy_imports import lazy_import
+from roofline import SHAPE_BUCKET_EDGES, SHAPE_BUCKET_LABELS, estimate_case_work, regime_band
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+NOISE_METRICS = {
+    'Execution Time': 'time_noise_pct',
+    'Peak Memory (KB)': 'memory_noise_pct'
+}
+
+NOISE_TABLE_COLUMNS = ['benchmark_type'] + COMPOSITE_KEY_COLUMNS + [
+    'case_op',
+    'shape_bucket',
+    'samples',
+    'time_noise_pct',
+    'memory_noise_pct'
+]
+
+# Key columns a noise table may lack: tables keyed by Case Name only, and CSV runs (no mode)
+OPTIONAL_KEY_COLUMNS = [column for column in COMPOSITE_KEY_COLUMNS if column != 'Case Name']
+
+# Added to the comparison and regression report when a noise table is used
+NOISE_REPORT_COLUMNS = ['execution_time_threshold_pct', 'memory_threshold_pct']
+
+NOISE_LEVELS = ['case', 'bucket']
+
+# The change between two independent runs has sqrt(2) times the run-to-run deviation;
+# a band of 3 of those keeps identical versions under the threshold about 99.7% of the time
+NOISE_BAND_SIGMAS = 3.0
+
+# Bucket bands cover this fraction of the calibrated cases in the bucket
+BUCKET_BAND_QUANTILE = 0.9
+
+class NoiseFloors(NamedTuple):
+    """Noise bands of one benchmark type, in percent."""
+    cases: 'pd.DataFrame'  # indexed by the table's composite key columns
+    buckets: 'pd.DataFrame'  # indexed by (case_op, shape_bucket)
+    digest: str  # hash of the table file and level, for incremental mode
+
+def noise_bucket_keys(frame):
+    """(case_op, shape_bucket) of every row, from the parsed case_* fields."""
+    if 'case_op' not in frame.columns:
+        return (pd.Series('unparsed', index=frame.index, dtype=object),
+                pd.Series('unknown', index=frame.index, dtype=object))
+
+    flops, _ = estimate_case_work(frame)
+    return (frame['case_op'].astype(object).fillna('unparsed'),
+            regime_band(flops, SHAPE_BUCKET_EDGES, SHAPE_BUCKET_LABELS, frame.index))
+
+def noise_band_pct(stats):
+    """
+    Noise band of one metric from its per-case count, mean, std, min and max.
+
+    The band is the larger of NOISE_BAND_SIGMAS deviations of a two-run difference and the
+    full spread already seen between the calibration runs, so no change smaller than one
+    observed between identical versions is ever flagged. Cases with fewer than two samples
+    or a non-positive minimum get NaN. Bands are rounded up to 0.01%.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        deviation = stats['std'] / stats['mean'] * NOISE_BAND_SIGMAS * math.sqrt(2)
+        spread = (stats['max'] - stats['min']) / stats['min']
+    band = np.fmax(deviation, spread) * 100
+    band = band.where((stats['count'] >= 2) & (stats['min'] > 0))
+    return np.ceil(band * 100) / 100
+
+def compute_noise_floors(frames, benchmark_type):
+    """
+    Compute per-case and per-bucket noise bands from repeated runs of one version.
+
+    Each run must already hold one row per benchmark key (see deduplicate_benchmarks), so
+    every run contributes one sample per case and the bands measure the spread between
+    runs, not between re-runs inside one of them. All runs are stacked and reduced in a
+    single groupby pass over the composite key columns they all share.
+
+    Args:
+        frames: Loaded and deduplicated benchmark frames of one type, one per run
+        benchmark_type: "eager" or "compile", stored with every table row
+
+    Returns:
+        DataFrame with NOISE_TABLE_COLUMNS: one row per case, then one row per
+        (case_op, shape_bucket) with empty key columns
+    """
+    metrics = list(NOISE_METRICS)
+    key_columns = [column for column in COMPOSITE_KEY_COLUMNS if all(column in frame.columns for frame in frames)]
+    for run, frame in enumerate(frames, 1):
+        if frame.duplicated(key_columns).any():
+            raise ValueError(f"Calibration run {run} has duplicate benchmark keys; collapse them first")
+
+    columns = key_columns + metrics + [column for column in CASE_FIELD_COLUMNS if column in frames[0].columns]
+    stacked = pd.concat([frame[columns] for frame in frames], ignore_index=True)
+    stacked[key_columns] = stacked[key_columns].astype(object)
+
+    stats = stacked.groupby(key_columns, sort=True, dropna=False)[metrics].agg(['count', 'mean', 'std', 'min', 'max'])
+
+    # Case fields of the first run that has each case
+    fields = stacked.drop_duplicates(key_columns).set_index(key_columns).reindex(stats.index)
+    case_op, shape_bucket = noise_bucket_keys(fields)
+
+    cases = stats.index.to_frame(index=False).reindex(columns=COMPOSITE_KEY_COLUMNS)
+    cases.insert(0, 'benchmark_type', benchmark_type)
+    cases['case_op'] = case_op.to_numpy()
+    cases['shape_bucket'] = shape_bucket.to_numpy()
+    cases['samples'] = stats[(metrics[0], 'count')].to_numpy()
+    for metric, column in NOISE_METRICS.items():
+        cases[column] = noise_band_pct(stats[metric]).to_numpy()
+
+    grouped = cases.groupby(['case_op', 'shape_bucket'], sort=True)
+    buckets = grouped[list(NOISE_METRICS.values())].quantile(BUCKET_BAND_QUANTILE)
+    buckets = np.ceil(buckets * 100) / 100
+    buckets['samples'] = grouped['samples'].sum()
+    buckets = buckets.reset_index().reindex(columns=NOISE_TABLE_COLUMNS)
+    buckets['benchmark_type'] = benchmark_type
+
+    return pd.concat([cases, buckets], ignore_index=True)[NOISE_TABLE_COLUMNS]
+
+def merged_key_column(column):
+    """Column of a merged comparison frame holding key column (Case Name is not suffixed)."""
+    return column if column == 'Case Name' else f'{column}_baseline'
+
+def load_noise_table(path, level="case"):
+    """
+    Load a noise table written by the calibration mode.
+
+    Args:
+        path: CSV written by --calibrate-noise
+        level: "case" to use per-case bands with the bucket band as fallback, or "bucket"
+            to use only the pooled bucket bands
+
+    Returns:
+        Dict mapping benchmark type to NoiseFloors
+    """
+    if level not in NOISE_LEVELS:
+        raise ValueError(f"Unknown noise level {level!r}")
+
+    with open(path, 'rb') as f:
+        digest = hashlib.blake2b(f.read() + level.encode(), digest_size=20).hexdigest()
+    string_columns = ['Benchmarking Module Name', 'Case Name', 'tag', 'mode', 'case_op', 'shape_bucket']
+    table = pd.read_csv(path, dtype=dict.fromkeys(string_columns, object))
+    missing = [column for column in NOISE_TABLE_COLUMNS
+               if column not in table.columns and column not in OPTIONAL_KEY_COLUMNS]
+    if missing:
+        raise ValueError(f"{path} is not a noise table (missing columns: {', '.join(missing)})")
+
+    bands = list(NOISE_METRICS.values())
+    floors = {}
+    for benchmark_type, rows in table.groupby('benchmark_type', sort=False):
+        is_case = rows['Case Name'].notna()
+        # Key columns the calibration runs had; CSV runs leave mode empty
+        key_columns = [column for column in COMPOSITE_KEY_COLUMNS
+                       if column in rows.columns and rows.loc[is_case, column].notna().any()]
+        cases = rows[is_case] if level == 'case' else rows.iloc[:0]
+        cases = cases[bands].set_axis(pd.MultiIndex.from_frame(cases[key_columns].astype(object)))
+        buckets = rows[~is_case].set_index(['case_op', 'shape_bucket'])[bands]
+        floors[benchmark_type] = NoiseFloors(cases, buckets, digest)
+
+    return floors
+
+def noise_thresholds(merged, floors, threshold=5.0):
+    """
+    Per-row execution time and memory thresholds for a merged comparison frame.
+
+    Each case's threshold is the larger of the global threshold and its noise band. Cases
+    are looked up by the table's key columns that the comparison also has; when it has
+    fewer (a JSON-calibrated table against CSV runs), the widest band of the matching
+    table rows applies. Cases missing from the table use their (case_op, shape_bucket)
+    band, and cases in no calibrated bucket keep the global threshold.
+
+    Args:
+        merged: Merged comparison frame with Case Name, the _baseline key columns and
+            case_* fields
+        floors: NoiseFloors of the frame's benchmark type
+        threshold: Global threshold percentage
+
+    Returns:
+        (execution time thresholds, memory thresholds) float64 arrays
+    """
+    cases = floors.cases
+    key_columns = [column for column in cases.index.names if merged_key_column(column) in merged.columns]
+    if len(key_columns) < cases.index.nlevels or not cases.index.is_unique:
+        cases = cases.groupby(level=key_columns, sort=False, dropna=False).max()
+        cases.index = pd.MultiIndex.from_frame(cases.index.to_frame(index=False))
+    case_bands = cases.reindex(pd.MultiIndex.from_arrays(
+        [merged[merged_key_column(column)].astype(object).to_numpy() for column in key_columns],
+        names=key_columns
+    ))
+    case_op, shape_bucket = noise_bucket_keys(merged)
+    bucket_bands = floors.buckets.reindex(pd.MultiIndex.from_arrays([case_op, shape_bucket]))
+
+    thresholds = []
+    for column in NOISE_METRICS.values():
+        band = case_bands[column].to_numpy(dtype=np.float64)
+        band = np.where(np.isnan(band), bucket_bands[column].to_numpy(dtype=np.float64), band)
+        thresholds.append(np.fmax(band, threshold))
+    return tuple(thresholds)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Phase profiling for the comparison tool (see --profile).
+Records wall time, RSS change, the process-wide peak RSS and row counts per phase and
+writes them as JSON.
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Profile of the current run, or None when profiling is off
+_active_profile = None
+
+def peak_rss_mb():
+    """Return the peak resident set size of this process in MB, or None if unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KB elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def current_rss_mb():
+    """Return the current resident set size of this process in MB, or None if unavailable (non-Linux)."""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+def start_profile():
+    """Start recording phases for this run."""
+    global _active_profile
+    _active_profile = {
+        'start_counter': time.perf_counter(),
+        'phases': []
+    }
+
+@contextmanager
+def profile_phase(name, **counts):
+    """
+    Time a phase of the run; a no-op unless start_profile was called.
+
+    Yields a dict the caller can add counts to (e.g. record['rows'] = len(df)).
+    Nested phases are recorded with their full dotted name, e.g. "load.read".
+
+    rss_delta_mb is the change in current RSS over the phase (memory the phase kept, which
+    is negative when it freed more than it allocated; None where the current RSS cannot be
+    read). process_peak_rss_mb is the process-wide high-water mark at the end of the phase,
+    so it only grows from phase to phase.
+    """
+    record = dict(counts)
+    if _active_profile is None:
+        yield record
+        return
+
+    parent = _active_profile.get('current')
+    full_name = f"{parent}.{name}" if parent else name
+    _active_profile['current'] = full_name
+    start_rss = current_rss_mb()
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        _active_profile['current'] = parent
+        end_rss = current_rss_mb()
+        _active_profile['phases'].append({
+            'phase': full_name,
+            'wall_s': round(time.perf_counter() - start, 6),
+            'rss_delta_mb': round(end_rss - start_rss, 3) if start_rss is not None and end_rss is not None else None,
+            'process_peak_rss_mb': peak_rss_mb(),
+            **record
+        })
+
+def finish_profile(output_file, argv=None):
+    """
+    Stop recording and write the profile as JSON.
+
+    Args:
+        output_file: Path of the JSON file
+        argv: Command line of the run, stored for reference
+
+    Returns:
+        The profile dict that was written, or None if profiling was off
+    """
+    global _active_profile
+    if _active_profile is None:
+        return None
+
+    profile = {
+        'argv': list(argv) if argv is not None else sys.argv[1:],
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'total_wall_s': round(time.perf_counter() - _active_profile['start_counter'], 6),
+        'peak_rss_mb': peak_rss_mb(),
+        'phases': _active_profile['phases']
+    }
+    _active_profile = None
+
+    with open(output_file, 'w') as f:
+        json.dump(profile, f, indent=2)
+    return profile
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Cluster regressed cases and pick a few representatives to re-run (see --rerun-manifest).
+When hundreds of cases regress together, e.g. every matmul backward variant, re-running one
+representative per cluster confirms the regression at a fraction of the cost of a full
+re-sweep. Clusters whose representative does not reproduce can be bisected from their
+member lists.
+"""
+
+import math
+import numbers
+
+from case_names import CASE_FIELD_COLUMNS, parse_case_name_fields, unique_case_names
+from lazy_imports import lazy_import
+from roofline import SHAPE_BUCKET_EDGES, SHAPE_BUCKET_LABELS, estimate_case_work, regime_band
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Bands over the worst flagged change of a case, each about an order of magnitude wide
+MAGNITUDE_BAND_EDGES = [-math.inf, 25, 100, 1000, math.inf]
+MAGNITUDE_BAND_LABELS = ['<25%', '25-100%', '100-1000%', '>1000%']
+
+# --cluster-by choices and the cluster key column each adds; benchmark_type is always a key
+CLUSTER_FIELDS = {
+    'op': 'case_op',
+    'dtype': 'case_dtype',
+    'backward': 'direction',
+    'shape': 'shape_bucket',
+    'magnitude': 'magnitude_band'
+}
+
+# Columns of the regression report copied into the manifest entries when present
+MANIFEST_CASE_COLUMNS = [
+    'Case Name',
+    'Benchmarking Module Name_baseline',
+    'source_file_baseline',
+    'execution_time_change_pct',
+    'memory_change_pct'
+]
+
+def cluster_key_columns(cluster_by=tuple(CLUSTER_FIELDS)):
+    """Cluster key columns for a list of CLUSTER_FIELDS names."""
+    unknown = [field for field in cluster_by if field not in CLUSTER_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown cluster fields: {', '.join(unknown)}")
+    return ['benchmark_type'] + [CLUSTER_FIELDS[field] for field in CLUSTER_FIELDS if field in cluster_by]
+
+def cluster_regressions(regression_report, benchmark_type, cluster_by=tuple(CLUSTER_FIELDS)):
+    """
+    Assign every regressed case to a cluster of similar regressions.
+
+    By default cases cluster by op, dtype, direction (forward, or any backward variant),
+    FLOP bucket of their shape and the magnitude band of their worst flagged change
+    (execution time or memory). The case_* fields the loader parsed are reused when the
+    report carries them. Names that do not parse keep their suffix-stripped unique case as
+    op, so they never merge with unrelated benchmarks.
+
+    Args:
+        regression_report: Regression report frame (see build_regression_report)
+        benchmark_type: "eager" or "compile"
+        cluster_by: CLUSTER_FIELDS names making up the cluster key
+
+    Returns:
+        Copy of the report with the CLUSTER_FIELDS columns, cluster (a group number),
+        unique_case and change_pct added
+    """
+    clustered = regression_report.reset_index(drop=True)
+    if all(column in clustered.columns for column in CASE_FIELD_COLUMNS):
+        fields = clustered[CASE_FIELD_COLUMNS]
+    else:
+        # Reports read back from CSV (streaming mode) carry no parsed fields
+        fields = parse_case_name_fields(clustered['Case Name'])
+    unique_case = unique_case_names(clustered['Case Name'])
+    flops, _ = estimate_case_work(fields)
+
+    change = clustered['execution_time_change_pct'].to_numpy(dtype=np.float64)
+    if 'memory_change_pct' in clustered.columns:
+        change = np.fmax(change, clustered['memory_change_pct'].to_numpy(dtype=np.float64))
+
+    clustered = clustered.assign(
+        benchmark_type=benchmark_type,
+        case_op=fields['case_op'].astype(object).fillna(unique_case),
+        case_dtype=fields['case_dtype'].astype(object).fillna('unparsed'),
+        direction=np.where(fields['case_bwd'].isna().to_numpy(), 'forward', 'backward'),
+        shape_bucket=regime_band(flops, SHAPE_BUCKET_EDGES, SHAPE_BUCKET_LABELS, clustered.index),
+        magnitude_band=regime_band(change, MAGNITUDE_BAND_EDGES, MAGNITUDE_BAND_LABELS, clustered.index),
+        unique_case=unique_case,
+        change_pct=change
+    )
+    clustered['cluster'] = clustered.groupby(cluster_key_columns(cluster_by), sort=False, dropna=False).ngroup()
+    return clustered
+
+def select_representatives(clustered, per_cluster=1):
+    """
+    Pick up to per_cluster representatives of every cluster.
+
+    Each unique case (shape without dtype, backward and transpose suffixes) is represented
+    by its variant closest to the cluster's median change, and the most typical unique
+    cases win, so several representatives of one cluster always cover different shapes.
+
+    Args:
+        clustered: Output of cluster_regressions
+        per_cluster: Representatives kept per cluster
+
+    Returns:
+        DataFrame of the representatives, in cluster order
+    """
+    if per_cluster < 1:
+        raise ValueError("--rerun-per-cluster must be at least 1")
+
+    median = clustered.groupby('cluster', sort=False)['change_pct'].transform('median')
+    clustered = clustered.assign(distance=(clustered['change_pct'] - median).abs())
+
+    # NaN distances (no finite change) sort last
+    ordered = clustered.sort_values(['cluster', 'distance'], kind='stable', na_position='last')
+    ordered = ordered[~ordered.duplicated(['cluster', 'unique_case'])]
+    return ordered.groupby('cluster', sort=False).head(per_cluster).drop(columns='distance')
+
+def json_value(value):
+    """value, or None for NaN and infinities, which strict JSON has no literal for."""
+    if isinstance(value, numbers.Real) and not math.isfinite(value):
+        return None
+    return value
+
+def manifest_records(frame):
+    """Manifest entries of the report rows in frame; missing and non-finite values become None."""
+    columns = [column for column in MANIFEST_CASE_COLUMNS if column in frame.columns]
+    records = frame[columns].astype(object)
+    records = records.where(records.notna(), None).to_dict(orient='records')
+    return [{column: json_value(value) for column, value in record.items()} for record in records]
+
+def build_rerun_manifest(reports_by_type, threshold, per_cluster=1, cluster_by=tuple(CLUSTER_FIELDS)):
+    """
+    Build the re-run manifest of one comparison.
+
+    Args:
+        reports_by_type: Dict mapping benchmark type to its regression report frame
+        threshold: Regression threshold percentage, recorded in the manifest
+        per_cluster: Representatives kept per cluster
+        cluster_by: CLUSTER_FIELDS names making up the cluster key
+
+    Returns:
+        Dict with the totals, the flat rerun_cases list and one clusters entry per
+        cluster (key fields, size, median and worst change, representatives and all
+        members, worst first, for bisecting clusters that do not reproduce). Changes
+        without a finite value (a zero baseline) are None, so the dict is strict JSON
+    """
+    key_columns = cluster_key_columns(cluster_by)
+    cases = []
+    clusters = []
+    total_regressions = 0
+
+    for benchmark_type, regression_report in reports_by_type.items():
+        if regression_report is None or len(regression_report) == 0:
+            continue
+        total_regressions += len(regression_report)
+
+        clustered = cluster_regressions(regression_report, benchmark_type, cluster_by)
+        representatives = select_representatives(clustered, per_cluster)
+        members = clustered.sort_values(['cluster', 'change_pct'], ascending=[True, False], kind='stable')
+
+        summary = members.groupby('cluster', sort=False).agg(
+            size=('change_pct', 'size'),
+            median_change_pct=('change_pct', 'median'),
+            worst_change_pct=('change_pct', 'max'),
+            **{column: (column, 'first') for column in key_columns}
+        )
+        summary = summary.sort_values(['size', 'worst_change_pct'], ascending=False, kind='stable')
+
+        # Largest clusters first; they save the most re-runs
+        representatives_by_cluster = dict(tuple(representatives.groupby('cluster', sort=False)))
+        members_by_cluster = dict(tuple(members.groupby('cluster', sort=False)))
+        for number, row in enumerate(summary.reset_index().to_dict(orient='records'), 1):
+            cluster = row['cluster']
+            cluster_id = f"{benchmark_type}-{number:04d}"
+            chosen = representatives_by_cluster[cluster]
+            for record in manifest_records(chosen):
+                cases.append({'benchmark_type': benchmark_type, 'cluster': cluster_id, **record})
+            clusters.append({
+                'cluster': cluster_id,
+                **{column: row[column] for column in key_columns},
+                'size': int(row['size']),
+                'median_change_pct': json_value(float(row['median_change_pct'])),
+                'worst_change_pct': json_value(float(row['worst_change_pct'])),
+                'representatives': chosen['Case Name'].tolist(),
+                'members': members_by_cluster[cluster]['Case Name'].tolist()
+            })
+
+    return {
+        'threshold': threshold,
+        'per_cluster': per_cluster,
+        'cluster_by': [field for field in CLUSTER_FIELDS if field in cluster_by],
+        'total_regressions': total_regressions,
+        'total_clusters': len(clusters),
+        'rerun_count': len(cases),
+        'rerun_fraction': len(cases) / total_regressions if total_regressions else 0.0,
+        'rerun_cases': cases,
+        'clusters': clusters
+    }
@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""
+Render the summary reports (--generate-markdown, --generate-html) from comparison stats.
+Reports are assembled from parts into precompiled templates, and every list and table is
+capped so the output stays a readable size however many cases regress.
+"""
+
+import html
+import os
+from string import Template
+from typing import NamedTuple
+
+from benchmark_common import full_comparison_file
+from case_names import extract_unique_cases
+from lazy_imports import lazy_import
+from roofline import REGIME_COLUMNS, describe_regimes, format_regime_table
+
+pd = lazy_import('pandas')
+
+class ReportOptions(NamedTuple):
+    """Size limits of the summary reports."""
+    top_k: int = 5
+    max_cases: int = 100
+    max_rows: int = 1000
+    top_regimes: int = 10
+    collapse: bool = False
+
+# Regressions above this percentage are called out first in the recommendations
+EXTREME_REGRESSION_PCT = 1000
+
+# Operations named in the recommendations, most regressions first
+RECOMMENDED_OPS = 3
+
+MARKDOWN_TEMPLATE = Template("""# PyTorch Benchmark Regression Analysis: Baseline vs New
+
+## Executive Summary
+
+This report analyzes performance regressions between baseline and new versions based on operator microbenchmarks. The analysis identifies benchmarks where performance degraded by more than ${threshold}% between versions.
+
+## Key Findings
+
+### Overall Statistics
+- **Total matching benchmarks**: $total_matching ($eager_matching eager + $compile_matching compile)
+- **Total regressions found**: $total_regressions ($eager_regressions eager + $compile_regressions compile)
+- **Regression rate**: ${regression_rate}% of benchmarks show performance degradation > ${threshold}%
+
+### Eager Benchmarks (Non-Compile)
+$eager_findings
+### Compile Benchmarks
+$compile_findings
+## Top Performance Regressions
+
+### Eager Benchmarks - Top $top_k Execution Time Regressions
+$eager_top
+
+### Compile Benchmarks - Top $top_k Execution Time Regressions
+$compile_top
+
+## Analysis by Operation Type
+
+Throughput is estimated from the shapes encoded in the case names: FLOPs and bytes moved per case, divided by the measured execution time. Geomean time change is over all matching cases of a group; positive means slower.
+$regime_analysis
+### Memory Usage Patterns
+$memory_patterns
+
+## Recommendations
+
+$recommendations
+
+## Files Generated
+
+$files_generated
+
+## Methodology
+
+- Compared execution time and peak memory usage between baseline and new versions
+- Identified regressions where performance degraded by more than ${threshold}%
+- Separated analysis for eager vs compile benchmarks to ensure fair comparison
+- Used percentage change formula: ((new_value - old_value) / old_value) * 100
+
+## Unique Cases Summary
+
+This section shows the unique benchmark cases (without dtype and other suffixes) that have regressions.
+
+### Eager Benchmark Unique Cases ($eager_unique_count unique)
+$eager_unique
+
+### Compile Benchmark Unique Cases ($compile_unique_count unique)
+$compile_unique
+
+### All Unique Cases Combined ($all_unique_count unique)
+$all_unique
+
+## Next Steps
+
+1. Investigate the most severe regressions (>50% performance degradation)
+2. Analyze patterns in backward pass operations
+3. Review compile benchmark performance issues
+4. Consider reverting or optimizing specific operations showing consistent regressions
+5. Focus optimization efforts on the $all_unique_count unique cases identified above
+""")
+
+FINDINGS_TEMPLATE = Template("""- **Matching benchmarks**: $matching
+- **Regressions found**: $regressions (${rate}% regression rate)
+- **Execution time regressions**: $execution_regressions
+- **Memory regressions**: $memory_regressions
+- **Worst execution time regression**: ${max_exec_time_regression}%
+- **Worst memory regression**: ${max_memory_regression}%
+""")
+
+HTML_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>PyTorch Benchmark Regression Analysis</title>
+<style>
+body { font-family: system-ui, sans-serif; margin: 2em; color: #222; }
+table { border-collapse: collapse; margin: 0.5em 0 1.5em; font-size: 0.9em; }
+th, td { border: 1px solid #ccc; padding: 0.25em 0.6em; text-align: left; }
+td.num { text-align: right; font-variant-numeric: tabular-nums; }
+th { background: #f0f0f0; cursor: pointer; user-select: none; }
+th[aria-sort="ascending"]::after { content: " \\25B2"; }
+th[aria-sort="descending"]::after { content: " \\25BC"; }
+code { font-size: 0.95em; }
+.note { color: #666; }
+</style>
+</head>
+<body>
+<h1>PyTorch Benchmark Regression Analysis: Baseline vs New</h1>
+<p>Benchmarks whose execution time or peak memory degraded by more than ${threshold}% between versions. Click a column header to sort.</p>
+<h2>Overall Statistics</h2>
+$summary_table
+$sections
+<script>
+document.querySelectorAll("table.sortable th").forEach(function (header) {
+  header.addEventListener("click", function () {
+    var table = header.closest("table");
+    var body = table.tBodies[0];
+    var column = header.cellIndex;
+    var ascending = header.getAttribute("aria-sort") !== "ascending";
+    table.querySelectorAll("th").forEach(function (th) { th.removeAttribute("aria-sort"); });
+    header.setAttribute("aria-sort", ascending ? "ascending" : "descending");
+    function key(row) {
+      var cell = row.cells[column];
+      var value = cell.getAttribute("data-value");
+      if (value === null) { return cell.textContent; }
+      value = parseFloat(value);
+      return isNaN(value) ? -Infinity : value;
+    }
+    var rows = Array.prototype.slice.call(body.rows);
+    rows.sort(function (a, b) {
+      var x = key(a), y = key(b);
+      var order = typeof x === "number" ? x - y : x.localeCompare(y);
+      return ascending ? order : -order;
+    });
+    rows.forEach(function (row) { body.appendChild(row); });
+  });
+});
+</script>
+</body>
+</html>
+""")
+
+# Columns of a regression report shown in the HTML tables, with their headers and number formats
+HTML_REGRESSION_COLUMNS = {
+    'Case Name': ('Case Name', None),
+    'Benchmarking Module Name_baseline': ('Module', None),
+    'Execution Time_baseline': ('Time (baseline)', '{:,.3f}'),
+    'Execution Time_new': ('Time (new)', '{:,.3f}'),
+    'execution_time_change_pct': ('Time Change %', '{:+,.2f}'),
+    'Peak Memory (KB)_baseline': ('Peak KB (baseline)', '{:,.0f}'),
+    'Peak Memory (KB)_new': ('Peak KB (new)', '{:,.0f}'),
+    'memory_change_pct': ('Memory Change %', '{:+,.2f}'),
+}
+
+HTML_REGIME_COLUMNS = {
+    'case_op': ('Op', None),
+    'case_dtype': ('Dtype', None),
+    'shape_bucket': ('Shape Bucket', None),
+    'intensity_band': ('Intensity', None),
+    'cases': ('Cases', '{:,.0f}'),
+    'regressions': ('Regressions', '{:,.0f}'),
+    'regression_rate_pct': ('Regression Rate %', '{:.1f}'),
+    'geomean_time_change_pct': ('Geomean Time Change %', '{:+.2f}'),
+    'worst_change_pct': ('Worst %', '{:+.2f}'),
+    'tflops_baseline': ('TFLOP/s (baseline)', '{:.2f}'),
+    'tflops_new': ('TFLOP/s (new)', '{:.2f}'),
+    'gbps_baseline': ('GB/s (baseline)', '{:.1f}'),
+    'gbps_new': ('GB/s (new)', '{:.1f}'),
+}
+
+def validate_report_options(options):
+    """Raise ValueError for negative limits."""
+    for name in ('top_k', 'max_cases', 'max_rows', 'top_regimes'):
+        if getattr(options, name) < 0:
+            raise ValueError(f"Report option {name} must not be negative")
+
+def collapsible(body, summary, collapse):
+    """Wrap a markdown or HTML block in <details> when sections are collapsed."""
+    if not collapse:
+        return body
+    return f"<details>\n<summary>{summary}</summary>\n\n{body}\n</details>\n"
+
+def rate(part, whole):
+    """Percentage of part in whole, 0 for an empty whole."""
+    return (part / whole * 100) if whole > 0 else 0
+
+def regression_cases(stats):
+    """Case names of a stats dict's regression report (empty without regressions)."""
+    report = stats.get('regression_report')
+    if report is None or len(report) == 0:
+        return []
+    return report['Case Name'].tolist()
+
+def format_top_regressions(stats, top_k):
+    """Numbered markdown list of the top_k execution time regressions."""
+    report = stats.get('regression_report')
+    if report is None or len(report) == 0 or top_k == 0:
+        return "No regressions found."
+
+    top = report.head(top_k)
+    return '\n'.join(
+        f"{rank}. `{case_name}`: {change:.2f}%"
+        for rank, (case_name, change) in enumerate(
+            zip(top['Case Name'].tolist(), top['execution_time_change_pct'].tolist()), 1
+        )
+    )
+
+def format_case_list(cases, max_cases, collapse):
+    """Markdown bullet list of unique cases, capped at max_cases entries (0 = no cap)."""
+    if not cases:
+        return "No regressions found."
+
+    shown = cases[:max_cases] if max_cases else cases
+    parts = [f"- `{case}`" for case in shown]
+    if len(shown) < len(cases):
+        parts.append(f"- ... and {len(cases) - len(shown):,} more (see the regression report CSVs)")
+    return collapsible('\n'.join(parts), f"{len(cases):,} cases", collapse).rstrip('\n')
+
+def format_regime_analysis(eager_stats, compile_stats, top_regimes=10, collapse=False):
+    """Render per-operation and most-affected-regime tables for the markdown report."""
+    sections = []
+
+    for label, stats in (('Eager', eager_stats), ('Compile', compile_stats)):
+        partials = stats.get('regime_partials')
+        if partials is None or len(partials) == 0:
+            sections.append(f"\n### {label} Benchmarks by Operation\nNo shape information available.\n")
+            continue
+
+        by_op = describe_regimes(partials, ['case_op'])
+        regimes = describe_regimes(partials, REGIME_COLUMNS)
+        regimes = regimes[regimes['regressions'] > 0]
+
+        sections.append(f"\n### {label} Benchmarks by Operation\n\n")
+        sections.append(collapsible('\n'.join(format_regime_table(by_op)) + '\n',
+                                    f"{len(by_op):,} operations", collapse))
+        sections.append(f"\n### Most Affected Regimes ({label} Benchmarks)\n")
+        if len(regimes) > 0:
+            sections.append(f"Top {min(top_regimes, len(regimes))} of {len(regimes)} op/dtype/shape/intensity "
+                            f"regimes with regressions:\n\n")
+            sections.append(collapsible('\n'.join(format_regime_table(regimes, top_regimes)) + '\n',
+                                        f"{min(top_regimes, len(regimes)):,} regimes", collapse))
+        else:
+            sections.append("No regressions found.\n")
+
+    return ''.join(sections)
+
+def format_memory_patterns(eager_stats, compile_stats):
+    """Memory bullet list of the markdown report, computed from both types' stats."""
+    typed_stats = (('eager', eager_stats), ('compile', compile_stats))
+    counts = {label: stats.get('memory_regressions', 0) for label, stats in typed_stats}
+    total = sum(counts.values())
+
+    if total == 0:
+        lines = ["- No memory regressions found"]
+    else:
+        worst_label, worst_stats = max(
+            ((label, stats) for label, stats in typed_stats if counts[label]),
+            key=lambda item: item[1]['max_memory_regression']
+        )
+        under = sum(stats.get('memory_regressions_under_100', 0) for _, stats in typed_stats)
+        lines = [
+            f"- **Memory regressions**: {total:,} across both benchmark types "
+            f"({counts['eager']:,} eager + {counts['compile']:,} compile)",
+            f"- **Worst memory regression**: {worst_stats['max_memory_regression']:.2f}% ({worst_label})",
+            f"- **Under 100%**: {under:,} of {total:,} memory regressions ({rate(under, total):.1f}%)"
+        ]
+
+    if all('memory_decreases' in stats for _, stats in typed_stats):
+        decreases = sum(stats['memory_decreases'] for _, stats in typed_stats)
+        matching = sum(stats.get('total_matching', 0) for _, stats in typed_stats)
+        lines.append(f"- **Memory decreased**: in {decreases:,} of {matching:,} matching benchmarks "
+                     f"({rate(decreases, matching):.1f}%)")
+
+    return '\n'.join(lines)
+
+def format_recommendations(eager_stats, compile_stats, threshold):
+    """Numbered recommendations of the markdown report, each backed by the comparison stats."""
+    reports = [
+        (label, stats['regression_report']) for label, stats in (('eager', eager_stats), ('compile', compile_stats))
+        if stats.get('regression_report') is not None and len(stats['regression_report']) > 0
+    ]
+    if not reports:
+        return f"No regressions above {threshold}% to investigate."
+
+    recommendations = []
+    total = sum(len(report) for _, report in reports)
+
+    # Reports are sorted worst first, so the first row of each is its worst regression
+    worst_label, worst = max(((label, report.iloc[0]) for label, report in reports),
+                             key=lambda item: item[1]['execution_time_change_pct'])
+    extreme = {label: int((report['execution_time_change_pct'] > EXTREME_REGRESSION_PCT).sum())
+               for label, report in reports}
+    if any(extreme.values()):
+        counts = ' and '.join(f"{count:,} {label}" for label, count in extreme.items() if count)
+        recommendations.append(
+            f"**Priority Investigation**: {counts} regressions exceed {EXTREME_REGRESSION_PCT}%, "
+            f"worst `{worst['Case Name']}` ({worst_label}, {worst['execution_time_change_pct']:.2f}%)"
+        )
+    else:
+        recommendations.append(
+            f"**Priority Investigation**: Start with the worst regression, `{worst['Case Name']}` "
+            f"({worst_label}, {worst['execution_time_change_pct']:.2f}%)"
+        )
+
+    backward = sum(int(report['Case Name'].astype(str).str.endswith('_BACKWARD').sum()) for _, report in reports)
+    if backward:
+        recommendations.append(
+            f"**Backward Pass**: {backward:,} of {total:,} regressions ({rate(backward, total):.1f}%) "
+            f"are backward pass cases"
+        )
+
+    partials = [stats.get('regime_partials') for stats in (eager_stats, compile_stats)]
+    partials = [partial for partial in partials if partial is not None and len(partial) > 0]
+    if partials:
+        by_op = pd.concat([describe_regimes(partial, ['case_op']) for partial in partials])
+        by_op = by_op.groupby('case_op', sort=False)['regressions'].sum()
+        by_op = by_op[by_op > 0].sort_values(ascending=False, kind='stable').head(RECOMMENDED_OPS)
+        if len(by_op) > 0:
+            ops = ', '.join(f"`{op}` ({count:,})" for op, count in by_op.items())
+            recommendations.append(f"**Operations**: Most execution time regressions are in {ops}")
+
+    memory = sum(stats.get('memory_regressions', 0) for stats in (eager_stats, compile_stats))
+    if memory:
+        recommendations.append(f"**Memory**: Review the {memory:,} memory regressions (see Memory Usage Patterns)")
+
+    return '\n'.join(f"{number}. {text}" for number, text in enumerate(recommendations, 1))
+
+def summary_fields(eager_stats, compile_stats, threshold):
+    """Formatted headline numbers shared by the markdown and HTML reports."""
+    eager_matching = eager_stats.get('total_matching', 0)
+    compile_matching = compile_stats.get('total_matching', 0)
+    eager_regressions = eager_stats.get('total_regressions', 0)
+    compile_regressions = compile_stats.get('total_regressions', 0)
+    total_matching = eager_matching + compile_matching
+    total_regressions = eager_regressions + compile_regressions
+
+    return {
+        'threshold': threshold,
+        'total_matching': f"{total_matching:,}",
+        'eager_matching': f"{eager_matching:,}",
+        'compile_matching': f"{compile_matching:,}",
+        'total_regressions': f"{total_regressions:,}",
+        'eager_regressions': f"{eager_regressions:,}",
+        'compile_regressions': f"{compile_regressions:,}",
+        'regression_rate': f"{rate(total_regressions, total_matching):.1f}",
+    }
+
+def format_findings(stats):
+    """Per-type statistics block of the markdown report."""
+    matching = stats.get('total_matching', 0)
+    regressions = stats.get('total_regressions', 0)
+    return FINDINGS_TEMPLATE.substitute(
+        matching=f"{matching:,}",
+        regressions=f"{regressions:,}",
+        rate=f"{rate(regressions, matching):.1f}",
+        execution_regressions=f"{stats.get('execution_regressions', 0):,}",
+        memory_regressions=f"{stats.get('memory_regressions', 0):,}",
+        max_exec_time_regression=f"{stats.get('max_exec_time_regression', 0):.2f}",
+        max_memory_regression=f"{stats.get('max_memory_regression', 0):.2f}"
+    )
+
+def format_files_generated(eager_stats, compile_stats, output_file, output_format):
+    """Files Generated list of the markdown report, named like the files the run wrote."""
+    typed_stats = (('eager', eager_stats), ('compile', compile_stats))
+    lines = []
+    for label, stats in typed_stats:
+        report_file = os.path.basename(output_file.replace('.csv', f'_{label}.csv'))
+        note = "" if stats.get('regression_report') is not None else " (not written, no regressions)"
+        lines.append(f"- `{report_file}`: Detailed regression report for {label} benchmarks{note}")
+    for label, _ in typed_stats:
+        full_file = os.path.basename(full_comparison_file(output_file.replace('.csv', f'_{label}.csv'), output_format))
+        lines.append(f"- `{full_file}`: Complete comparison data for {label} benchmarks")
+    return '\n'.join(lines)
+
+def render_markdown_report(eager_stats, compile_stats, threshold, options=ReportOptions(),
+                           output_file="pytorch_regression_report.csv", output_format="csv"):
+    """
+    Render the markdown summary report.
+
+    Args:
+        eager_stats: Stats dict of the eager comparison (None or {} without regressions)
+        compile_stats: Stats dict of the compile comparison (None or {} without regressions)
+        threshold: Regression threshold percentage
+        options: ReportOptions
+        output_file: --output of the run; the per-type reports and full comparison dumps
+            listed under Files Generated are named after it
+        output_format: --output-format of the full comparison dumps
+
+    Returns:
+        Markdown text
+    """
+    validate_report_options(options)
+    eager_stats = eager_stats or {}
+    compile_stats = compile_stats or {}
+
+    eager_cases = regression_cases(eager_stats)
+    compile_cases = regression_cases(compile_stats)
+    eager_unique_cases = extract_unique_cases(eager_cases)
+    compile_unique_cases = extract_unique_cases(compile_cases)
+    # Stripping is per name, so the combined set is the union of the per-type sets
+    all_unique_cases = sorted(set(eager_unique_cases).union(compile_unique_cases))
+
+    return MARKDOWN_TEMPLATE.substitute(
+        summary_fields(eager_stats, compile_stats, threshold),
+        top_k=options.top_k,
+        eager_findings=format_findings(eager_stats),
+        compile_findings=format_findings(compile_stats),
+        eager_top=format_top_regressions(eager_stats, options.top_k),
+        compile_top=format_top_regressions(compile_stats, options.top_k),
+        regime_analysis=format_regime_analysis(eager_stats, compile_stats, options.top_regimes, options.collapse),
+        memory_patterns=format_memory_patterns(eager_stats, compile_stats),
+        recommendations=format_recommendations(eager_stats, compile_stats, threshold),
+        eager_unique_count=len(eager_unique_cases),
+        compile_unique_count=len(compile_unique_cases),
+        all_unique_count=len(all_unique_cases),
+        eager_unique=format_case_list(eager_unique_cases, options.max_cases, options.collapse),
+        compile_unique=format_case_list(compile_unique_cases, options.max_cases, options.collapse),
+        all_unique=format_case_list(all_unique_cases, options.max_cases, options.collapse),
+        files_generated=format_files_generated(eager_stats, compile_stats, output_file, output_format)
+    )
+
+def html_table(frame, columns, max_rows):
+    """
+    Render a DataFrame as a sortable HTML table.
+
+    Cells are built column by column with vectorized string concatenation rather than
+    per row. Numeric cells carry their raw value in data-value so sorting is numeric.
+
+    Args:
+        frame: DataFrame to render
+        columns: Dict of column name to (header, number format or None for text)
+        max_rows: Rows rendered at most (0 = all)
+
+    Returns:
+        HTML text
+    """
+    columns = {column: spec for column, spec in columns.items() if column in frame.columns}
+    shown = frame.head(max_rows) if max_rows else frame
+
+    headers = ''.join(f"<th>{html.escape(header)}</th>" for header, _ in columns.values())
+    rows = pd.Series('<tr>', index=shown.index, dtype=object)
+    for column, (_, number_format) in columns.items():
+        values = shown[column]
+        if number_format is None:
+            rows += '<td>' + values.astype(str).map(html.escape).astype(object) + '</td>'
+        else:
+            values = values.astype(float)
+            rows += ('<td class="num" data-value="' + values.astype(str).astype(object) + '">'
+                     + values.map(number_format.format).astype(object) + '</td>')
+    rows += '</tr>'
+
+    table = (f'<table class="sortable">\n<thead><tr>{headers}</tr></thead>\n<tbody>\n'
+             + '\n'.join(rows.tolist()) + '\n</tbody>\n</table>\n')
+    if len(shown) < len(frame):
+        table += f'<p class="note">Showing {len(shown):,} of {len(frame):,} rows.</p>\n'
+    return table
+
+def html_summary_table(eager_stats, compile_stats):
+    """Per-type headline statistics as a small HTML table."""
+    summary = pd.DataFrame([{
+        'type': label,
+        'total_matching': stats.get('total_matching', 0),
+        'total_regressions': stats.get('total_regressions', 0),
+        'regression_rate_pct': rate(stats.get('total_regressions', 0), stats.get('total_matching', 0)),
+        'execution_regressions': stats.get('execution_regressions', 0),
+        'memory_regressions': stats.get('memory_regressions', 0),
+        'max_exec_time_regression': stats.get('max_exec_time_regression', 0),
+        'max_memory_regression': stats.get('max_memory_regression', 0),
+    } for label, stats in (('Eager', eager_stats), ('Compile', compile_stats))])
+    return html_table(summary, {
+        'type': ('Type', None),
+        'total_matching': ('Matching', '{:,.0f}'),
+        'total_regressions': ('Regressions', '{:,.0f}'),
+        'regression_rate_pct': ('Regression Rate %', '{:.1f}'),
+        'execution_regressions': ('Time Regressions', '{:,.0f}'),
+        'memory_regressions': ('Memory Regressions', '{:,.0f}'),
+        'max_exec_time_regression': ('Worst Time %', '{:.2f}'),
+        'max_memory_regression': ('Worst Memory %', '{:.2f}'),
+    }, 0)
+
+def html_type_section(label, stats, options):
+    """Regression, operation and unique-case sections of one benchmark type."""
+    parts = [f"<h2>{label} Benchmarks</h2>\n"]
+
+    report = stats.get('regression_report')
+    if report is None or len(report) == 0:
+        parts.append("<p>No regressions found.</p>\n")
+    else:
+        parts.append(f"<h3>Regressions ({len(report):,})</h3>\n")
+        parts.append(html_table(report, HTML_REGRESSION_COLUMNS, options.max_rows))
+
+    partials = stats.get('regime_partials')
+    if partials is not None and len(partials) > 0:
+        parts.append("<h3>By Operation</h3>\n")
+        parts.append(collapsible(html_table(describe_regimes(partials, ['case_op']), HTML_REGIME_COLUMNS, 0),
+                                 "Operations", options.collapse))
+        regimes = describe_regimes(partials, REGIME_COLUMNS)
+        regimes = regimes[regimes['regressions'] > 0]
+        if len(regimes) > 0:
+            parts.append("<h3>Most Affected Regimes</h3>\n")
+            parts.append(collapsible(html_table(regimes, HTML_REGIME_COLUMNS, options.top_regimes),
+                                     "Regimes", options.collapse))
+
+    unique_cases = extract_unique_cases(regression_cases(stats))
+    if unique_cases:
+        shown = unique_cases[:options.max_cases] if options.max_cases else unique_cases
+        items = ''.join(f"<li><code>{html.escape(case)}</code></li>\n" for case in shown)
+        if len(shown) < len(unique_cases):
+            items += f"<li>... and {len(unique_cases) - len(shown):,} more</li>\n"
+        # Long case lists are always folded away in the HTML report
+        parts.append(f"<details>\n<summary>{len(unique_cases):,} unique cases</summary>\n<ul>\n{items}</ul>\n</details>\n")
+
+    return ''.join(parts)
+
+def render_html_report(eager_stats, compile_stats, threshold, options=ReportOptions()):
+    """
+    Render a self-contained HTML summary report with sortable tables.
+
+    Args:
+        eager_stats: Stats dict of the eager comparison (None or {} without regressions)
+        compile_stats: Stats dict of the compile comparison (None or {} without regressions)
+        threshold: Regression threshold percentage
+        options: ReportOptions (max_rows caps each regression table)
+
+    Returns:
+        HTML text
+    """
+    validate_report_options(options)
+    eager_stats = eager_stats or {}
+    compile_stats = compile_stats or {}
+
+    return HTML_TEMPLATE.substitute(
+        threshold=html.escape(str(threshold)),
+        summary_table=html_summary_table(eager_stats, compile_stats),
+        sections=html_type_section('Eager', eager_stats, options) + html_type_section('Compile', compile_stats, options)
+    )
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Roofline-style throughput metrics for operator microbenchmarks.
+Estimates FLOPs and bytes moved from the parsed case_* fields, derives achieved TFLOP/s and
+GB/s per version, and aggregates regressions by op, dtype, shape bucket and arithmetic
+intensity band.
+"""
+
+import math
+
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Bytes per element of the dtypes that appear in case names
+DTYPE_SIZES = {
+    'float64': 8,
+    'float32': 4,
+    'tfloat32': 4,
+    'float16': 2,
+    'bfloat16': 2,
+    'float8_e4m3fn': 1,
+    'float8_e5m2': 1,
+    'int8': 1
+}
+
+# Backward cases run the forward op plus input gradients; each gradient of a matrix product
+# costs about one more product, so one gradient doubles the work and all of them triple it
+BACKWARD_WORK_FACTORS = {'bwdall': 3.0}
+DEFAULT_BACKWARD_WORK_FACTOR = 2.0
+
+# Buckets over estimated FLOPs per case, and bands over FLOPs per byte moved
+SHAPE_BUCKET_EDGES = [0, 1e6, 1e8, 1e10, math.inf]
+SHAPE_BUCKET_LABELS = ['<1 MFLOP', '1-100 MFLOP', '0.1-10 GFLOP', '>10 GFLOP']
+INTENSITY_BAND_EDGES = [0, 1, 10, 100, math.inf]
+INTENSITY_BAND_LABELS = ['<1 FLOP/B', '1-10 FLOP/B', '10-100 FLOP/B', '>100 FLOP/B']
+
+REGIME_COLUMNS = ['case_op', 'case_dtype', 'shape_bucket', 'intensity_band']
+
+THROUGHPUT_COLUMNS = [
+    'flops',
+    'bytes_moved',
+    'arithmetic_intensity',
+    'tflops_baseline',
+    'tflops_new',
+    'gbps_baseline',
+    'gbps_new'
+]
+
+def elementwise_work(batch, m, n, k):
+    """add: M*N*K elements, two reads and one write each."""
+    return m * n * k, 3 * m * n * k
+
+def matmul_work(batch, m, n, k):
+    """mm, matmul and bmm: 2*M*N*K FLOPs per batch; both operands read, the result written."""
+    return batch * (2 * m * n * k), batch * (m * k + k * n + m * n)
+
+def addmm_work(batch, m, n, k):
+    """addmm: one product plus the bias add; the bias is read as well."""
+    return 2 * m * n * k + m * n, m * k + k * n + 2 * m * n
+
+def baddbmm_work(batch, m, n, k):
+    """baddbmm: a batched addmm."""
+    return batch * (2 * m * n * k + m * n), batch * (m * k + k * n + 2 * m * n)
+
+def addbmm_work(batch, m, n, k):
+    """addbmm: batched products summed into one biased result."""
+    return batch * (2 * m * n * k) + m * n, batch * (m * k + k * n) + 2 * m * n
+
+# (FLOPs, elements read and written) per op from the batch size and M, N, K. Each formula
+# is plain arithmetic, so the vectorized and the per-case estimate share it
+OP_WORK_FORMULAS = {
+    'add': elementwise_work,
+    'mm': matmul_work,
+    'matmul': matmul_work,
+    'bmm': matmul_work,
+    'addmm': addmm_work,
+    'baddbmm': baddbmm_work,
+    'addbmm': addbmm_work
+}
+
+def estimate_case_work(case_fields):
+    """
+    Estimate FLOPs and bytes moved per case from the parsed case-name fields.
+
+    Matrix products (mm, matmul, bmm and the add* variants) count 2*M*N*K FLOPs per batch
+    plus the bias add, and read both operands (and bias) once and write the result once.
+    add is elementwise over M*N*K elements with two reads and one write. Unknown ops and
+    dtypes get NaN. See estimate_work for a single case.
+
+    Args:
+        case_fields: DataFrame with case_op, case_B/M/N/K, case_dtype and case_bwd columns
+
+    Returns:
+        (flops, bytes_moved) float64 arrays
+    """
+    op = case_fields['case_op'].astype(object).to_numpy()
+    batch = case_fields['case_B'].astype('Float64').fillna(1).to_numpy(dtype=np.float64, na_value=np.nan)
+    m, n, k = (
+        case_fields[f'case_{dimension}'].astype('Float64').to_numpy(dtype=np.float64, na_value=np.nan)
+        for dimension in ('M', 'N', 'K')
+    )
+
+    # Evaluate every distinct formula once over all cases and pick per op
+    ops_by_formula = {}
+    for name, formula in OP_WORK_FORMULAS.items():
+        ops_by_formula.setdefault(formula, []).append(name)
+    conditions = [np.logical_or.reduce([op == name for name in names]) for names in ops_by_formula.values()]
+    work = [formula(batch, m, n, k) for formula in ops_by_formula]
+    flops = np.select(conditions, [formula_flops for formula_flops, _ in work], default=np.nan)
+    elements = np.select(conditions, [formula_elements for _, formula_elements in work], default=np.nan)
+
+    element_size = case_fields['case_dtype'].astype(object).map(DTYPE_SIZES).to_numpy(dtype=np.float64, na_value=np.nan)
+    backward = case_fields['case_bwd'].astype(object)
+    work_factor = np.where(
+        backward.isna(),
+        1.0,
+        backward.map(BACKWARD_WORK_FACTORS).fillna(DEFAULT_BACKWARD_WORK_FACTOR).to_numpy(dtype=np.float64)
+    )
+
+    return flops * work_factor, elements * element_size * work_factor
+
+def estimate_work(op, batch, m, n, k, dtype, backward_variant):
+    """
+    estimate_case_work for a single case, on plain floats.
+
+    Args:
+        op, dtype, backward_variant: Parsed case-name fields (None when absent)
+        batch, m, n, k: Shape fields as floats; batch 1.0 and NaN for missing dimensions
+
+    Returns:
+        (flops, bytes_moved) floats
+    """
+    formula = OP_WORK_FORMULAS.get(op)
+    flops, elements = formula(batch, m, n, k) if formula is not None else (math.nan, math.nan)
+    element_size = DTYPE_SIZES.get(dtype, math.nan)
+    if backward_variant is None:
+        work_factor = 1.0
+    else:
+        work_factor = BACKWARD_WORK_FACTORS.get(backward_variant, DEFAULT_BACKWARD_WORK_FACTOR)
+    return flops * work_factor, elements * element_size * work_factor
+
+def add_throughput_columns(merged):
+    """
+    Add THROUGHPUT_COLUMNS to a merged comparison frame in place.
+
+    Execution times are in microseconds; cases without a work estimate or with a
+    non-positive time get NaN throughput.
+
+    Args:
+        merged: Merged comparison frame with case_* fields and _baseline/_new execution times
+
+    Returns:
+        The same DataFrame, for chaining
+    """
+    if 'case_op' not in merged.columns:
+        return merged
+
+    flops, bytes_moved = estimate_case_work(merged)
+    merged['flops'] = flops
+    merged['bytes_moved'] = bytes_moved
+    with np.errstate(divide='ignore', invalid='ignore'):
+        merged['arithmetic_intensity'] = flops / bytes_moved
+        microseconds = {}
+        for side in ('baseline', 'new'):
+            times = merged[f'Execution Time_{side}'].to_numpy(dtype=np.float64)
+            microseconds[side] = np.where(times > 0, times, np.nan)
+            merged[f'tflops_{side}'] = flops / microseconds[side] / 1e6
+        for side in ('baseline', 'new'):
+            merged[f'gbps_{side}'] = bytes_moved / microseconds[side] / 1e3
+
+    return merged
+
+def regime_band(values, edges, labels, index):
+    """Label values with the half-open band [edge, next edge) they fall in, 'unknown' for NaN."""
+    bands = pd.cut(values, edges, labels=labels, right=False)
+    return pd.Series(bands, index=index).astype(object).fillna('unknown')
+
+def regime_partials(comparison_df):
+    """
+    Sum per-regime counts, FLOPs, bytes and times over a flagged comparison frame.
+
+    The sums are additive, so partials of disjoint partitions can be combined with
+    combine_regime_partials before describe_regimes derives rates and throughputs.
+
+    Returns:
+        DataFrame indexed by REGIME_COLUMNS, or None if the frame has no throughput columns
+    """
+    if 'flops' not in comparison_df.columns:
+        return None
+
+    flops = comparison_df['flops'].to_numpy(dtype=np.float64)
+    bytes_moved = comparison_df['bytes_moved'].to_numpy(dtype=np.float64)
+    baseline_time = comparison_df['Execution Time_baseline'].to_numpy(dtype=np.float64)
+    new_time = comparison_df['Execution Time_new'].to_numpy(dtype=np.float64)
+
+    timed = (baseline_time > 0) & (new_time > 0)
+    measured = timed & np.isfinite(flops) & np.isfinite(bytes_moved)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_ratio = np.log(new_time / baseline_time)
+        intensity = flops / bytes_moved
+
+    keys = [
+        comparison_df['case_op'].astype(object).fillna('unparsed'),
+        comparison_df['case_dtype'].astype(object).fillna('unparsed'),
+        regime_band(flops, SHAPE_BUCKET_EDGES, SHAPE_BUCKET_LABELS, comparison_df.index),
+        regime_band(intensity, INTENSITY_BAND_EDGES, INTENSITY_BAND_LABELS, comparison_df.index)
+    ]
+    values = pd.DataFrame({
+        'cases': np.ones(len(comparison_df), dtype=np.int64),
+        'regressions': comparison_df['execution_time_regression'].to_numpy(dtype=np.int64),
+        'log_time_ratio': np.where(timed, log_ratio, 0.0),
+        'timed_cases': timed.astype(np.int64),
+        'flops': np.where(measured, flops, 0.0),
+        'bytes_moved': np.where(measured, bytes_moved, 0.0),
+        'seconds_baseline': np.where(measured, baseline_time, 0.0) * 1e-6,
+        'seconds_new': np.where(measured, new_time, 0.0) * 1e-6,
+        'worst_change_pct': comparison_df['execution_time_change_pct'].to_numpy(dtype=np.float64)
+    }, index=comparison_df.index)
+
+    grouped = values.groupby(keys, sort=False)
+    partials = grouped.sum()
+    partials['worst_change_pct'] = grouped['worst_change_pct'].max()
+    partials.index.names = REGIME_COLUMNS
+    return partials
+
+def combine_regime_partials(partials):
+    """Combine regime_partials of disjoint partitions into one partial frame (None if empty)."""
+    partials = [partial for partial in partials if partial is not None and len(partial) > 0]
+    if not partials:
+        return None
+
+    combined = pd.concat(partials)
+    grouped = combined.groupby(level=REGIME_COLUMNS, sort=False)
+    result = grouped.sum()
+    result['worst_change_pct'] = grouped['worst_change_pct'].max()
+    return result
+
+def describe_regimes(partials, by=REGIME_COLUMNS):
+    """
+    Roll regime partials up to the given key columns and derive rates and throughputs.
+
+    Args:
+        partials: Output of regime_partials or combine_regime_partials
+        by: Subset of REGIME_COLUMNS to group by
+
+    Returns:
+        DataFrame with the key columns, cases, regressions, regression_rate_pct,
+        geomean_time_change_pct, worst_change_pct and aggregate TFLOP/s and GB/s per
+        version, sorted by regressions and then by geomean slowdown
+    """
+    grouped = partials.groupby(level=list(by), sort=False)
+    summary = grouped.sum()
+    summary['worst_change_pct'] = grouped['worst_change_pct'].max()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        summary['regression_rate_pct'] = summary['regressions'] / summary['cases'] * 100
+        summary['geomean_time_change_pct'] = np.expm1(summary['log_time_ratio'] / summary['timed_cases']) * 100
+        for side in ('baseline', 'new'):
+            seconds = summary[f'seconds_{side}'].where(summary[f'seconds_{side}'] > 0)
+            summary[f'tflops_{side}'] = summary['flops'] / seconds / 1e12
+            summary[f'gbps_{side}'] = summary['bytes_moved'] / seconds / 1e9
+
+    summary = summary.reset_index().sort_values(
+        ['regressions', 'geomean_time_change_pct'],
+        ascending=False,
+        kind='stable'
+    )
+    return summary[list(by) + [
+        'cases',
+        'regressions',
+        'regression_rate_pct',
+        'geomean_time_change_pct',
+        'worst_change_pct',
+        'tflops_baseline',
+        'tflops_new',
+        'gbps_baseline',
+        'gbps_new'
+    ]].reset_index(drop=True)
+
+def format_regime_table(summary, limit=None):
+    """Render a describe_regimes frame as markdown table lines."""
+    if limit is not None:
+        summary = summary.head(limit)
+
+    key_columns = [column for column in REGIME_COLUMNS if column in summary.columns]
+    headers = {
+        'case_op': 'Op',
+        'case_dtype': 'Dtype',
+        'shape_bucket': 'Shape Bucket',
+        'intensity_band': 'Intensity'
+    }
+    lines = [
+        '| ' + ' | '.join(headers[column] for column in key_columns)
+        + ' | Regressions | Geomean Time Change | Worst | TFLOP/s (baseline → new) | GB/s (baseline → new) |',
+        '|' + '---|' * (len(key_columns) + 5)
+    ]
+
+    for row in summary.itertuples(index=False):
+        row = row._asdict()
+        keys = ' | '.join(str(row[column]) for column in key_columns)
+        lines.append(
+            f"| {keys} | {row['regressions']:,}/{row['cases']:,} ({row['regression_rate_pct']:.1f}%) "
+            f"| {row['geomean_time_change_pct']:+.2f}% | {row['worst_change_pct']:+.2f}% "
+            f"| {row['tflops_baseline']:.2f} → {row['tflops_new']:.2f} "
+            f"| {row['gbps_baseline']:.1f} → {row['gbps_new']:.1f} |"
+        )
+
+    return lines
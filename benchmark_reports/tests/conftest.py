@@ -0,0 +1,92 @@
+"""
+Shared fixtures. The scripts import each other by bare module name, so the script
+directory goes on sys.path like it is when they run directly.
+"""
+
+import csv
+import glob
+import os
+import shutil
+import sys
+
+import pytest
+
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPT_DIR)
+
+from benchmark_common import CSV_COLUMNS
+
+# Checked-in sample exports of two PyTorch versions
+BASELINE_DIR = os.path.join(SCRIPT_DIR, 'pytorch8')
+NEW_DIR = os.path.join(SCRIPT_DIR, 'pytorch9')
+
+def write_benchmark_csv(path, rows):
+    """Write rows of (module, case name, run_backward, execution time, peak memory) as a benchmark CSV."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        for module, case_name, run_backward, execution_time, peak_memory in rows:
+            writer.writerow(['PyTorch', module, case_name, 'long', run_backward, execution_time, peak_memory])
+
+@pytest.fixture
+def run_main(monkeypatch, capsys):
+    """Run compare_pytorch_benchmarks.main with the given arguments; returns (exit code, stdout)."""
+    import compare_pytorch_benchmarks
+
+    def run(*args):
+        monkeypatch.setattr(sys, 'argv', ['compare_pytorch_benchmarks.py', *map(str, args)])
+        code = compare_pytorch_benchmarks.main()
+        return code, capsys.readouterr().out
+
+    return run
+
+# Written identically by every mode; the full dumps hold the same rows in partition order
+IDENTICAL_OUTPUTS = [
+    'report_eager.csv',
+    'report_compile.csv',
+    'report_summary_report.md',
+    'report_rerun_manifest.json'
+]
+FULL_DUMPS = ['report_eager_full_comparison.csv', 'report_compile_full_comparison.csv']
+
+@pytest.fixture
+def input_dirs(tmp_path):
+    """Copies of the sample CSVs, so tests can change and delete files."""
+    copies = []
+    for source in (BASELINE_DIR, NEW_DIR):
+        directory = tmp_path / os.path.basename(source)
+        directory.mkdir()
+        for csv_file in glob.glob(os.path.join(source, '*.csv')):
+            shutil.copy(csv_file, directory)
+        copies.append(directory)
+    return copies
+
+def run_mode(run_main, input_dirs, output_dir, *args):
+    """Compare the input copies into output_dir with markdown and manifest; returns stdout."""
+    os.makedirs(output_dir, exist_ok=True)
+    code, stdout = run_main('--baseline-dir', input_dirs[0], '--new-dir', input_dirs[1], '--no-cache',
+                            '--fast-path-max-rows', 0, '--generate-markdown', '--rerun-manifest',
+                            '--output', os.path.join(output_dir, 'report.csv'), *args)
+    assert code == 0, stdout
+    return stdout
+
+def read_bytes(directory, name):
+    with open(os.path.join(directory, name), 'rb') as f:
+        return f.read()
+
+def assert_same_reports(expected_dir, actual_dir):
+    """Reports match byte for byte; full dumps match up to row order."""
+    for name in IDENTICAL_OUTPUTS:
+        assert read_bytes(actual_dir, name) == read_bytes(expected_dir, name), name
+    for name in FULL_DUMPS:
+        expected = read_bytes(expected_dir, name).splitlines()
+        actual = read_bytes(actual_dir, name).splitlines()
+        assert actual[0] == expected[0], name
+        assert sorted(actual[1:]) == sorted(expected[1:]), name
+
+@pytest.fixture
+def in_memory_dir(run_main, input_dirs, tmp_path):
+    """Reports of the default in-memory comparison of input_dirs."""
+    output_dir = str(tmp_path / 'in_memory')
+    run_mode(run_main, input_dirs, output_dir)
+    return output_dir
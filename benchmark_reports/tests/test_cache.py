@@ -0,0 +1,116 @@
+"""Parsed-file cache: hits, invalidation on change, corrupt entries and LRU eviction."""
+
+import os
+
+import pytest
+
+import compare_pytorch_benchmarks
+from compare_pytorch_benchmarks import evict_benchmark_cache, read_benchmark_file_cached, trim_benchmark_cache
+from conftest import BASELINE_DIR, NEW_DIR, write_benchmark_csv
+
+pytest.importorskip('pyarrow')
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    """Record the files parse_benchmark_file actually parsed."""
+    calls = []
+    parse = compare_pytorch_benchmarks.parse_benchmark_file
+
+    def counting_parse(benchmark_file):
+        calls.append(benchmark_file)
+        return parse(benchmark_file)
+
+    monkeypatch.setattr(compare_pytorch_benchmarks, 'parse_benchmark_file', counting_parse)
+    return calls
+
+@pytest.fixture
+def benchmark_file(tmp_path):
+    path = tmp_path / 'operator_microbenchmark_mm.csv'
+    write_benchmark_csv(path, [('mm', 'mm_M8_N8_K8_cpu_dtypetorch.float32', False, 10.0, 100.0)])
+    return str(path)
+
+def cache_files(cache_dir, subdir):
+    return sorted(os.listdir(os.path.join(cache_dir, subdir)))
+
+def test_second_read_is_a_cache_hit(tmp_path, benchmark_file, parse_calls):
+    cache_dir = str(tmp_path / 'cache')
+    first = read_benchmark_file_cached(benchmark_file, cache_dir)
+    second = read_benchmark_file_cached(benchmark_file, cache_dir)
+
+    assert parse_calls == [benchmark_file]
+    assert second.equals(first)
+    assert len(cache_files(cache_dir, 'entries')) == 1
+    assert len(cache_files(cache_dir, 'stat')) == 1
+
+def test_changed_file_is_parsed_again(tmp_path, benchmark_file, parse_calls):
+    cache_dir = str(tmp_path / 'cache')
+    read_benchmark_file_cached(benchmark_file, cache_dir)
+
+    write_benchmark_csv(benchmark_file, [('mm', 'mm_M8_N8_K8_cpu_dtypetorch.float32', False, 25.0, 100.0)])
+    stat = os.stat(benchmark_file)
+    os.utime(benchmark_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    df = read_benchmark_file_cached(benchmark_file, cache_dir)
+
+    assert len(parse_calls) == 2
+    assert df['Execution Time'].tolist() == [25.0]
+    assert len(cache_files(cache_dir, 'entries')) == 2
+
+def test_corrupt_entry_is_reparsed(tmp_path, benchmark_file, parse_calls):
+    cache_dir = str(tmp_path / 'cache')
+    read_benchmark_file_cached(benchmark_file, cache_dir)
+    entry = os.path.join(cache_dir, 'entries', cache_files(cache_dir, 'entries')[0])
+    with open(entry, 'wb') as f:
+        f.write(b'not an arrow file')
+
+    df = read_benchmark_file_cached(benchmark_file, cache_dir)
+    assert len(parse_calls) == 2
+    assert df['Execution Time'].tolist() == [10.0]
+
+def test_hit_marks_entry_recently_used(tmp_path, benchmark_file):
+    cache_dir = str(tmp_path / 'cache')
+    read_benchmark_file_cached(benchmark_file, cache_dir)
+    entry = os.path.join(cache_dir, 'entries', cache_files(cache_dir, 'entries')[0])
+    os.utime(entry, (1, 1))
+
+    read_benchmark_file_cached(benchmark_file, cache_dir)
+    assert os.stat(entry).st_mtime > 1
+
+def make_cache_file(cache_dir, subdir, name, size, mtime):
+    path = os.path.join(cache_dir, subdir, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+    os.utime(path, (mtime, mtime))
+    return path
+
+def test_eviction_removes_least_recently_used_across_subdirs(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    make_cache_file(cache_dir, 'stat', 'memo.json', 100, 1000)
+    make_cache_file(cache_dir, 'entries', 'old.arrow', 100, 2000)
+    make_cache_file(cache_dir, 'entries', 'mid.arrow', 100, 3000)
+    make_cache_file(cache_dir, 'entries', 'new.arrow', 100, 4000)
+
+    assert evict_benchmark_cache(cache_dir, 250) == 2
+    assert cache_files(cache_dir, 'entries') == ['mid.arrow', 'new.arrow']
+    assert cache_files(cache_dir, 'stat') == []
+
+def test_eviction_within_budget_keeps_everything(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    make_cache_file(cache_dir, 'entries', 'a.arrow', 100, 1000)
+    assert evict_benchmark_cache(cache_dir, 100) == 0
+    assert evict_benchmark_cache(str(tmp_path / 'missing'), 0) == 0
+
+def test_trim_reports_evictions(tmp_path, capsys):
+    cache_dir = str(tmp_path / 'cache')
+    make_cache_file(cache_dir, 'entries', 'a.arrow', 100, 1000)
+
+    assert trim_benchmark_cache(None, 0) == 0
+    assert trim_benchmark_cache(cache_dir, 0) == 1
+    assert 'Evicted 1 stale entries' in capsys.readouterr().out
+
+def test_run_evicts_to_cache_budget_on_exit(tmp_path, run_main):
+    cache_dir = tmp_path / 'cache'
+    code, _ = run_main('--baseline-dir', BASELINE_DIR, '--new-dir', NEW_DIR, '--fast-path-max-rows', 0,
+                       '--cache-dir', cache_dir, '--cache-max-mb', 0, '--output', tmp_path / 'report.csv')
+    assert code == 0
+    assert cache_files(cache_dir, 'entries') == [] and cache_files(cache_dir, 'stat') == []
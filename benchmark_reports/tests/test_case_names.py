@@ -0,0 +1,32 @@
+"""Unique-case extraction, importable from the comparison script as before."""
+
+import re
+
+from compare_pytorch_benchmarks import extract_unique_cases
+
+CASE_NAMES = [
+    'mm_M64_N64_K64_cpu_dtypetorch.float32',
+    'mm_M64_N64_K64_cpu_dtypetorch.bfloat16_bwdall_BACKWARD',
+    'matmul_M256_N512_K4096_trans_aFalse_trans_bTrue_cuda_dtypetorch.float16_bwd1_BACKWARD',
+    'matmul_M256_N512_K4096_trans_aTrue_trans_bFalse_cuda_dtypetorch.float16',
+    'add_M8_N8_cpu',
+    'not a benchmark name',
+]
+
+def regex_unique_cases(case_names):
+    """The original per-name regex implementation."""
+    unique_cases = set()
+    for case_name in case_names:
+        case_name = re.sub(r'_dtypetorch\.\w+', '', case_name)
+        case_name = re.sub(r'_bwd\w*_BACKWARD', '', case_name)
+        unique_cases.add(re.sub(r'_trans_a\w+_trans_b\w+', '', case_name))
+    return sorted(unique_cases)
+
+def test_extract_unique_cases_matches_the_regex_implementation():
+    assert extract_unique_cases(CASE_NAMES) == regex_unique_cases(CASE_NAMES)
+    assert extract_unique_cases(CASE_NAMES) == [
+        'add_M8_N8_cpu',
+        'matmul_M256_N512_K4096',
+        'mm_M64_N64_K64_cpu',
+        'not a benchmark name',
+    ]
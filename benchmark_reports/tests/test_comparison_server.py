@@ -0,0 +1,240 @@
+"""Resident baseline store and the HTTP comparison endpoint."""
+
+import http.client
+import json
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import comparison_server
+from comparison_server import BaselineStore, make_request_handler
+from conftest import BASELINE_DIR, NEW_DIR, write_benchmark_csv
+
+def make_baseline(directory, execution_time=10.0):
+    """Baseline with one duplicated eager case and one compile case."""
+    directory.mkdir(exist_ok=True)
+    write_benchmark_csv(directory / 'operator_microbenchmark_mm.csv', [
+        ('mm', 'mm_M8_N8_K8_cpu_dtypetorch.float32', False, execution_time, 100.0),
+        ('mm', 'mm_M8_N8_K8_cpu_dtypetorch.float32', False, execution_time + 2, 100.0),
+    ])
+    write_benchmark_csv(directory / 'operator_microbenchmark_mm_compile.csv', [
+        ('mm', 'mm_M8_N8_K8_cpu_dtypetorch.float32', False, 1.0, 100.0),
+    ])
+    return str(directory)
+
+@pytest.fixture
+def load_calls(monkeypatch):
+    """Record the directories BaselineStore actually parsed."""
+    calls = []
+    load_split = comparison_server.load_split
+
+    def counting_load(directory, *args):
+        calls.append(directory)
+        return load_split(directory, *args)
+
+    monkeypatch.setattr(comparison_server, 'load_split', counting_load)
+    return calls
+
+def test_store_loads_once_then_hits(tmp_path, load_calls):
+    baseline = make_baseline(tmp_path / 'baseline')
+    store = BaselineStore(max_baselines=2)
+
+    frames, loaded = store.get(baseline)
+    again, loaded_again = store.get(baseline)
+
+    assert (loaded, loaded_again) == (True, False)
+    assert again is frames
+    assert load_calls == [baseline]
+    # Duplicate keys are collapsed once, when the baseline is loaded
+    assert frames['eager']['Execution Time'].tolist() == [12.0]
+
+def test_store_reloads_changed_baselines(tmp_path, load_calls):
+    baseline = make_baseline(tmp_path / 'baseline')
+    store = BaselineStore()
+    store.get(baseline)
+
+    make_baseline(tmp_path / 'baseline', execution_time=20.0)
+    path = os.path.join(baseline, 'operator_microbenchmark_mm.csv')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    frames, loaded = store.get(baseline)
+
+    assert loaded
+    assert len(load_calls) == 2
+    assert frames['eager']['Execution Time'].tolist() == [22.0]
+
+def test_store_evicts_least_recently_used(tmp_path, load_calls):
+    first = make_baseline(tmp_path / 'first')
+    second = make_baseline(tmp_path / 'second')
+    store = BaselineStore(max_baselines=1)
+
+    store.get(first)
+    store.get(second)
+
+    assert [entry['baseline_dir'] for entry in store.describe()] == [second]
+    assert list(store.load_locks) == [(second, 'csv', 'last')]
+    assert store.get(first)[1]
+    assert len(load_calls) == 3
+
+def test_store_needs_room_for_a_baseline():
+    with pytest.raises(ValueError, match='at least 1'):
+        BaselineStore(max_baselines=0)
+
+def test_concurrent_requests_parse_a_baseline_once(tmp_path, monkeypatch):
+    baseline = make_baseline(tmp_path / 'baseline')
+    calls = []
+    load_split = comparison_server.load_split
+
+    def slow_load(directory, *args):
+        calls.append(directory)
+        time.sleep(0.2)
+        return load_split(directory, *args)
+
+    monkeypatch.setattr(comparison_server, 'load_split', slow_load)
+    store = BaselineStore()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.get(baseline))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [baseline]
+    assert sorted(loaded for _, loaded in results) == [False, False, False, True]
+    assert all(frames is results[0][0] for frames, _ in results)
+
+def test_resident_baselines_are_served_during_a_slow_load(tmp_path, monkeypatch):
+    resident = make_baseline(tmp_path / 'resident')
+    slow = make_baseline(tmp_path / 'slow')
+    store = BaselineStore()
+    store.get(resident)
+
+    loading, release = threading.Event(), threading.Event()
+    load_split = comparison_server.load_split
+
+    def blocking_load(directory, *args):
+        if directory == slow:
+            loading.set()
+            release.wait(10)
+        return load_split(directory, *args)
+
+    monkeypatch.setattr(comparison_server, 'load_split', blocking_load)
+    slow_thread = threading.Thread(target=store.get, args=(slow,))
+    slow_thread.start()
+    try:
+        assert loading.wait(10)
+        results = []
+        resident_thread = threading.Thread(target=lambda: results.append(store.get(resident)))
+        resident_thread.start()
+        resident_thread.join(5)
+        assert not resident_thread.is_alive()
+        assert results[0][1] is False
+    finally:
+        release.set()
+        slow_thread.join()
+
+def reject_constant(name):
+    raise ValueError(f"Response is not strict JSON: {name}")
+
+@pytest.fixture
+def server(tmp_path):
+    """Comparison server on a free local port; yields a function sending one request."""
+    defaults = {
+        'baseline_dir': BASELINE_DIR,
+        'benchmark_type': 'both',
+        'input_format': 'csv',
+        'threshold': 5.0,
+        'duplicate_policy': 'last',
+        'statistical': False,
+        'alpha': 0.05,
+        'bootstrap_samples': 1000,
+    }
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), make_request_handler(BaselineStore(), defaults))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    def request(method, path, body=None):
+        connection = http.client.HTTPConnection(*httpd.server_address, timeout=60)
+        try:
+            connection.request(method, path, body=body)
+            response = connection.getresponse()
+            # Responses must be strict JSON: no NaN or Infinity literals
+            return response.status, json.loads(response.read(), parse_constant=reject_constant)
+        finally:
+            connection.close()
+
+    yield request
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_compare_request_reports_regressions(server):
+    status, body = server('POST', '/compare', json.dumps({'new_dir': NEW_DIR}))
+    assert status == 200
+    assert body['baseline_loaded']
+    assert set(body['stats']) == set(body['regressions']) == {'eager', 'compile'}
+    for benchmark_type, stats in body['stats'].items():
+        assert stats['total_regressions'] == len(body['regressions'][benchmark_type])
+
+    status, body = server('POST', '/compare', json.dumps({'new_dir': NEW_DIR, 'benchmark_type': 'eager'}))
+    assert status == 200
+    assert not body['baseline_loaded']
+    assert list(body['stats']) == ['eager']
+
+@pytest.mark.parametrize('body, message', [
+    ('{not json', 'Expecting property name'),
+    ('[1, 2]', 'JSON object'),
+    (json.dumps({'new_dir': NEW_DIR, 'threshold': 'high'}), 'threshold must be a number'),
+    (json.dumps({'new_dir': NEW_DIR, 'threshold': 'nan'}), 'threshold must be a finite number'),
+    (json.dumps({'new_dir': NEW_DIR, 'threshold': 'inf'}), 'threshold must be a finite number'),
+    (json.dumps({'new_dir': NEW_DIR, 'alpha': 'nan'}), 'alpha must be between 0 and 1'),
+    (json.dumps({'new_dir': NEW_DIR, 'alpha': 1.5}), 'alpha must be between 0 and 1'),
+    (json.dumps({'new_dir': NEW_DIR, 'bootstrap_samples': 0}), 'bootstrap_samples must be at least 1'),
+    (json.dumps({'new_dir': NEW_DIR, 'input_format': 'xml'}), 'Unknown input format'),
+    (json.dumps({'new_dir': NEW_DIR, 'baseline_dir': 3}), 'baseline_dir must be a string'),
+    (json.dumps({'new_dir': NEW_DIR, 'duplicate_policy': 'mean'}), 'Unknown duplicate policy'),
+    (json.dumps({}), 'new_dir or new_files'),
+])
+def test_bad_requests_are_rejected(server, body, message):
+    status, response = server('POST', '/compare', body)
+    assert status == 400
+    assert message in response['error']
+
+def test_infinite_changes_are_null_in_stats_and_rows(server, tmp_path):
+    baseline = tmp_path / 'baseline'
+    baseline.mkdir()
+    for name in ('operator_microbenchmark_mm.csv', 'operator_microbenchmark_mm_compile.csv'):
+        write_benchmark_csv(baseline / name, [('mm', 'mm_M8_N8_K8_cpu_dtypetorch.float32', False, 10.0, 0.0)])
+    new = tmp_path / 'new'
+    new.mkdir()
+    write_benchmark_csv(new / 'operator_microbenchmark_mm.csv',
+                        [('mm', 'mm_M8_N8_K8_cpu_dtypetorch.float32', False, 10.0, 100.0)])
+
+    status, body = server('POST', '/compare', json.dumps({
+        'baseline_dir': str(baseline),
+        'benchmark_type': 'eager',
+        'new_files': {'operator_microbenchmark_mm.csv': (new / 'operator_microbenchmark_mm.csv').read_text()},
+    }))
+
+    assert status == 200
+    assert body['stats']['eager']['memory_regressions'] == 1
+    assert body['stats']['eager']['max_memory_regression'] is None
+    assert body['regressions']['eager'][0]['memory_change_pct'] is None
+
+def test_server_errors_return_500(server, monkeypatch, capsys):
+    def failing_compare(*args):
+        raise RuntimeError('comparison exploded')
+
+    monkeypatch.setattr(comparison_server, 'compare_benchmark_frames', failing_compare)
+    status, response = server('POST', '/compare', json.dumps({'new_dir': NEW_DIR}))
+
+    assert status == 500
+    assert response['error'] == 'RuntimeError: comparison exploded'
+    assert 'Traceback' in capsys.readouterr().err
+
+def test_health_and_unknown_paths(server):
+    assert server('GET', '/health') == (200, {'status': 'ok'})
+    assert server('GET', '/missing')[0] == 404
+    assert server('POST', '/missing', '{}')[0] == 404
@@ -0,0 +1,101 @@
+"""The pure-stdlib fast path must write exactly what the pandas path writes."""
+
+import math
+import os
+
+import pandas as pd
+import pytest
+
+from case_names import parse_case_name_fields
+from conftest import BASELINE_DIR, NEW_DIR, write_benchmark_csv
+from fast_compare import case_work, run_fast_comparison
+from roofline import estimate_case_work
+
+@pytest.fixture
+def fast_path_results(monkeypatch):
+    """Record what every run_fast_comparison call returned (None when it fell back to pandas)."""
+    import compare_pytorch_benchmarks
+    results = []
+
+    def recording_run(*args):
+        results.append(run_fast_comparison(*args))
+        return results[-1]
+
+    monkeypatch.setattr(compare_pytorch_benchmarks, 'run_fast_comparison', recording_run)
+    return results
+
+def run_both_paths(run_main, tmp_path, baseline_dir, new_dir, *args):
+    """Run the fast and the pandas path into separate directories; returns both stdouts."""
+    outputs = {}
+    for name, extra in (('fast', []), ('pandas', ['--fast-path-max-rows', 0])):
+        directory = tmp_path / name
+        directory.mkdir()
+        code, stdout = run_main('--baseline-dir', baseline_dir, '--new-dir', new_dir, '--no-cache',
+                                '--output', directory / 'report.csv', *extra, *args)
+        assert code == 0
+        outputs[name] = stdout.replace(str(directory), '<out>')
+    return outputs
+
+def assert_same_files(tmp_path):
+    fast_files = sorted(os.listdir(tmp_path / 'fast'))
+    assert fast_files == sorted(os.listdir(tmp_path / 'pandas'))
+    for name in fast_files:
+        assert (tmp_path / 'fast' / name).read_bytes() == (tmp_path / 'pandas' / name).read_bytes(), name
+
+@pytest.mark.parametrize('args', [
+    [],
+    ['--benchmark-type', 'eager'],
+    ['--benchmark-type', 'compile', '--duplicate-policy', 'median'],
+    ['--duplicate-policy', 'min', '--output-format', 'csv.gz'],
+])
+def test_fast_path_matches_pandas_on_sample_data(run_main, fast_path_results, tmp_path, args):
+    outputs = run_both_paths(run_main, tmp_path, BASELINE_DIR, NEW_DIR, *args)
+    assert fast_path_results == [0]
+    assert outputs['fast'] == outputs['pandas']
+    assert_same_files(tmp_path)
+
+@pytest.mark.parametrize('policy', ['last', 'min', 'median'])
+def test_fast_path_matches_pandas_on_edge_cases(run_main, fast_path_results, tmp_path, policy):
+    """Zero and missing metrics, duplicate keys, unparseable names and float32-exact values."""
+    baseline_dir = tmp_path / 'baseline'
+    new_dir = tmp_path / 'new'
+    baseline_dir.mkdir()
+    new_dir.mkdir()
+    write_benchmark_csv(baseline_dir / 'operator_microbenchmark_mm.csv', [
+        ('mm', 'mm_M64_N64_K64_cuda_dtypetorch.float16', False, 10.0, 0),
+        ('mm', 'mm_M64_N64_K64_cuda_dtypetorch.float16', False, 12.0, 0),
+        ('mm', 'mm_M64_N64_K64_cuda_dtypetorch.float16', True, 0.0, 1024),
+        ('mm', 'mm_M64_N64_K64_cuda_dtypetorch.float16_bwdall_BACKWARD', True, 30.5, ''),
+        ('mm', 'custom_case', False, 7.25, 2048),
+    ])
+    write_benchmark_csv(new_dir / 'operator_microbenchmark_mm.csv', [
+        ('mm', 'mm_M64_N64_K64_cuda_dtypetorch.float16', False, 11.0, 0),
+        ('mm', 'mm_M64_N64_K64_cuda_dtypetorch.float16', True, 3.0, 1024),
+        ('mm', 'mm_M64_N64_K64_cuda_dtypetorch.float16', True, 5.0, 512),
+        ('mm', 'mm_M64_N64_K64_cuda_dtypetorch.float16_bwdall_BACKWARD', True, 29.0, 100),
+        ('mm', 'custom_case', False, 9.5, 0),
+    ])
+
+    outputs = run_both_paths(run_main, tmp_path, baseline_dir, new_dir,
+                             '--benchmark-type', 'eager', '--duplicate-policy', policy)
+    assert fast_path_results == [0]
+    assert 'Collapsed duplicate benchmark keys' in outputs['fast']
+    assert outputs['fast'] == outputs['pandas']
+    assert_same_files(tmp_path)
+
+def test_case_work_matches_vectorized_estimate():
+    names = [
+        'add_M8_N32_K256_cpu_dtypetorch.float32',
+        'mm_M64_N128_K32_cuda_dtypetorch.bfloat16',
+        'bmm_B4_M64_N128_K32_trans_aTrue_trans_bFalse_cuda_dtypetorch.float16_bwd1_BACKWARD',
+        'addmm_M16_N16_K16_cuda_dtypetorch.float64_bwdall_BACKWARD',
+        'baddbmm_B2_M16_N16_K16_cuda_dtypetorch.float8_e4m3fn',
+        'addbmm_B3_M16_N8_K4_cuda_dtypetorch.int8',
+        'conv_M16_N16_K16_cuda_dtypetorch.float32',
+        'not_a_case_name',
+    ]
+    flops, bytes_moved = estimate_case_work(parse_case_name_fields(pd.Series(names)))
+    for name, expected_flops, expected_bytes in zip(names, flops, bytes_moved):
+        _, case_flops, case_bytes = case_work(name)
+        for actual, expected in ((case_flops, expected_flops), (case_bytes, expected_bytes)):
+            assert actual == expected or (math.isnan(actual) and math.isnan(expected)), name
@@ -0,0 +1,51 @@
+"""Incremental mode must match the in-memory comparison and only recompute changed files."""
+
+import os
+
+import pytest
+
+from conftest import FULL_DUMPS, IDENTICAL_OUTPUTS, assert_same_reports, read_bytes, run_mode
+
+pytest.importorskip('pyarrow')
+
+def test_incremental_matches_in_memory_and_reuses_partitions(run_main, input_dirs, in_memory_dir, tmp_path):
+    state_dir = str(tmp_path / 'state')
+    first_dir = str(tmp_path / 'incremental_first')
+    second_dir = str(tmp_path / 'incremental_second')
+
+    stdout = run_mode(run_main, input_dirs, first_dir, '--incremental-dir', state_dir)
+    assert 'Reused 0 of 4 eager partitions' in stdout
+    assert_same_reports(in_memory_dir, first_dir)
+
+    stdout = run_mode(run_main, input_dirs, second_dir, '--incremental-dir', state_dir)
+    assert 'Reused 4 of 4 eager partitions' in stdout
+    assert 'Reused 4 of 4 compile partitions' in stdout
+    for name in IDENTICAL_OUTPUTS + FULL_DUMPS:
+        assert read_bytes(second_dir, name) == read_bytes(first_dir, name), name
+
+def test_incremental_recomputes_changed_files_only(run_main, input_dirs, tmp_path):
+    state_dir = str(tmp_path / 'state')
+    run_mode(run_main, input_dirs, str(tmp_path / 'first'), '--incremental-dir', state_dir)
+
+    changed = input_dirs[1] / 'operator_microbenchmark_mm.csv'
+    changed.write_text(changed.read_text().replace(',False,', ',False,1', 1))
+    stdout = run_mode(run_main, input_dirs, str(tmp_path / 'second'), '--incremental-dir', state_dir)
+
+    assert 'Recomputing eager partition: operator_microbenchmark_mm.csv' in stdout
+    assert 'Reused 3 of 4 eager partitions' in stdout
+    assert 'Reused 4 of 4 compile partitions' in stdout
+
+    # The edit touched one eager file, so the other reports agree with a fresh in-memory run
+    run_mode(run_main, input_dirs, str(tmp_path / 'fresh'))
+    assert_same_reports(str(tmp_path / 'fresh'), str(tmp_path / 'second'))
+
+def test_incremental_prunes_deleted_inputs(run_main, input_dirs, tmp_path):
+    state_dir = tmp_path / 'state'
+    run_mode(run_main, input_dirs, str(tmp_path / 'first'), '--incremental-dir', state_dir)
+    partitions = sorted(state_dir.rglob('*.arrow'))
+
+    os.remove(input_dirs[1] / 'operator_microbenchmark_add.csv')
+    stdout = run_mode(run_main, input_dirs, str(tmp_path / 'second'), '--incremental-dir', state_dir)
+
+    assert 'Dropped 1 stale manifest entries' in stdout
+    assert len(sorted(state_dir.rglob('*.arrow'))) == len(partitions) - 1
@@ -0,0 +1,92 @@
+"""Composite-key merge and duplicate collapsing of the pandas path."""
+
+import pandas as pd
+import pytest
+
+from benchmark_common import CSV_COLUMNS
+from compare_pytorch_benchmarks import (
+    SAMPLES_COLUMN,
+    deduplicate_benchmarks,
+    merge_benchmark_frames,
+)
+
+KEY_COLUMNS = ['Benchmarking Module Name', 'Case Name', 'run_backward', 'tag']
+
+def benchmark_frame(rows):
+    """Frame of (case name, run_backward, execution time, peak memory, source file) rows."""
+    return pd.DataFrame([
+        ['PyTorch', 'mm', case_name, 'long', run_backward, execution_time, peak_memory, source_file]
+        for case_name, run_backward, execution_time, peak_memory, source_file in rows
+    ], columns=CSV_COLUMNS + ['source_file'])
+
+DUPLICATED = benchmark_frame([
+    ('mm_a', False, 10.0, 300.0, 'first.csv'),
+    ('mm_b', False, 5.0, 100.0, 'first.csv'),
+    ('mm_a', False, 30.0, 100.0, 'second.csv'),
+    ('mm_a', False, 20.0, 200.0, 'third.csv'),
+])
+
+@pytest.mark.parametrize('policy, execution_time, peak_memory', [
+    ('last', 20.0, 200.0),
+    ('min', 10.0, 100.0),
+    ('median', 20.0, 200.0),
+])
+def test_deduplicate_reduces_metrics_by_policy(policy, execution_time, peak_memory):
+    deduplicated, removed = deduplicate_benchmarks(DUPLICATED, KEY_COLUMNS, policy)
+
+    assert removed == 2
+    # The collapsed row takes the place of its last duplicate and keeps its other columns
+    assert deduplicated['Case Name'].tolist() == ['mm_b', 'mm_a']
+    collapsed = deduplicated.iloc[1]
+    assert collapsed['Execution Time'] == execution_time
+    assert collapsed['Peak Memory (KB)'] == peak_memory
+    assert collapsed['source_file'] == 'third.csv'
+
+def test_deduplicate_keeps_frames_without_duplicates():
+    frame = DUPLICATED.drop_duplicates('Case Name')
+    deduplicated, removed = deduplicate_benchmarks(frame, KEY_COLUMNS, 'min')
+    assert removed == 0
+    assert deduplicated is frame
+
+def test_deduplicate_rejects_unknown_policy():
+    with pytest.raises(ValueError, match='Unknown duplicate policy'):
+        deduplicate_benchmarks(DUPLICATED, KEY_COLUMNS, 'mean')
+
+def test_deduplicate_concatenates_samples():
+    frame = DUPLICATED.assign(**{SAMPLES_COLUMN: [[1.0], [2.0], [3.0, 4.0], [5.0]]})
+    deduplicated, _ = deduplicate_benchmarks(frame, KEY_COLUMNS, 'last')
+    assert deduplicated[SAMPLES_COLUMN].tolist() == [[2.0], [1.0, 3.0, 4.0, 5.0]]
+
+def test_forward_and_backward_rows_are_separate_benchmarks():
+    frame = benchmark_frame([
+        ('mm_a', False, 10.0, 100.0, 'a.csv'),
+        ('mm_a', True, 30.0, 100.0, 'a.csv'),
+    ])
+    deduplicated, removed = deduplicate_benchmarks(frame, KEY_COLUMNS, 'last')
+    assert removed == 0
+    assert len(deduplicated) == 2
+
+def test_merge_pairs_each_key_once():
+    baseline = benchmark_frame([
+        ('mm_a', False, 10.0, 100.0, 'base.csv'),
+        ('mm_a', False, 12.0, 100.0, 'base.csv'),
+        ('mm_a', True, 40.0, 100.0, 'base.csv'),
+        ('mm_only_baseline', False, 1.0, 1.0, 'base.csv'),
+    ])
+    new = benchmark_frame([
+        ('mm_a', True, 44.0, 100.0, 'new.csv'),
+        ('mm_a', False, 11.0, 100.0, 'new.csv'),
+        ('mm_a', False, 9.0, 100.0, 'new.csv'),
+        ('mm_only_new', False, 1.0, 1.0, 'new.csv'),
+    ])
+
+    merged, baseline_removed, new_removed = merge_benchmark_frames(baseline, new, 'min')
+
+    assert (baseline_removed, new_removed) == (1, 1)
+    # Duplicates never multiply: one row per shared key, in baseline order
+    assert merged['Case Name'].tolist() == ['mm_a', 'mm_a']
+    assert merged['run_backward_baseline'].tolist() == [False, True]
+    assert merged['run_backward_new'].tolist() == [False, True]
+    assert merged['Execution Time_baseline'].tolist() == [10.0, 40.0]
+    assert merged['Execution Time_new'].tolist() == [9.0, 44.0]
+    assert 'source_file_baseline' in merged.columns and 'source_file_new' in merged.columns
@@ -0,0 +1,106 @@
+"""Noise-floor calibration, the noise table round trip and per-case thresholds."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmark_common import CSV_COLUMNS
+from compare_pytorch_benchmarks import compact_benchmark_frame, merge_benchmark_frames
+from conftest import BASELINE_DIR
+from noise_floors import NOISE_TABLE_COLUMNS, compute_noise_floors, load_noise_table, noise_thresholds
+
+MM = 'mm_M8_N8_K8_cpu_dtypetorch.float32'
+
+def run_frame(rows):
+    """Loaded frame of (module, case name, run_backward, execution time, peak memory) rows."""
+    return compact_benchmark_frame(pd.DataFrame([
+        ['PyTorch', module, case_name, 'long', run_backward, execution_time, peak_memory]
+        for module, case_name, run_backward, execution_time, peak_memory in rows
+    ], columns=CSV_COLUMNS))
+
+def case_bands(table):
+    cases = table[table['Case Name'].notna()]
+    return {(row['Case Name'], row['run_backward']): row['time_noise_pct'] for _, row in cases.iterrows()}
+
+def test_identical_runs_have_zero_bands():
+    run = run_frame([('mm', MM, False, 10.0, 100.0), ('mm', MM, True, 30.0, 200.0)])
+    table = compute_noise_floors([run, run.copy()], 'eager')
+
+    assert list(table.columns) == NOISE_TABLE_COLUMNS
+    cases = table[table['Case Name'].notna()]
+    assert len(cases) == 2
+    assert (cases['samples'] == 2).all()
+    assert (cases['time_noise_pct'] == 0).all() and (cases['memory_noise_pct'] == 0).all()
+
+def test_runs_with_duplicate_keys_are_rejected():
+    run = run_frame([('mm', MM, False, 10.0, 100.0), ('mm', MM, False, 11.0, 100.0)])
+    with pytest.raises(ValueError, match='Calibration run 1 has duplicate benchmark keys'):
+        compute_noise_floors([run, run], 'eager')
+
+def test_forward_and_backward_rows_get_separate_bands():
+    table = compute_noise_floors([
+        run_frame([('mm', MM, False, 10.0, 100.0), ('mm', MM, True, 30.0, 100.0)]),
+        run_frame([('mm', MM, False, 10.0, 100.0), ('mm', MM, True, 33.0, 100.0)]),
+    ], 'eager')
+    bands = case_bands(table)
+
+    assert bands[(MM, False)] == 0
+    # The backward spread (10%) is below 3 two-run deviations of its samples
+    assert bands[(MM, True)] > 10
+
+@pytest.fixture
+def noise_table(tmp_path):
+    """Noise table where forward mm jitters by 20% and backward mm is stable."""
+    path = tmp_path / 'noise_floors.csv'
+    compute_noise_floors([
+        run_frame([('mm', MM, False, 10.0, 100.0), ('mm', MM, True, 30.0, 100.0)]),
+        run_frame([('mm', MM, False, 12.0, 100.0), ('mm', MM, True, 30.0, 100.0)]),
+    ], 'eager').to_csv(path, index=False)
+    return str(path)
+
+def merged_comparison():
+    baseline = run_frame([
+        ('mm', MM, False, 10.0, 100.0),
+        ('mm', MM, True, 30.0, 100.0),
+        ('other', MM, False, 10.0, 100.0),  # not calibrated, same op and shape bucket
+        ('other', 'custom_case', False, 10.0, 100.0),  # no calibrated bucket
+    ])
+    merged, _, _ = merge_benchmark_frames(baseline, baseline.copy())
+    return merged
+
+def test_thresholds_use_case_then_bucket_bands(noise_table):
+    floors = load_noise_table(noise_table)['eager']
+    forward_band = case_bands(pd.read_csv(noise_table))[(MM, False)]
+
+    time_threshold, memory_threshold = noise_thresholds(merged_comparison(), floors, threshold=5.0)
+
+    bucket_band = floors.buckets['time_noise_pct'].iloc[0]
+    assert forward_band > 20 and bucket_band > 5
+    np.testing.assert_allclose(time_threshold, [forward_band, 5.0, bucket_band, 5.0])
+    np.testing.assert_allclose(memory_threshold, [5.0, 5.0, 5.0, 5.0])
+
+def test_bucket_level_ignores_case_bands(noise_table):
+    floors = load_noise_table(noise_table, level='bucket')['eager']
+    bucket_band = floors.buckets['time_noise_pct'].iloc[0]
+
+    time_threshold, _ = noise_thresholds(merged_comparison(), floors, threshold=5.0)
+
+    assert len(floors.cases) == 0
+    np.testing.assert_allclose(time_threshold, [bucket_band] * 3 + [5.0])
+
+def test_unknown_noise_level_is_rejected(noise_table):
+    with pytest.raises(ValueError, match='Unknown noise level'):
+        load_noise_table(noise_table, level='global')
+
+def test_calibrating_a_run_against_itself(run_main, tmp_path):
+    noise_table = tmp_path / 'noise_floors.csv'
+    code, stdout = run_main('--calibrate-noise', BASELINE_DIR, BASELINE_DIR, '--noise-table', noise_table,
+                            '--output', tmp_path / 'report.csv')
+
+    assert code == 0, stdout
+    assert 'Noise table saved to' in stdout
+    table = pd.read_csv(noise_table)
+    assert set(table['benchmark_type']) == {'eager', 'compile'}
+    cases = table[table['Case Name'].notna()]
+    assert len(cases) > 0
+    assert (cases['time_noise_pct'] == 0).all()
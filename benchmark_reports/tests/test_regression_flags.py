@@ -0,0 +1,38 @@
+"""Columnar percentage change and regression flags."""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from benchmark_common import calculate_percentage_change
+from compare_pytorch_benchmarks import calculate_percentage_change_columns, flag_regressions
+
+def test_percentage_change_of_zero_baselines():
+    change = calculate_percentage_change_columns([0.0, 0.0, 10.0, 10.0], [5.0, 0.0, 11.0, 9.0])
+    assert change[0] == math.inf
+    assert change[1] == 0.0
+    np.testing.assert_allclose(change[2:], [10.0, -10.0])
+
+def test_percentage_change_matches_the_scalar_formula():
+    rng = np.random.default_rng(5)
+    old = np.concatenate([rng.uniform(0.5, 100, 200), [0.0, 0.0]])
+    new = np.concatenate([old[:200] * rng.uniform(0.5, 1.5, 200), [0.0, 3.0]])
+
+    change = calculate_percentage_change_columns(pd.Series(old), pd.Series(new))
+
+    expected = [calculate_percentage_change(o, n) for o, n in zip(old, new)]
+    np.testing.assert_allclose(change, expected, rtol=1e-12)
+
+def test_flag_regressions_uses_a_strict_threshold():
+    merged = flag_regressions(pd.DataFrame({
+        'Execution Time_baseline': [100.0, 100.0, 100.0],
+        'Execution Time_new': [105.0, 106.0, 100.0],
+        'Peak Memory (KB)_baseline': [100.0, 100.0, 0.0],
+        'Peak Memory (KB)_new': [100.0, 90.0, 10.0],
+    }), threshold=5.0)
+
+    assert merged['execution_time_regression'].tolist() == [False, True, False]
+    assert merged['memory_regression'].tolist() == [False, False, True]
+    assert merged['has_regression'].tolist() == [False, True, True]
+    np.testing.assert_allclose(merged['memory_change_pct'], [0.0, -10.0, math.inf])
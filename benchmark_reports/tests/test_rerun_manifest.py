@@ -0,0 +1,104 @@
+"""Regression clustering, representative selection and the strict-JSON re-run manifest."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from benchmark_common import REGRESSION_REPORT_COLUMNS
+from conftest import BASELINE_DIR, NEW_DIR
+from regression_clusters import build_rerun_manifest, cluster_regressions, select_representatives
+
+def regression_report(rows):
+    """Report of (case name, execution time change %, memory change %) rows."""
+    return pd.DataFrame([{
+        'Case Name': case_name,
+        'Benchmarking Module Name_baseline': 'mm',
+        'Execution Time_baseline': 10.0,
+        'Execution Time_new': 10.0 * (1 + execution_change / 100),
+        'execution_time_change_pct': execution_change,
+        'execution_time_regression': execution_change > 5,
+        'Peak Memory (KB)_baseline': 0.0 if memory_change == float('inf') else 100.0,
+        'Peak Memory (KB)_new': 100.0,
+        'memory_change_pct': memory_change,
+        'memory_regression': memory_change > 5,
+        'source_file_baseline': 'operator_microbenchmark_mm.csv',
+        'source_file_new': 'operator_microbenchmark_mm.csv'
+    } for case_name, execution_change, memory_change in rows], columns=REGRESSION_REPORT_COLUMNS)
+
+# Three float32 shapes of forward mm, a backward variant of one and its bf16 variant
+MM_REPORT = regression_report([
+    ('mm_M64_N64_K64_cpu_dtypetorch.float32', 12.0, 0.0),
+    ('mm_M64_N64_K64_cpu_dtypetorch.float32_bwdall_BACKWARD', 30.0, 0.0),
+    ('mm_M64_N64_K80_cpu_dtypetorch.float32', 14.0, 0.0),
+    ('mm_M64_N64_K96_cpu_dtypetorch.float32', 16.0, 0.0),
+    ('mm_M64_N64_K64_cpu_dtypetorch.bfloat16', 15.5, 0.0),
+])
+
+def test_clusters_split_by_dtype_and_direction():
+    clustered = cluster_regressions(MM_REPORT, 'eager')
+    cluster = dict(zip(clustered['Case Name'], clustered['cluster']))
+    forward = cluster['mm_M64_N64_K64_cpu_dtypetorch.float32']
+
+    assert cluster['mm_M64_N64_K96_cpu_dtypetorch.float32'] == forward
+    assert cluster['mm_M64_N64_K64_cpu_dtypetorch.float32_bwdall_BACKWARD'] != forward
+    assert cluster['mm_M64_N64_K64_cpu_dtypetorch.bfloat16'] != forward
+    assert clustered['direction'].tolist() == ['forward', 'backward', 'forward', 'forward', 'forward']
+
+def test_representatives_cover_different_shapes():
+    clustered = cluster_regressions(MM_REPORT, 'eager', cluster_by=['op', 'backward'])
+    forward = clustered.loc[clustered['direction'] == 'forward', 'cluster'].iloc[0]
+
+    chosen = select_representatives(clustered, per_cluster=3)
+    chosen = chosen[chosen['cluster'] == forward]
+
+    # Closest to the median change (14.75%) first; the float32 K64 case shares its unique
+    # case with the closer bf16 variant, so it is never picked
+    assert chosen['Case Name'].tolist() == [
+        'mm_M64_N64_K80_cpu_dtypetorch.float32',
+        'mm_M64_N64_K64_cpu_dtypetorch.bfloat16',
+        'mm_M64_N64_K96_cpu_dtypetorch.float32',
+    ]
+    assert chosen['unique_case'].is_unique
+
+def test_representatives_per_cluster_must_be_positive():
+    with pytest.raises(ValueError, match='at least 1'):
+        select_representatives(cluster_regressions(MM_REPORT, 'eager'), per_cluster=0)
+
+def test_manifest_is_strict_json_with_infinite_changes():
+    report = regression_report([('mm_M64_N64_K64_cpu_dtypetorch.float32', 1.0, float('inf'))])
+    manifest = build_rerun_manifest({'eager': report, 'compile': None}, threshold=5.0)
+
+    encoded = json.dumps(manifest, allow_nan=False)
+
+    case = json.loads(encoded)['rerun_cases'][0]
+    assert case['memory_change_pct'] is None
+    assert case['execution_time_change_pct'] == 1.0
+    assert manifest['clusters'][0]['worst_change_pct'] is None
+    assert (manifest['total_regressions'], manifest['rerun_count']) == (1, 1)
+
+def test_manifest_counts_every_regression_once():
+    manifest = build_rerun_manifest({'eager': MM_REPORT}, threshold=5.0)
+    members = [member for cluster in manifest['clusters'] for member in cluster['members']]
+
+    assert sorted(members) == sorted(MM_REPORT['Case Name'])
+    assert manifest['total_clusters'] == len(manifest['clusters'])
+    assert manifest['rerun_count'] == len(manifest['rerun_cases']) == manifest['total_clusters']
+    assert manifest['rerun_fraction'] == pytest.approx(manifest['rerun_count'] / len(MM_REPORT))
+
+def reject_constant(name):
+    raise ValueError(f"Manifest is not strict JSON: {name}")
+
+def test_rerun_manifest_run_writes_strict_json(run_main, tmp_path):
+    code, stdout = run_main('--baseline-dir', BASELINE_DIR, '--new-dir', NEW_DIR, '--rerun-manifest',
+                            '--rerun-per-cluster', 2, '--output', tmp_path / 'report.csv')
+    assert code == 0, stdout
+
+    with open(tmp_path / 'report_rerun_manifest.json') as f:
+        manifest = json.load(f, parse_constant=reject_constant)
+
+    assert manifest['per_cluster'] == 2
+    assert manifest['total_regressions'] > 0
+    for cluster in manifest['clusters']:
+        assert 1 <= len(cluster['representatives']) <= 2
+        assert set(cluster['representatives']) <= set(cluster['members'])
@@ -0,0 +1,109 @@
+"""Vectorized Mann-Whitney test, bootstrap intervals and the statistical regression decision."""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from compare_pytorch_benchmarks import (
+    SAMPLES_COLUMN,
+    apply_sample_statistics,
+    bootstrap_change_interval,
+    mann_whitney_regression_test,
+    samples_to_matrix,
+)
+
+def sample_matrices(baseline_lists, new_lists):
+    baseline, baseline_counts = samples_to_matrix(pd.Series(baseline_lists, dtype=object))
+    new, new_counts = samples_to_matrix(pd.Series(new_lists, dtype=object))
+    return baseline, new, baseline_counts, new_counts
+
+def test_samples_to_matrix_pads_with_nan():
+    matrix, counts = samples_to_matrix(pd.Series([[1.0, 2.0, 3.0], [4.0], None], dtype=object))
+    assert counts.tolist() == [3, 1, 0]
+    np.testing.assert_array_equal(matrix[0], [1.0, 2.0, 3.0])
+    assert matrix[1, 0] == 4.0 and np.isnan(matrix[1, 1:]).all()
+    assert np.isnan(matrix[2]).all()
+
+def mann_whitney_reference(baseline, new):
+    """One-sided p-value of new > baseline from the pairwise U statistic, one case at a time."""
+    greater = sum(n > b for n in new for b in baseline)
+    ties = sum(n == b for n in new for b in baseline)
+    n1, n2 = len(baseline), len(new)
+    z = (greater + 0.5 * ties - n1 * n2 / 2 - 0.5) / math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def test_mann_whitney_matches_scalar_reference():
+    baseline_lists = [[10.0, 11.0, 12.0, 13.0], [5.0, 5.0, 6.0], [1.0, 2.0, 3.0, 4.0, 5.0]]
+    new_lists = [[12.5, 14.0, 15.0], [5.0, 6.0, 6.0, 7.0], [0.5, 1.5, 2.5]]
+
+    p_value, _ = mann_whitney_regression_test(*sample_matrices(baseline_lists, new_lists))
+
+    for case, (baseline, new) in enumerate(zip(baseline_lists, new_lists)):
+        assert p_value[case] == pytest.approx(mann_whitney_reference(baseline, new), rel=1e-12)
+
+def test_mann_whitney_matches_scipy():
+    stats = pytest.importorskip('scipy.stats')
+    rng = np.random.default_rng(7)
+    baseline_lists = [list(rng.normal(100, 5, size)) for size in (5, 8, 12, 20)]
+    new_lists = [list(rng.normal(100 + shift, 5, size)) for shift, size in ((0, 6), (4, 8), (8, 15), (-3, 9))]
+
+    p_value, effect_size = mann_whitney_regression_test(*sample_matrices(baseline_lists, new_lists))
+
+    for case, (baseline, new) in enumerate(zip(baseline_lists, new_lists)):
+        expected = stats.mannwhitneyu(new, baseline, alternative='greater', method='asymptotic')
+        assert p_value[case] == pytest.approx(expected.pvalue, rel=1e-9)
+        pairs = np.subtract.outer(np.asarray(new), np.asarray(baseline))
+        assert effect_size[case] == pytest.approx((pairs > 0).mean() - (pairs < 0).mean())
+
+def test_mann_whitney_needs_two_samples_per_side():
+    p_value, effect_size = mann_whitney_regression_test(*sample_matrices(
+        [[1.0, 2.0], [1.0], [1.0, 2.0, 3.0]],
+        [[5.0], [5.0, 6.0], [5.0, 6.0, 7.0]]
+    ))
+    assert np.isnan(p_value[:2]).all()
+    assert p_value[2] < 0.05
+    assert effect_size[2] == 1.0
+
+def test_bootstrap_interval_covers_the_shift_and_is_seeded():
+    rng = np.random.default_rng(3)
+    baseline_lists = [list(rng.normal(100, 1, 30)), list(rng.normal(100, 1, 30))]
+    new_lists = [list(rng.normal(120, 1, 30)), list(rng.normal(100, 1, 10))]
+    matrices = sample_matrices(baseline_lists, new_lists)
+
+    low, high = bootstrap_change_interval(*matrices, n_bootstrap=500, seed=1)
+    again_low, again_high = bootstrap_change_interval(*matrices, n_bootstrap=500, seed=1)
+
+    assert 15 < low[0] < 20 < high[0] < 25
+    assert low[1] < 0 < high[1]
+    np.testing.assert_array_equal(low, again_low)
+    np.testing.assert_array_equal(high, again_high)
+
+def test_statistical_decision_overrides_point_estimates():
+    rng = np.random.default_rng(11)
+    noisy_baseline = list(rng.normal(100, 30, 8))
+    merged = pd.DataFrame({
+        'Execution Time_baseline': [100.0, 100.0, 100.0],
+        'Execution Time_new': [120.0, 120.0, 100.0],
+        'execution_time_regression': [True, True, False],
+        'memory_regression': [False, False, False],
+        f'{SAMPLES_COLUMN}_baseline': [
+            list(rng.normal(100, 1, 20)),  # stable, clearly slower
+            noisy_baseline,  # one slow median but nothing significant
+            [100.0],  # too few samples: keeps the point estimate
+        ],
+        f'{SAMPLES_COLUMN}_new': [
+            list(rng.normal(120, 1, 20)),
+            [value * 1.01 for value in noisy_baseline],
+            [130.0],
+        ],
+    })
+
+    apply_sample_statistics(merged, threshold=5.0, alpha=0.05, n_bootstrap=500)
+
+    assert merged['execution_time_regression'].tolist() == [True, False, False]
+    assert merged['has_regression'].tolist() == [True, False, False]
+    assert merged['execution_time_samples_baseline'].tolist() == [20, 8, 1]
+    assert np.isnan(merged['execution_time_p_value'].iloc[2])
+    assert merged['execution_time_ci_low_pct'].iloc[0] > 5.0
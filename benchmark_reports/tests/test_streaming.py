@@ -0,0 +1,13 @@
+"""Streaming mode must report exactly what the in-memory comparison reports."""
+
+import pytest
+
+from conftest import assert_same_reports, run_mode
+
+pytest.importorskip('pyarrow')
+
+@pytest.mark.parametrize('partitions', [1, 7])
+def test_streaming_matches_in_memory(run_main, input_dirs, in_memory_dir, tmp_path, partitions):
+    output_dir = str(tmp_path / 'streaming')
+    run_mode(run_main, input_dirs, output_dir, '--streaming', '--partitions', partitions, '--chunksize', 100)
+    assert_same_reports(in_memory_dir, output_dir)
@@ -0,0 +1,48 @@
+"""Markdown summary report contents across comparison modes."""
+
+import os
+import re
+
+import pytest
+
+from conftest import BASELINE_DIR, NEW_DIR
+
+def write_markdown(run_main, output_dir, *args):
+    """Run a both-types comparison with --generate-markdown; returns the report text."""
+    os.makedirs(output_dir, exist_ok=True)
+    output = os.path.join(output_dir, 'report.csv')
+    code, stdout = run_main('--baseline-dir', BASELINE_DIR, '--new-dir', NEW_DIR, '--no-cache',
+                            '--generate-markdown', '--output', output, *args)
+    assert code == 0, stdout
+    with open(output.replace('.csv', '_summary_report.md')) as f:
+        return f.read()
+
+def test_markdown_without_regressions_still_counts_matches(run_main, tmp_path):
+    markdown = write_markdown(run_main, str(tmp_path / 'default'), '--threshold', 100000)
+
+    assert "**Total matching benchmarks**: 2,920 (1,460 eager + 1,460 compile)" in markdown
+    assert "**Total regressions found**: 0" in markdown
+    assert "No shape information available." not in markdown
+    assert "### Eager Benchmarks by Operation" in markdown
+
+def test_markdown_without_regressions_matches_streaming(run_main, tmp_path):
+    pytest.importorskip('pyarrow')
+    default = write_markdown(run_main, str(tmp_path / 'default'), '--threshold', 100000)
+    streaming = write_markdown(run_main, str(tmp_path / 'streaming'), '--threshold', 100000, '--streaming')
+    assert streaming == default
+
+def test_files_generated_names_the_written_files(run_main, tmp_path):
+    output_dir = str(tmp_path / 'nightly')
+    markdown = write_markdown(run_main, output_dir, '--output-format', 'csv.gz', '--threshold', 100000)
+
+    files = markdown.split('## Files Generated')[1].split('## Methodology')[0]
+    listed = re.findall(r'^- `([^`]+)`(.*)$', files, flags=re.MULTILINE)
+    assert [name for name, _ in listed] == [
+        'report_eager.csv',
+        'report_compile.csv',
+        'report_eager_full_comparison.csv.gz',
+        'report_compile_full_comparison.csv.gz',
+    ]
+    for name, description in listed:
+        # Nothing regressed, so only the full comparison dumps were written
+        assert os.path.exists(os.path.join(output_dir, name)) == ('not written' not in description)
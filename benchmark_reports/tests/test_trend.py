@@ -0,0 +1,79 @@
+"""Trend store over several versions and changepoint detection."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmark_common import CSV_COLUMNS
+from compare_pytorch_benchmarks import build_trend_store, detect_changepoints, unique_version_labels
+
+def version_frame(rows):
+    """Frame of (case name, run_backward, execution time) rows."""
+    return pd.DataFrame([
+        ['PyTorch', 'mm', case_name, 'long', run_backward, execution_time, 100.0]
+        for case_name, run_backward, execution_time in rows
+    ], columns=CSV_COLUMNS)
+
+def series_store(series_by_case):
+    """Benchmark x version matrix with versions v1, v2, ... from {case name: values}."""
+    num_versions = len(next(iter(series_by_case.values())))
+    return pd.DataFrame(list(series_by_case.values()), index=pd.Index(list(series_by_case), name='Case Name'),
+                        columns=[f'v{version}' for version in range(1, num_versions + 1)], dtype=np.float64)
+
+def test_trend_store_keys_on_the_composite_key():
+    store = build_trend_store({
+        'v1': version_frame([('mm_a', False, 10.0), ('mm_a', True, 30.0), ('mm_a', False, 14.0)]),
+        'v2': version_frame([('mm_a', True, 33.0), ('mm_b', False, 5.0)]),
+    }, duplicate_policy='min')
+
+    assert store.index.names == ['Benchmarking Module Name', 'Case Name', 'run_backward', 'tag']
+    assert list(store.columns) == ['v1', 'v2']
+    assert store.loc[('mm', 'mm_a', False, 'long'), 'v1'] == 10.0
+    assert np.isnan(store.loc[('mm', 'mm_a', False, 'long'), 'v2'])
+    assert store.loc[('mm', 'mm_a', True, 'long')].tolist() == [30.0, 33.0]
+    assert np.isnan(store.loc[('mm', 'mm_b', False, 'long'), 'v1'])
+
+def test_step_up_is_a_regression_at_its_first_version():
+    changepoints = detect_changepoints(series_store({'mm_a': [10, 10, 10, 15, 15]}))
+    row = changepoints.loc['mm_a']
+
+    assert row['changepoint_version'] == 'v4'
+    assert row['last_good_version'] == 'v3'
+    assert (row['mean_before'], row['mean_after']) == (10.0, 15.0)
+    assert row['shift_pct'] == pytest.approx(50.0)
+    assert row['regression']
+
+def test_later_improvement_does_not_hide_an_earlier_regression():
+    changepoints = detect_changepoints(series_store({'mm_a': [10, 10, 12, 12, 12, 4, 4, 4]}))
+    row = changepoints.loc['mm_a']
+
+    assert row['changepoint_version'] == 'v3'
+    assert row['last_good_version'] == 'v2'
+    assert row['shift_pct'] == pytest.approx(20.0)
+    assert row['regression']
+
+def test_flat_and_improving_series_are_not_regressions():
+    changepoints = detect_changepoints(series_store({
+        'flat': [10, 10.1, 9.9, 10, 10.2],
+        'faster': [10, 10, 10, 6, 6],
+    }))
+
+    assert not changepoints['regression'].any()
+    assert changepoints.loc['faster', 'changepoint_version'] == 'v4'
+    assert changepoints.loc['faster', 'shift_pct'] == pytest.approx(-40.0)
+
+def test_missing_versions_are_skipped_when_naming_the_changepoint():
+    changepoints = detect_changepoints(series_store({'mm_a': [10, 10, np.nan, np.nan, 20, 20]}))
+    row = changepoints.loc['mm_a']
+
+    assert row['last_good_version'] == 'v2'
+    assert row['changepoint_version'] == 'v5'
+    assert row['versions_present'] == 4
+    assert row['regression']
+
+def test_changepoints_need_two_versions():
+    with pytest.raises(ValueError, match='at least two versions'):
+        detect_changepoints(series_store({'mm_a': [10.0]}))
+
+def test_repeated_directory_names_get_position_suffixes():
+    assert unique_version_labels(['a/pytorch8', 'pytorch9', 'b/pytorch8/']) == ['pytorch8#1', 'pytorch9', 'pytorch8#3']